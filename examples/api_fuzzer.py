@@ -14,9 +14,18 @@ múltiples peticiones con diferentes valores para descubrir:
 
 ¿CÓMO FUNCIONA?
 1. Lee un diccionario con miles de rutas comunes (login, admin, api, etc.)
-2. Prueba cada ruta con diferentes métodos HTTP (GET, POST, etc.)
+2. Prueba cada ruta con diferentes métodos HTTP (GET, POST, etc.), y
+   opcionalmente con extensiones (.json, .bak) y cambios de mayúsculas
 3. Identifica qué rutas existen (responden con códigos 2xx o 3xx)
-4. Muestra solo las rutas que funcionan
+4. Descarta los falsos positivos (APIs que responden 200 a todo)
+5. Agrupa las respuestas parecidas y muestra un ejemplo de cada grupo
+
+¿POR QUÉ ASÍNCRONO?
+Una petición pasa casi todo su tiempo esperando la respuesta del servidor.
+Haciéndolas de una en una, un diccionario de 100.000 rutas tarda horas.
+Con asyncio y aiohttp un solo hilo mantiene cientos de peticiones en
+marcha a la vez, y reutiliza las conexiones abiertas (keep-alive) en
+lugar de abrir una nueva por petición.
 
 ¿PARA QUÉ SIRVE?
 - Pentesting: encontrar vectores de ataque
@@ -30,9 +39,31 @@ múltiples peticiones con diferentes valores para descubrir:
 - Cómo leer archivos de diccionario
 - Interpretación de códigos de estado HTTP
 - Testing automatizado de APIs
+- Patrón productor/consumidor con asyncio.Queue
+- Leer diccionarios de varios GB línea a línea, sin cargarlos en memoria
+- Filtros de Bloom: descartar duplicados con muy poca memoria
+- Detectar "soft 404" con una huella de las respuestas a rutas inventadas
+- Control de congestión AIMD: ajustar la velocidad a lo que aguanta el servidor
+- Exploración recursiva: buscar dentro de cada ruta encontrada, por niveles
+- Tuberías de generadores: combinar palabras, extensiones y métodos sin
+  construir listas enormes en memoria
+- Guardar el progreso en un archivo (checkpoint) para reanudar tras un corte
+- SimHash: una "huella" de un texto que cambia poco si el texto cambia poco
+- Reutilización de conexiones con una sesión de aiohttp
 
 REQUISITOS:
-    pip install requests
+    pip install aiohttp
+
+EJEMPLOS DE USO:
+    python api_fuzzer.py
+    python api_fuzzer.py --url https://127.0.0.1/api --diccionario endpoints.txt
+    python api_fuzzer.py --url http://127.0.0.1:8000 --concurrencia 200
+    python api_fuzzer.py --concurrencia 20 --fija   (sin ajuste automático)
+    python api_fuzzer.py --profundidad 2   (busca también dentro de lo encontrado)
+    python api_fuzzer.py --metodos GET,POST,PUT,DELETE --extensiones .json,.bak --variantes-caso
+    python api_fuzzer.py --resume   (continúa donde se quedó, con la misma configuración)
+    python api_fuzzer.py --sin-agrupar   (muestra cada hallazgo, aunque se parezcan)
+    python api_fuzzer.py --diccionario big.txt --skip 50000   (empieza en la palabra 50001)
 
 ADVERTENCIA:
 El fuzzing puede generar MUCHAS peticiones y sobrecargar servidores.
@@ -44,20 +75,27 @@ Solo usa este script en:
 NUNCA lo uses en sistemas de terceros sin autorización (es ILEGAL).
 """
 
-# Importamos la librería necesaria
-import requests  # Para hacer peticiones HTTP
-
-# Desactivamos las advertencias de SSL para certificados autofirmados
-# Esto es necesario porque muchos entornos de desarrollo usan certificados no válidos
-import urllib3
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+# Importamos las librerías necesarias
+import argparse   # Para leer opciones de la línea de comandos
+import asyncio    # Para tener muchas peticiones en marcha a la vez
+import hashlib    # Para el filtro de Bloom y la huella de las respuestas
+import heapq      # Cola de prioridad de bases por explorar (modo recursivo)
+import json       # Para guardar el progreso (checkpoint)
+import os         # Para reemplazar el archivo de progreso de forma atómica
+import re         # Para separar el cuerpo de las respuestas en palabras (SimHash)
+import secrets    # Para inventar rutas aleatorias en la calibración
+import time       # Para medir cuánto tarda el fuzzing
+from collections import Counter  # Para contar las palabras repetidas (SimHash)
+from urllib.parse import unquote, urlsplit  # Para sacar la ruta de una URL
+import aiohttp    # Cliente HTTP asíncrono
+import dns_cache  # Caché de DNS compartida (dns_cache.py, en este mismo directorio)
 
 
 # CONFIGURACIÓN DEL FUZZER
 # -------------------------
 
 # URL base de la API que vamos a analizar
-url_base = "https://127.0.0.1/api"  # Cambia esto por la URL de tu objetivo
+URL_BASE = "https://127.0.0.1/api"  # Cambia esto (o usa --url) por la URL de tu objetivo
 
 # Archivo con el diccionario de rutas posibles
 # Este archivo debe contener una ruta por línea
@@ -67,67 +105,866 @@ url_base = "https://127.0.0.1/api"  # Cambia esto por la URL de tu objetivo
 #   users
 #   api/v1
 #   config
-archivo_diccionario = "endpoints.txt"
+ARCHIVO_DICCIONARIO = "endpoints.txt"
 
-# Lista de métodos HTTP que queremos probar
+# Lista de métodos HTTP que queremos probar (se puede cambiar con --metodos)
 # GET: para obtener información
 # POST: para enviar información
-# Podrías añadir: PUT, DELETE, PATCH, HEAD, OPTIONS
-metodos = ["GET", "POST"]
+# Otros útiles: PUT, DELETE, PATCH, HEAD, OPTIONS
+METODOS = ["GET", "POST"]
 
+# Máximo de peticiones en marcha a la vez
+# El fuzzer empieza con pocas (CONCURRENCIA_INICIAL) y va subiendo mientras
+# el servidor aguante, sin pasar nunca de este máximo
+CONCURRENCIA = 50
+CONCURRENCIA_INICIAL = 10
 
-# PASO 1: CARGAR EL DICCIONARIO DE RUTAS
-# ---------------------------------------
-print("=" * 70)
-print("API FUZZER - DESCUBRIDOR DE ENDPOINTS")
-print("=" * 70)
-print()
-print(f"Configuración:")
-print(f"  - URL base: {url_base}")
-print(f"  - Diccionario: {archivo_diccionario}")
-print(f"  - Métodos HTTP: {', '.join(metodos)}")
-print()
-
-# Abrimos el archivo de diccionario y leemos todas las rutas
-with open(archivo_diccionario, "r") as archivo:
-    # List comprehension que:
-    # 1. Lee cada línea del archivo
-    # 2. Elimina espacios con strip()
-    # 3. Ignora líneas vacías con "if linea.strip()"
-    rutas = [linea.strip() for linea in archivo if linea.strip()]
-
-print(f"Se cargaron {len(rutas)} rutas del diccionario")
-print()
-print("Iniciando fuzzing... (esto puede tardar)")
-print("-" * 70)
-
-# Contadores para estadísticas
-rutas_encontradas = 0
-total_peticiones = 0
-
-
-# PASO 2: PROBAR CADA RUTA CON CADA MÉTODO
-# -----------------------------------------
-# Bucle anidado: por cada ruta, probamos todos los métodos
-for ruta in rutas:
+# Códigos especiales (los mismos que usa check-url.py)
+TIMEOUT = 0          # La petición tardó más de TIEMPO_MAXIMO
+ERROR_CONEXION = 99  # Conexión rechazada, cortada, error de SSL...
+
+# Respuestas con las que un servidor dice "vas demasiado rápido"
+# 429 = Too Many Requests, 503 = Service Unavailable
+CODIGOS_SOBRECARGA = (429, 503)
+
+# Segundos máximos de espera por petición
+TIEMPO_MAXIMO = 5
+
+# Bytes del cuerpo de cada respuesta que se leen y se comparan. Una ruta
+# "comodín" puede devolver páginas enormes, y leerlas y calcular su SimHash
+# enteras frenaría a todos los trabajadores (todos comparten un hilo)
+TAMANO_MAXIMO_CUERPO = 64 * 1024
+
+# Palabras distintas que caben en la primera capa del filtro de Bloom que
+# descarta duplicados (~1.2 bytes por palabra: 1.000.000 → ~1.2 MB). Si el
+# diccionario tiene más, se añaden capas nuevas (ver FiltroBloom), así que
+# solo es un punto de partida: no limita el tamaño del diccionario
+CAPACIDAD_DEDUPE = 1_000_000
+
+# Rutas inventadas que se piden por cada método durante la calibración
+MUESTRAS_CALIBRACION = 3
+
+# Dos respuestas con el mismo código, tamaño parecido y mismo tipo se
+# consideran "la misma" si sus SimHash difieren en como mucho estos bits
+DISTANCIA_SIMHASH = 3
+
+# Archivo donde se guarda el progreso, y cada cuántos segundos
+ARCHIVO_ESTADO = "fuzzer_estado.json"
+INTERVALO_CHECKPOINT = 10
+
+
+# FUNCIÓN 1: LEER EL DICCIONARIO DE RUTAS
+# ----------------------------------------
+class _CapaBloom:
+    """Un filtro de Bloom clásico: un array de bits de tamaño fijo."""
+
+    def __init__(self, capacidad, k):
+        # k hashes y k × 1.44 bits por elemento dan un error de ~(1/2)^k
+        # (k=7 → 10 bits por elemento y ~1% de falsos positivos)
+        self.capacidad = capacidad
+        self.k = k
+        self.num_bits = max(int(capacidad * k * 1.44), 1024)
+        self.bits = bytearray(self.num_bits // 8 + 1)
+        self.elementos = 0
+
+    def _posiciones(self, h1, h2):
+        # Con dos números (h1 + i*h2) obtenemos las k posiciones sin
+        # calcular k hashes distintos
+        return [(h1 + i * h2) % self.num_bits for i in range(self.k)]
+
+    def contiene(self, h1, h2):
+        for posicion in self._posiciones(h1, h2):
+            byte, bit = divmod(posicion, 8)
+            if not self.bits[byte] & (1 << bit):
+                return False
+        return True
+
+    def poner(self, h1, h2):
+        for posicion in self._posiciones(h1, h2):
+            byte, bit = divmod(posicion, 8)
+            self.bits[byte] |= 1 << bit
+        self.elementos += 1
+
+
+class FiltroBloom:
+    """
+    Conjunto aproximado que usa muy poca memoria (~1.2 bytes por palabra).
+
+    Un set() de Python con 50 millones de palabras ocuparía varios GB. Un
+    filtro de Bloom es un array de bits: para cada palabra se calculan
+    'k' posiciones con una función hash y se ponen a 1. Para saber si una
+    palabra ya se vio, se mira si sus k bits están a 1.
+
+    - Si algún bit está a 0 → la palabra NO se ha visto seguro
+    - Si todos están a 1   → probablemente sí (puede equivocarse, con una
+      probabilidad que elegimos: aquí ~1%)
+
+    En el fuzzer, equivocarse significa saltarse alguna palabra nueva muy
+    de vez en cuando.
+
+    ¿Y SI LLEGAN MÁS PALABRAS DE LAS PREVISTAS?
+    Un array de bits lleno se equivoca cada vez más: con 10 veces más
+    palabras que su capacidad, descartaría como "repetidas" más de la mitad
+    de las nuevas (y cada palabra perdida es un posible hallazgo perdido).
+    Por eso el filtro es ESCALABLE: cuando la capa activa se llena se
+    añade otra con el doble de capacidad y un hash más (la mitad de
+    error). Una palabra está repetida si aparece en cualquier capa, y el
+    error total se queda por debajo del 2% sea cual sea el diccionario.
+    """
+
+    def __init__(self, capacidad, k=7):
+        self.capas = [_CapaBloom(max(capacidad, 1), k)]
+
+    def anadir(self, dato):
+        """
+        Añade 'dato' (bytes) al filtro.
+
+        Retorna:
+            bool: True si era nuevo, False si (probablemente) ya estaba
+        """
+        # Un solo hash de 16 bytes da los dos números que usan todas las capas
+        resumen = hashlib.blake2b(dato, digest_size=16).digest()
+        h1 = int.from_bytes(resumen[:8], "little")
+        h2 = int.from_bytes(resumen[8:], "little") | 1
+
+        for capa in self.capas:
+            if capa.contiene(h1, h2):
+                return False
+        activa = self.capas[-1]
+        if activa.elementos >= activa.capacidad:
+            activa = _CapaBloom(activa.capacidad * 2, activa.k + 1)
+            self.capas.append(activa)
+        activa.poner(h1, h2)
+        return True
+
+
+class LectorDiccionario:
+    """
+    Recorre el diccionario de rutas línea a línea, sin cargarlo en memoria.
+
+    Antes se hacía una lista con TODAS las rutas antes de la primera
+    petición: con diccionarios de varios GB eso agota la memoria y tarda
+    minutos en arrancar. Así, la primera petición sale al instante y la
+    memoria usada es la misma con 1.000 palabras que con 100 millones.
+
+    Además:
+    - Descarta duplicados sobre la marcha (con un FiltroBloom)
+    - Puede saltarse las primeras N palabras (--skip), por ejemplo para
+      continuar un fuzzing que se cortó
+
+    El diccionario se puede recorrer varias veces (el modo recursivo lo
+    recorre una vez por cada base). Cada recorrido tiene su propio filtro
+    de duplicados; --skip solo se aplica al primero, el de la URL base.
+
+    Se usa como cualquier iterable:
+        for ruta in LectorDiccionario("endpoints.txt"):
+            ...
+    """
+
+    def __init__(self, ruta_archivo, saltar=0, capacidad=CAPACIDAD_DEDUPE):
+        self.ruta_archivo = ruta_archivo
+        self.saltar = saltar
+        self.capacidad = capacidad
+        self.leidas = 0       # Palabras leídas en total (sin contar líneas vacías)
+        self.duplicadas = 0   # Palabras descartadas por repetidas
+        self.posicion = 0     # Byte donde empieza la última palabra entregada
+
+    def __iter__(self):
+        return self.recorrer(self.saltar)
+
+    def recorrer(self, saltar=0, desde=0):
+        """
+        Genera las palabras del diccionario, saltándose las 'saltar' primeras.
+
+        Con 'desde' (un byte del archivo) se continúa un recorrido cortado:
+        las palabras anteriores no se entregan, pero se meten en el filtro
+        de duplicados para que este quede igual que antes del corte.
+
+        Mientras se recorre, self.posicion indica en qué byte empieza la
+        palabra que se acaba de entregar (lo que guarda el checkpoint).
+        """
+        filtro = FiltroBloom(self.capacidad)
+        numero = 0
+        posicion = 0
+        # Modo binario: leemos bytes tal cual (los diccionarios a veces
+        # mezclan codificaciones) y solo al final los pasamos a texto.
+        # Además, en binario cada línea mide exactamente lo que ocupa en
+        # disco, así que sumando longitudes sabemos el byte de cada palabra
+        with open(self.ruta_archivo, "rb") as archivo:
+            for linea in archivo:
+                inicio = posicion
+                posicion += len(linea)
+                palabra = linea.strip()
+                if not palabra:
+                    continue
+                numero += 1
+                if numero <= saltar:
+                    continue
+                if inicio < desde:
+                    # Ya se probó antes del corte: solo la apuntamos en el filtro
+                    filtro.anadir(palabra)
+                    continue
+                self.leidas += 1
+                if not filtro.anadir(palabra):
+                    self.duplicadas += 1
+                    continue
+                self.posicion = inicio
+                yield palabra.decode("utf-8", errors="replace")
+
+
+# FUNCIÓN 2: GENERAR LAS PETICIONES CANDIDATAS
+# ----------------------------------------------
+# Con 100.000 palabras, 6 métodos, 3 extensiones y 3 variantes de
+# mayúsculas salen 100.000 × 6 × 4 × 3 = 7,2 millones de peticiones.
+# Construir esa lista entera no cabría en memoria, así que encadenamos
+# generadores: cada uno toma las rutas del anterior y produce variantes
+# de una en una. La memoria usada no depende del tamaño del diccionario.
+#
+#   diccionario → con_variantes_caso → con_extensiones → por_metodo
+#
+# El orden también importa: cada palabra se prueba con TODOS sus métodos
+# y variantes antes de pasar a la siguiente, así un endpoint que solo
+# responde a DELETE aparece en los primeros segundos y no al final.
+
+def con_variantes_caso(rutas):
+    """
+    Añade variantes de mayúsculas de cada ruta: admin → Admin, ADMIN.
+
+    Algunos servidores (ej: Windows/IIS) no distinguen mayúsculas, pero
+    muchas APIs sí, y a veces hay rutas como /Admin o /API olvidadas.
+    Solo se cambia la primera letra: capitalize() pondría el resto en
+    minúsculas y "getUser" daría "Getuser" en lugar de "GetUser".
+    """
+    for ruta in rutas:
+        vistas = set()  # Para no repetir cuando la palabra ya es "Admin" o "123"
+        for variante in (ruta, ruta[:1].upper() + ruta[1:], ruta.upper()):
+            if variante not in vistas:
+                vistas.add(variante)
+                yield variante
+
+
+def con_extensiones(rutas, extensiones):
+    """
+    Añade a cada ruta sus versiones con extensión: config → config.json,
+    config.bak... (primero siempre la ruta sin extensión).
+    """
+    for ruta in rutas:
+        yield ruta
+        for extension in extensiones:
+            yield ruta + extension
+
+
+def por_metodo(rutas, metodos):
+    """Combina cada ruta con cada método HTTP: genera tuplas (método, ruta)."""
+    for ruta in rutas:
+        for metodo in metodos:
+            yield metodo, ruta
+
+
+def generar_candidatos(rutas, metodos, extensiones=(), variantes_caso=False):
+    """
+    Monta la tubería de generadores según las opciones elegidas.
+
+    EJEMPLO con metodos=["GET", "POST"] y extensiones=[".bak"]:
+        admin → (GET, admin), (POST, admin), (GET, admin.bak), (POST, admin.bak)
+
+    Parámetros:
+        rutas (iterable): Palabras del diccionario
+        metodos (list): Métodos HTTP
+        extensiones (list): Extensiones a añadir (ej: [".json", ".bak"])
+        variantes_caso (bool): Probar también Admin y ADMIN
+
+    Retorna:
+        generator: Tuplas (método, ruta), calculadas a medida que se piden
+    """
+    if variantes_caso:
+        rutas = con_variantes_caso(rutas)
+    if extensiones:
+        rutas = con_extensiones(rutas, extensiones)
+    return por_metodo(rutas, metodos)
+
+
+# FUNCIÓN 3: DETECTAR FALSOS POSITIVOS ("SOFT 404")
+# ---------------------------------------------------
+def quitar_ruta(cuerpo, url_completa):
+    """Borra del cuerpo la ruta pedida, por si la respuesta la repite."""
+    ruta = unquote(urlsplit(url_completa).path)
+    return cuerpo.replace(ruta.encode("utf-8", errors="replace"), b"")
+
+
+def huella(status_code, cuerpo, url_completa):
+    """
+    Resume una respuesta en unos pocos números fáciles de comparar.
+
+    Muchas APIs devuelven la ruta pedida en el mensaje de error
+    (ej: {"error": "/api/xyz no existe"}). Para que todas esas respuestas
+    se parezcan, quitamos la ruta del cuerpo antes de medirlo. Se quita la
+    ruta completa ("/api/xyz") y no solo la palabra ("xyz"): con palabras
+    cortas como "1" borraríamos también otros trozos del cuerpo.
+
+    Retorna:
+        tuple: (código, longitud, hash del cuerpo, número de palabras)
+    """
+    cuerpo = quitar_ruta(cuerpo, url_completa)
+    return (status_code, len(cuerpo),
+            hashlib.blake2b(cuerpo, digest_size=8).digest(), len(cuerpo.split()))
+
+
+class LineaBase:
+    """
+    Huellas de las respuestas a rutas que NO existen.
+
+    Algunas APIs responden 200 a cualquier ruta ("soft 404") y el fuzzer
+    las daría todas por encontradas. Antes de empezar pedimos unas cuantas
+    rutas inventadas (calibración) y guardamos su huella. Después, una
+    respuesta que se parezca a esas es un falso positivo. Se parece si:
+    - tiene el mismo código y el mismo cuerpo (mismo hash), o
+    - tiene el mismo código, la misma longitud y el mismo número de
+      palabras (cuerpos que cambian en detalles, como la hora)
+
+    Las huellas se guardan en sets: comprobar una respuesta cuesta O(1)
+    y no hace falta repetir ninguna petición.
+    """
+
+    def __init__(self):
+        self.hashes = set()  # (método, código, hash)
+        self.formas = set()  # (método, código, longitud, palabras)
+
+    def anadir(self, metodo, huella_respuesta):
+        """Guarda la huella de una respuesta a una ruta inexistente."""
+        status_code, longitud, resumen, palabras = huella_respuesta
+        self.hashes.add((metodo, status_code, resumen))
+        self.formas.add((metodo, status_code, longitud, palabras))
+
+    def es_falso_positivo(self, metodo, huella_respuesta):
+        """True si la respuesta se parece a la de una ruta inexistente."""
+        status_code, longitud, resumen, palabras = huella_respuesta
+        return ((metodo, status_code, resumen) in self.hashes
+                or (metodo, status_code, longitud, palabras) in self.formas)
+
+
+async def calibrar(sesion, url_base, metodos, muestras=MUESTRAS_CALIBRACION, extensiones=()):
+    """
+    Pide rutas aleatorias (que seguro que no existen) con cada método y
+    guarda cómo responde el servidor.
+
+    Se prueban formas distintas (palabra suelta, con extensión, con
+    subcarpeta) porque algunos servidores tratan cada caso de otra manera.
+    Si se usan --extensiones, se calibra también con cada una de ellas.
+
+    Retorna:
+        LineaBase: Huellas de las respuestas "no existe"
+    """
+    linea_base = LineaBase()
+    formatos = ["{}", "{}.php", "{}/{}"] + ["{}" + extension for extension in extensiones]
     for metodo in metodos:
-        # Construimos la URL completa
-        # Ejemplo: https://127.0.0.1/api/login
-        url_completa = f"{url_base}/{ruta}"
-        
-        total_peticiones += 1
+        for i in range(max(muestras, len(formatos))):
+            ruta = formatos[i % len(formatos)].format(secrets.token_hex(6), secrets.token_hex(4))
+            url_completa = f"{url_base}/{ruta}"
+            status_code, cuerpo, _ = await probar_ruta(sesion, metodo, url_completa)
+            if status_code not in (TIMEOUT, ERROR_CONEXION):
+                linea_base.anadir(metodo, huella(status_code, cuerpo, url_completa))
+    return linea_base
 
-        try:
-            # Enviamos la petición HTTP según el método
-            if metodo == "GET":
-                # GET: solicita información del servidor
-                # verify=False: ignora errores de certificado SSL
-                # timeout=5: espera máximo 5 segundos
-                respuesta = requests.get(url_completa, verify=False, timeout=5)
-                
-            elif metodo == "POST":
-                # POST: envía información al servidor
-                respuesta = requests.post(url_completa, verify=False, timeout=5)
+
+# FUNCIÓN 4: AGRUPAR HALLAZGOS PARECIDOS
+# ----------------------------------------
+def simhash(cuerpo):
+    """
+    Calcula el SimHash (64 bits) de un texto.
+
+    Un hash normal (SHA, MD5) cambia por completo si cambia una letra.
+    SimHash es al revés: textos parecidos dan hashes parecidos, que se
+    diferencian en pocos bits. Así se hace:
+    1. Se parte el texto en palabras y se calcula un hash de cada una
+    2. Para cada uno de los 64 bits se hace una "votación": +1 si la
+       palabra tiene ese bit a 1, -1 si lo tiene a 0
+    3. El bit final es 1 si ganó el +1
+
+    Cambiar unas pocas palabras solo mueve unos pocos votos, y por tanto
+    solo unos pocos bits del resultado.
+
+    Antes, cada número se cambia por "0": identificadores, fechas y
+    contadores cambian en cada respuesta pero no la hacen "distinta".
+
+    Este cálculo corre en el mismo hilo que todas las peticiones, así
+    que se limita a los primeros TAMANO_MAXIMO_CUERPO bytes y cada palabra
+    distinta vota una sola vez, con tantos votos como veces aparece.
+    """
+    votos = [0] * 64
+    cuerpo = re.sub(rb"\d+", b"0", cuerpo[:TAMANO_MAXIMO_CUERPO])
+    for palabra, veces in Counter(re.findall(rb"\w+", cuerpo)).items():
+        h = int.from_bytes(hashlib.blake2b(palabra, digest_size=8).digest(), "little")
+        for bit in range(64):
+            votos[bit] += veces if h >> bit & 1 else -veces
+    return sum(1 << bit for bit in range(64) if votos[bit] > 0)
+
+
+class AgrupadorHallazgos:
+    """
+    Agrupa sobre la marcha los hallazgos que son "la misma respuesta".
+
+    Contra algunas APIs aparecen cientos de rutas que devuelven casi lo
+    mismo (ej: /api/v1/user, /api/v1/users, /api/v1/User...). En lugar de
+    mostrarlas todas, se muestra la primera de cada grupo (su
+    "representante") y cuántas más se le parecen.
+
+    Dos hallazgos van al mismo grupo si coinciden en:
+    - código de estado
+    - tamaño aproximado (potencia de 2: 100 y 120 bytes, sí; 100 y 300, no)
+    - tipo de contenido (application/json, text/html...)
+    y además sus SimHash difieren en como mucho DISTANCIA_SIMHASH bits.
+    Como en huella(), antes se quita del cuerpo la ruta pedida.
+
+    Las tres primeras cosas forman una clave de diccionario: solo hay que
+    comparar el SimHash con los grupos de esa clave, que suelen ser pocos.
+
+    Cada grupo es un diccionario sencillo, así se guarda tal cual en el
+    archivo de progreso (checkpoint).
+    """
+
+    def __init__(self, grupos=None):
+        self.grupos = grupos if grupos is not None else []
+        self.por_clave = {}  # (código, tamaño, tipo) → lista de grupos
+        for grupo in self.grupos:
+            self.por_clave.setdefault(self._clave(grupo), []).append(grupo)
+
+    @staticmethod
+    def _clave(grupo):
+        return grupo["codigo"], grupo["tamano"], grupo["tipo"]
+
+    def anadir(self, metodo, url_completa, status_code, tipo, cuerpo):
+        """
+        Mete un hallazgo en su grupo (o crea uno nuevo).
+
+        Retorna:
+            tuple: (grupo, True si el grupo es nuevo)
+        """
+        nuevo = {
+            "metodo": metodo, "url": url_completa, "codigo": status_code,
+            # bit_length() es el logaritmo en base 2 redondeado: 100 → 7, 120 → 7
+            "tamano": len(cuerpo).bit_length(), "tipo": tipo,
+            "simhash": simhash(quitar_ruta(cuerpo, url_completa)), "cantidad": 1,
+        }
+        candidatos = self.por_clave.setdefault(self._clave(nuevo), [])
+        for grupo in candidatos:
+            # Distancia de Hamming: cuántos bits son distintos (XOR y contar unos)
+            if (grupo["simhash"] ^ nuevo["simhash"]).bit_count() <= DISTANCIA_SIMHASH:
+                grupo["cantidad"] += 1
+                return grupo, False
+        candidatos.append(nuevo)
+        self.grupos.append(nuevo)
+        return nuevo, True
+
+
+# FUNCIÓN 5: MOSTRAR UNA RUTA ENCONTRADA
+# ---------------------------------------
+def mostrar_hallazgo(metodo, url_completa, status_code):
+    """
+    Imprime una ruta encontrada con una pista sobre su código de estado.
+
+    Parámetros:
+        metodo (str): Método HTTP usado
+        url_completa (str): URL probada
+        status_code (int): Código de estado recibido
+    """
+    # Mostramos la ruta encontrada
+    print(f"✓ [{metodo}] {url_completa} - Código: {status_code}")
+
+    # Análisis adicional según el código
+    if status_code == 200:
+        # 200 OK: La ruta existe y funciona correctamente
+        print(f"    → Endpoint funcional encontrado")
+
+    elif status_code in [301, 302, 307, 308]:
+        # 3xx: Redirección
+        print(f"    → Redirige a otra ubicación")
+
+    elif status_code == 401:
+        # 401 Unauthorized: Requiere autenticación
+        # Aunque es 4xx, indica que la ruta existe
+        print(f"    → Requiere autenticación (ruta protegida)")
+
+    elif status_code == 403:
+        # 403 Forbidden: Sin permisos
+        print(f"    → Acceso prohibido (pero la ruta existe)")
+
+
+# FUNCIÓN 6: PROBAR UNA RUTA
+# ---------------------------
+async def probar_ruta(sesion, metodo, url_completa):
+    """
+    Envía una petición y devuelve su código de estado, su cuerpo y su tipo.
+
+    Parámetros:
+        sesion (aiohttp.ClientSession): Sesión compartida (reutiliza conexiones)
+        metodo (str): Método HTTP (GET, POST...)
+        url_completa (str): URL a probar
+
+    Retorna:
+        tuple: (código, cuerpo en bytes, tipo de contenido); el código es
+               TIMEOUT o ERROR_CONEXION (y lo demás None) si no hubo respuesta
+    """
+    try:
+        # ssl=False: ignora errores de certificado SSL (como verify=False
+        # en requests); muchos entornos de desarrollo usan certificados
+        # autofirmados
+        async with sesion.request(metodo, url_completa, ssl=False,
+                                  allow_redirects=False) as respuesta:
+            # Leemos el cuerpo (en una API suele ser pequeño): solo así la
+            # conexión vuelve al pool para reutilizarse en la siguiente petición.
+            # De uno enorme basta con el principio: si no se termina de
+            # leer, aiohttp cierra esa conexión en lugar de reutilizarla
+            cuerpo = bytearray()
+            while len(cuerpo) < TAMANO_MAXIMO_CUERPO:
+                trozo = await respuesta.content.read(TAMANO_MAXIMO_CUERPO - len(cuerpo))
+                if not trozo:
+                    break
+                cuerpo += trozo
+            cuerpo = bytes(cuerpo)
+            # content_type: "application/json", "text/html"... (sin el charset)
+            return respuesta.status, cuerpo, respuesta.content_type
+
+    except asyncio.TimeoutError:
+        # La petición tardó demasiado
+        # Podría indicar un servidor saturado o un sistema de defensa (rate
+        # limiting): no se muestra, pero se cuenta y frena al fuzzer
+        return TIMEOUT, None, None
+
+    except aiohttp.ClientError:
+        # Cualquier otro error de conexión
+        return ERROR_CONEXION, None, None
+
+
+# FUNCIÓN 7: CONTROL DE CONCURRENCIA (AIMD)
+# ------------------------------------------
+class ControlConcurrencia:
+    """
+    Decide cuántas peticiones puede haber en marcha a la vez ("ventana").
+
+    Con una concurrencia fija, o desaprovechamos un servidor rápido o
+    tumbamos uno lento. Este control hace lo mismo que TCP para no saturar
+    la red, el algoritmo AIMD ("Additive Increase, Multiplicative Decrease"):
+
+    - Mientras el servidor responde bien, la ventana crece poco a poco:
+      +1/ventana por respuesta, es decir, +1 por cada "ronda" de peticiones
+    - Ante señales de sobrecarga, la ventana se reduce de golpe:
+        · timeouts o respuestas 429/503   → ventana a la mitad
+        · respuesta que tarda más del doble de la mínima vista → ventana × 0.8
+
+    Así la ventana oscila cerca de la capacidad real del servidor.
+
+    Tras un recorte, las respuestas a peticiones que ya estaban en marcha
+    traerán las mismas malas noticias. Por eso solo cuentan las señales de
+    peticiones enviadas DESPUÉS del último recorte (igual que hace TCP).
+    """
+
+    def __init__(self, inicial, maximo, minimo=1, adaptativo=True):
+        self.ventana = float(min(inicial, maximo) if adaptativo else maximo)
+        self.minimo = minimo
+        self.maximo = maximo
+        self.adaptativo = adaptativo
+        self.en_vuelo = 0
+        self.condicion = asyncio.Condition()
+        self.latencia_minima = None   # Lo que tarda el servidor sin carga
+        self.ultimo_recorte = 0
+        self.recortes = 0
+        self.ventana_maxima = self.ventana
+
+    async def adquirir(self):
+        """
+        Espera hasta que haya hueco en la ventana para otra petición.
+
+        Retorna:
+            float: Momento de salida de la petición (para liberar())
+        """
+        async with self.condicion:
+            await self.condicion.wait_for(lambda: self.en_vuelo < int(self.ventana))
+            self.en_vuelo += 1
+        return time.monotonic()
+
+    async def liberar(self, inicio, status_code):
+        """
+        Registra el resultado de una petición y ajusta la ventana.
+
+        Parámetros:
+            inicio (float): Lo que devolvió adquirir()
+            status_code (int): Código recibido (o TIMEOUT / ERROR_CONEXION)
+        """
+        async with self.condicion:
+            self.en_vuelo -= 1
+            if self.adaptativo:
+                self._ajustar(inicio, time.monotonic() - inicio, status_code)
+            # Si la ventana ha crecido, pueden arrancar varias peticiones
+            self.condicion.notify_all()
+
+    def _ajustar(self, inicio, segundos, status_code):
+        sobrecarga = status_code == TIMEOUT or status_code in CODIGOS_SOBRECARGA
+
+        if not sobrecarga:
+            # Un 429/503 suele llegar al instante y no dice nada de lo que
+            # tarda el servidor en trabajar, así que no cuenta para la mínima.
+            # La mínima "olvida" despacio (+0.01% por respuesta) para
+            # adaptarse si el servidor se vuelve más lento de forma permanente
+            if self.latencia_minima is None:
+                self.latencia_minima = segundos
+            self.latencia_minima = min(segundos, self.latencia_minima * 1.0001)
+        # El margen de 10 ms evita frenar por ruido en servidores locales
+        lenta = (self.latencia_minima is not None
+                 and segundos > 2 * self.latencia_minima + 0.01)
+
+        if sobrecarga or lenta:
+            # Peticiones enviadas antes del último recorte: ya lo tuvimos en cuenta
+            if inicio > self.ultimo_recorte:
+                factor = 0.5 if sobrecarga else 0.8
+                self.ventana = max(self.minimo, self.ventana * factor)
+                self.ultimo_recorte = time.monotonic()
+                self.recortes += 1
+        else:
+            self.ventana = min(self.maximo, self.ventana + 1 / self.ventana)
+            self.ventana_maxima = max(self.ventana_maxima, self.ventana)
+
+
+# FUNCIÓN 8: GUARDAR Y REANUDAR EL PROGRESO
+# -------------------------------------------
+class Progreso:
+    """
+    Sabe hasta dónde se ha probado el diccionario en UNA base.
+
+    Con muchas peticiones a la vez, las palabras no terminan en orden: la
+    palabra 100 puede acabar antes que la 98. Por eso guardamos:
+    - una "marca de agua": el byte de la primera palabra que aún tiene
+      peticiones sin terminar. Todo lo anterior está hecho seguro.
+    - las peticiones ya hechas DESPUÉS de la marca (pocas: como mucho las
+      que caben en la cola más las que están en marcha), para no
+      repetirlas al reanudar.
+    """
+
+    def __init__(self, nivel, orden, desde=0, hechos=()):
+        self.nivel = nivel
+        self.orden = orden
+        self.desde = desde            # Byte por el que empezar (al reanudar)
+        self.en_curso = {}            # byte de la palabra → peticiones sin terminar
+        self.produciendo = None       # Byte de la palabra que se está encolando
+        self.produccion_terminada = False
+        self.hechos = {tuple(h) for h in hechos}  # (byte, método, ruta) ya probados
+
+    def iniciar(self, posicion):
+        """Apunta que se ha encolado una petición de la palabra en 'posicion'."""
+        self.en_curso[posicion] = self.en_curso.get(posicion, 0) + 1
+
+    def terminar(self, posicion, metodo, ruta):
+        """Apunta que ha terminado una petición de la palabra en 'posicion'."""
+        self.en_curso[posicion] -= 1
+        if self.en_curso[posicion] == 0:
+            del self.en_curso[posicion]
+        self.hechos.add((posicion, metodo, ruta))
+
+    def terminado(self):
+        """True si ya se encoló todo y no queda nada en marcha."""
+        return self.produccion_terminada and not self.en_curso
+
+    def instantanea(self):
+        """Devuelve lo necesario para reanudar esta base (un diccionario)."""
+        pendientes = list(self.en_curso)
+        if self.produciendo is not None:
+            pendientes.append(self.produciendo)
+        marca = min(pendientes) if pendientes else self.desde
+        # Lo hecho antes de la marca ya no hace falta recordarlo
+        self.hechos = {h for h in self.hechos if h[0] >= marca}
+        return {"nivel": self.nivel, "orden": self.orden, "desde": marca,
+                "hechos": sorted(self.hechos)}
+
+
+def guardar_estado(ruta_archivo, estado):
+    """
+    Escribe el estado en disco de forma ATÓMICA.
+
+    Si el programa se corta justo mientras escribe, un archivo a medias
+    sería inservible. Por eso se escribe primero en un archivo temporal y
+    luego se renombra con os.replace(): el renombrado es atómico, así que
+    en disco siempre hay o el estado anterior completo o el nuevo completo.
+    """
+    temporal = ruta_archivo + ".tmp"
+    with open(temporal, "w") as archivo:
+        json.dump(estado, archivo)
+    os.replace(temporal, ruta_archivo)
+
+
+def cargar_estado(ruta_archivo):
+    """Lee el estado guardado por guardar_estado()."""
+    with open(ruta_archivo, "r") as archivo:
+        return json.load(archivo)
+
+
+# FUNCIÓN 9: MOTOR DE FUZZING
+# ----------------------------
+async def fuzzear(url_base, diccionario, metodos, concurrencia=CONCURRENCIA,
+                  tiempo_maximo=TIEMPO_MAXIMO, calibracion=True, adaptativo=True,
+                  profundidad=0, extensiones=(), variantes_caso=False,
+                  archivo_estado=None, estado=None, agrupar=True):
+    """
+    Prueba cada ruta con cada método, con hasta 'concurrencia' peticiones a la vez.
+
+    Funcionamiento (patrón productor/consumidor):
+    - Antes de empezar, calibrar() aprende cómo responde el servidor a
+      rutas que no existen, para descartar falsos positivos
+    - El productor recorre las rutas y mete (método, base, ruta) en una
+      cola de tamaño limitado: si los trabajadores van lentos, espera, y la
+      cola nunca ocupa más memoria de la necesaria
+    - 'concurrencia' trabajadores sacan peticiones de la cola y las envían,
+      pero solo cuando ControlConcurrencia les deja (ventana AIMD)
+    - Todos comparten UNA sesión de aiohttp: las conexiones con el servidor
+      se mantienen abiertas y se reutilizan (sin repetir el saludo TCP/TLS)
+
+    MODO RECURSIVO (profundidad > 0):
+    Cada ruta encontrada (ej: /api/admin) se convierte en una nueva base y
+    se prueba todo el diccionario debajo de ella (/api/admin/users...).
+    Las bases pendientes esperan en un heap ordenado por profundidad: se
+    termina un nivel antes de bajar al siguiente. Todo ocurre en el mismo
+    proceso, con la misma sesión y la misma calibración (la huella ya
+    ignora la ruta pedida, así que sirve en cualquier subcarpeta).
+
+    CHECKPOINTS (archivo_estado):
+    Cada INTERVALO_CHECKPOINT segundos, y al pulsar Ctrl+C, se guarda en
+    un JSON la configuración, las estadísticas, los hallazgos y, por cada
+    base, hasta qué byte del diccionario se ha probado (ver Progreso).
+    Pasando ese JSON como 'estado' se continúa exactamente donde se quedó.
+    Al terminar, el archivo se borra.
+
+    Parámetros:
+        url_base (str): URL base de la API
+        diccionario (LectorDiccionario): Rutas a probar (se leen a medida
+            que hacen falta)
+        metodos (list): Métodos HTTP a probar con cada ruta
+        concurrencia (int): Máximo de peticiones simultáneas
+        tiempo_maximo (float): Segundos máximos por petición
+        calibracion (bool): Descartar respuestas iguales a las de rutas inexistentes
+        adaptativo (bool): Ajustar la concurrencia sola (False = fija)
+        profundidad (int): Niveles a explorar debajo de cada ruta encontrada
+        extensiones (list): Extensiones a probar con cada palabra (ej: [".json"])
+        variantes_caso (bool): Probar también cada palabra en Mayúscula y MAYÚSCULAS
+        archivo_estado (str): JSON donde guardar el progreso (None = no guardar)
+        estado (dict): Estado guardado de un fuzzing anterior, para reanudarlo
+        agrupar (bool): Mostrar solo el primer hallazgo de cada grupo de
+            respuestas parecidas (ver AgrupadorHallazgos)
+
+    Retorna:
+        dict: Estadísticas (peticiones, hallazgos, falsos positivos, timeouts,
+              errores, respuestas 429/503 y datos de la ventana)
+    """
+    # Todo lo necesario para repetir este fuzzing con --resume
+    configuracion = {
+        "url_base": url_base, "diccionario": diccionario.ruta_archivo,
+        "saltar": diccionario.saltar, "capacidad": diccionario.capacidad,
+        "metodos": metodos, "concurrencia": concurrencia, "tiempo_maximo": tiempo_maximo,
+        "calibracion": calibracion, "adaptativo": adaptativo, "profundidad": profundidad,
+        "extensiones": list(extensiones), "variantes_caso": variantes_caso,
+        "agrupar": agrupar,
+    }
+    estadisticas = {"total_peticiones": 0, "rutas_encontradas": 0, "falsos_positivos": 0,
+                    "timeouts": 0, "errores": 0, "sobrecargas": 0, "bases_exploradas": 0,
+                    "hallazgos": []}
+    cola = asyncio.Queue(maxsize=concurrencia * 2)
+    control = ControlConcurrencia(CONCURRENCIA_INICIAL, concurrencia, adaptativo=adaptativo)
+
+    # Bases por explorar: heap de (profundidad, número de orden, URL)
+    # El número de orden desempata y mantiene el orden de descubrimiento
+    bases = [(0, 0, url_base)]
+    bases_vistas = {url_base}  # Para no explorar dos veces la misma base
+    progresos = {}             # URL de base → Progreso (bases empezadas y sin terminar)
+
+    if estado:
+        # Reanudamos: recuperamos contadores, bases y progreso de cada base
+        estadisticas.update(estado["estadisticas"])
+        bases = [tuple(b) for b in estado["bases_pendientes"]]
+        bases_vistas = set(estado["bases_vistas"])
+        for url, p in estado["progresos"].items():
+            progresos[url] = Progreso(p["nivel"], p["orden"], p["desde"], p["hechos"])
+            bases.append((p["nivel"], p["orden"], url))
+            # Se vuelve a contar al sacarla del heap
+            estadisticas["bases_exploradas"] -= 1
+        heapq.heapify(bases)
+
+    # Los grupos viven dentro de las estadísticas: así van en el checkpoint
+    agrupador = AgrupadorHallazgos(estadisticas["hallazgos"])
+
+    def instantanea():
+        return {
+            "configuracion": configuracion,
+            "estadisticas": estadisticas,
+            "bases_pendientes": bases,
+            "bases_vistas": sorted(bases_vistas),
+            "progresos": {url: p.instantanea() for url, p in progresos.items()},
+        }
+
+    async def guardar_periodicamente():
+        while True:
+            await asyncio.sleep(INTERVALO_CHECKPOINT)
+            guardar_estado(archivo_estado, instantanea())
+
+    # limit: conexiones abiertas como máximo (una por petición en marcha)
+    # resolver: el nombre del servidor se resuelve una vez con la caché de DNS
+    conector = aiohttp.TCPConnector(limit=concurrencia,
+                                    resolver=dns_cache.ResolvedorAsync(),
+                                    use_dns_cache=False)
+    timeout = aiohttp.ClientTimeout(total=tiempo_maximo)
+
+    async with aiohttp.ClientSession(connector=conector, timeout=timeout) as sesion:
+
+        # La calibración usa la misma sesión: sus conexiones ya quedan abiertas
+        linea_base = (await calibrar(sesion, url_base, metodos, extensiones=extensiones)
+                      if calibracion else LineaBase())
+
+        async def trabajador():
+            while True:
+                peticion = await cola.get()
+                metodo, base, nivel, ruta, posicion = peticion
+                # Ejemplo de URL: https://127.0.0.1/api/login
+                url_completa = f"{base}/{ruta}"
+                try:
+                    await analizar(metodo, url_completa, nivel, ruta)
+                except asyncio.CancelledError:
+                    # Si a quien cancelan es a ESTE trabajador, paramos de verdad
+                    if asyncio.current_task().cancelling():
+                        raise
+                    estadisticas["errores"] += 1
+                except Exception as error:
+                    # Un fallo con UNA petición no puede matar al trabajador:
+                    # sin trabajadores la cola se llena y el productor se queda
+                    # esperando para siempre. La petición no se marca como hecha,
+                    # así que al reanudar se vuelve a probar
+                    estadisticas["errores"] += 1
+                    print(f"⚠️ Error inesperado en [{metodo}] {url_completa}: {error!r}")
+                else:
+                    progreso = progresos[base]
+                    progreso.terminar(posicion, metodo, ruta)
+                    if progreso.terminado():
+                        del progresos[base]
+                finally:
+                    cola.task_done()  # Para que cola.join() sepa cuándo acabamos
+
+        async def analizar(metodo, url_completa, nivel, ruta):
+            """Envía una petición y decide si es un hallazgo."""
+            inicio = await control.adquirir()
+            # Pase lo que pase, el hueco de la ventana se devuelve: si se
+            # perdiera, tras unos cuantos errores la ventana quedaría llena
+            # para siempre. Un error inesperado cuenta como TIMEOUT (frena)
+            status_code = TIMEOUT
+            try:
+                status_code, cuerpo, tipo = await probar_ruta(sesion, metodo, url_completa)
+            finally:
+                await control.liberar(inicio, status_code)
+            estadisticas["total_peticiones"] += 1
+
+            if status_code == TIMEOUT:
+                estadisticas["timeouts"] += 1
+                return
+            if status_code == ERROR_CONEXION:
+                estadisticas["errores"] += 1
+                return
+            if status_code in CODIGOS_SOBRECARGA:
+                estadisticas["sobrecargas"] += 1
 
             # ANÁLISIS DE LA RESPUESTA
             # -------------------------
@@ -137,78 +974,281 @@ for ruta in rutas:
             # 3xx = Redirección (301, 302, etc.)
             # 4xx = Error del cliente (404 Not Found, 403 Forbidden)
             # 5xx = Error del servidor (500, 503, etc.)
-            
+
             # Solo nos interesan las respuestas exitosas o redirecciones (< 400)
             # Estas indican que la ruta EXISTE
-            if respuesta.status_code < 400:
-                rutas_encontradas += 1
-                
-                # Mostramos la ruta encontrada
-                print(f"✓ [{metodo}] {url_completa} - Código: {respuesta.status_code}")
-                
-                # Análisis adicional según el código
-                if respuesta.status_code == 200:
-                    # 200 OK: La ruta existe y funciona correctamente
-                    print(f"    → Endpoint funcional encontrado")
-                    
-                elif respuesta.status_code in [301, 302, 307, 308]:
-                    # 3xx: Redirección
-                    print(f"    → Redirige a otra ubicación")
-                    
-                elif respuesta.status_code == 401:
-                    # 401 Unauthorized: Requiere autenticación
-                    # Aunque es 4xx, indica que la ruta existe
-                    print(f"    → Requiere autenticación (ruta protegida)")
-                    
-                elif respuesta.status_code == 403:
-                    # 403 Forbidden: Sin permisos
-                    print(f"    → Acceso prohibido (pero la ruta existe)")
-
-        except requests.Timeout:
-            # La petición tardó demasiado
-            # Podría indicar un problema o un sistema de defensa (rate limiting)
-            pass  # Ignoramos timeouts para no saturar la salida
-            
-        except requests.RequestException as error:
-            # Cualquier otro error de conexión
-            # Esto es normal cuando probamos muchas rutas que no existen
-            pass  # Ignoramos errores comunes para mantener la salida limpia
-
-
-# PASO 3: MOSTRAR ESTADÍSTICAS FINALES
-# -------------------------------------
-print("-" * 70)
-print()
-print("FUZZING COMPLETADO")
-print("=" * 70)
-print(f"Estadísticas:")
-print(f"  - Total de peticiones realizadas: {total_peticiones}")
-print(f"  - Rutas/endpoints encontrados: {rutas_encontradas}")
-print(f"  - Tasa de éxito: {(rutas_encontradas/total_peticiones*100):.2f}%")
-print()
-
-if rutas_encontradas > 0:
-    print("✓ Se encontraron endpoints accesibles")
-    print("  Revisa la lista anterior para identificar posibles vulnerabilidades")
-else:
-    print("⚠️ No se encontraron endpoints accesibles")
-    print("  Posibles razones:")
-    print("  - La API no existe en esa URL")
-    print("  - El diccionario no contiene las rutas correctas")
-    print("  - Hay un firewall o sistema de protección bloqueando")
-
-print()
+            if status_code < 400:
+                # ¿Responde igual que a una ruta inventada? Entonces no existe
+                if linea_base.es_falso_positivo(metodo, huella(status_code, cuerpo, url_completa)):
+                    estadisticas["falsos_positivos"] += 1
+                    return
+                estadisticas["rutas_encontradas"] += 1
+                _, grupo_nuevo = agrupador.anadir(metodo, url_completa, status_code, tipo, cuerpo)
+                mostrado = grupo_nuevo or not agrupar
+                if mostrado:
+                    mostrar_hallazgo(metodo, url_completa, status_code)
+
+                # Modo recursivo: lo encontrado pasa a ser una base nueva.
+                # Las rutas con extensión (ej: config.php) son archivos, no carpetas
+                ultimo_trozo = ruta.rstrip("/").rsplit("/", 1)[-1]
+                nueva_base = url_completa.rstrip("/")
+                if nivel < profundidad and "." not in ultimo_trozo and nueva_base not in bases_vistas:
+                    bases_vistas.add(nueva_base)
+                    heapq.heappush(bases, (nivel + 1, len(bases_vistas), nueva_base))
+                    # Solo se avisa debajo de un hallazgo que se ha mostrado; si
+                    # no, la línea aparecería suelta, debajo de otra ruta
+                    if mostrado:
+                        print(f"    → Se explorará por dentro (nivel {nivel + 1})")
+
+        trabajadores = [asyncio.create_task(trabajador()) for _ in range(concurrencia)]
+        guardado = asyncio.create_task(guardar_periodicamente()) if archivo_estado else None
+
+        try:
+            # Productor: saca la base menos profunda del heap y genera todas las
+            # peticiones candidatas (método, ruta) a partir del diccionario
+            while bases:
+                nivel, orden, base = heapq.heappop(bases)
+                estadisticas["bases_exploradas"] += 1
+                progreso = progresos.setdefault(base, Progreso(nivel, orden))
+                if nivel > 0:
+                    print(f"[Nivel {nivel}] Explorando {base}/")
+                # --skip solo se aplica a la URL base inicial
+                rutas = diccionario.recorrer(diccionario.saltar if nivel == 0 else 0,
+                                             desde=progreso.desde)
+                for metodo, ruta in generar_candidatos(rutas, metodos, extensiones, variantes_caso):
+                    # Los generadores son perezosos: el lector sigue en la
+                    # palabra de la que sale este candidato
+                    posicion = diccionario.posicion
+                    if (posicion, metodo, ruta) in progreso.hechos:
+                        continue  # Ya se probó antes del corte
+                    progreso.produciendo = posicion
+                    progreso.iniciar(posicion)
+                    await cola.put((metodo, base, nivel, ruta, posicion))
+                progreso.produciendo = None
+                progreso.produccion_terminada = True
+                if progreso.terminado():
+                    del progresos[base]
+
+                # Si no quedan bases, esperamos a que terminen las peticiones en
+                # marcha: alguna puede descubrir una base nueva
+                if not bases:
+                    await cola.join()
+
+        finally:
+            # También al pulsar Ctrl+C (asyncio cancela esta función): así
+            # el último checkpoint es de este mismo instante
+            if guardado:
+                guardado.cancel()
+                if bases or progresos:
+                    guardar_estado(archivo_estado, instantanea())
+                elif os.path.exists(archivo_estado):
+                    os.remove(archivo_estado)  # Terminado: ya no hace falta
+
+            # Paramos a los trabajadores antes de cerrar la sesión. Si todo
+            # terminó bien, están parados esperando en la cola (ya vacía)
+            for tarea in trabajadores:
+                tarea.cancel()
+            await asyncio.gather(*trabajadores, return_exceptions=True)
+
+    estadisticas["ventana_final"] = control.ventana
+    estadisticas["ventana_maxima"] = control.ventana_maxima
+    estadisticas["recortes"] = control.recortes
+    return estadisticas
+
+
+# FUNCIÓN 10: MOSTRAR ESTADÍSTICAS FINALES
+# -----------------------------------------
+def mostrar_grupos(grupos):
+    """Imprime el representante de cada grupo y cuántos hallazgos agrupa."""
+    for grupo in sorted(grupos, key=lambda g: -g["cantidad"]):
+        similares = grupo["cantidad"] - 1
+        extra = f" (+{similares} parecidas)" if similares else ""
+        print(f"  ✓ [{grupo['metodo']}] {grupo['url']} - Código: {grupo['codigo']}, "
+              f"{grupo['tipo']}{extra}")
+
+
+def mostrar_estadisticas(estadisticas, segundos):
+    """Imprime el resumen final del fuzzing."""
+    total_peticiones = estadisticas["total_peticiones"]
+    rutas_encontradas = estadisticas["rutas_encontradas"]
+
+    print("-" * 70)
+    print()
+    print("FUZZING COMPLETADO")
+    print("=" * 70)
+    print(f"Estadísticas:")
+    print(f"  - Total de peticiones realizadas: {total_peticiones}")
+    print(f"  - Rutas/endpoints encontrados: {rutas_encontradas} "
+          f"({len(estadisticas['hallazgos'])} grupos de respuestas distintas)")
+    if estadisticas["bases_exploradas"] > 1:
+        print(f"  - Bases exploradas (modo recursivo): {estadisticas['bases_exploradas']}")
+    print(f"  - Falsos positivos descartados: {estadisticas['falsos_positivos']}")
+    if total_peticiones:
+        print(f"  - Tasa de éxito: {(rutas_encontradas/total_peticiones*100):.2f}%")
+    print(f"  - Sin respuesta: {estadisticas['timeouts']} timeouts, "
+          f"{estadisticas['errores']} errores de conexión")
+    print(f"  - Respuestas 429/503 (servidor saturado): {estadisticas['sobrecargas']}")
+    print(f"  - Concurrencia: máxima {estadisticas['ventana_maxima']:.0f}, "
+          f"final {estadisticas['ventana_final']:.0f}, {estadisticas['recortes']} recortes")
+    print(f"  - Tiempo: {segundos:.1f} s ({total_peticiones / max(segundos, 1e-9):.0f} peticiones/s)")
+    print(f"  - {dns_cache.cache_global.estadisticas()}")
+    print()
+
+    if estadisticas["hallazgos"]:
+        print("Hallazgos agrupados (un ejemplo por grupo de respuestas parecidas):")
+        mostrar_grupos(estadisticas["hallazgos"])
+        print()
+
+    if rutas_encontradas > 0:
+        print("✓ Se encontraron endpoints accesibles")
+        print("  Revisa la lista anterior para identificar posibles vulnerabilidades")
+    else:
+        print("⚠️ No se encontraron endpoints accesibles")
+        print("  Posibles razones:")
+        print("  - La API no existe en esa URL")
+        print("  - El diccionario no contiene las rutas correctas")
+        print("  - Hay un firewall o sistema de protección bloqueando")
+
+    print()
+
+
+# PUNTO DE ENTRADA DEL PROGRAMA
+# ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Fuzzer asíncrono para descubrir endpoints de una API.",
+        epilog="Ejemplo: python api_fuzzer.py --url https://127.0.0.1/api --concurrencia 100"
+    )
+    parser.add_argument("--url", default=URL_BASE,
+                        help=f"URL base de la API (por defecto: {URL_BASE})")
+    parser.add_argument("--diccionario", default=ARCHIVO_DICCIONARIO,
+                        help=f"Archivo con una ruta por línea (por defecto: {ARCHIVO_DICCIONARIO})")
+    parser.add_argument("--concurrencia", type=int, default=CONCURRENCIA,
+                        help=f"Máximo de peticiones simultáneas (por defecto: {CONCURRENCIA})")
+    parser.add_argument("--fija", action="store_true",
+                        help="Usar siempre --concurrencia, sin ajustarla según el servidor")
+    parser.add_argument("--timeout", type=float, default=TIEMPO_MAXIMO,
+                        help=f"Segundos máximos por petición (por defecto: {TIEMPO_MAXIMO})")
+    parser.add_argument("--sin-calibracion", action="store_true",
+                        help="No descartar respuestas iguales a las de rutas inexistentes")
+    parser.add_argument("--metodos", default=",".join(METODOS),
+                        help=f"Métodos HTTP separados por comas (por defecto: {','.join(METODOS)})")
+    parser.add_argument("--extensiones", default="",
+                        help="Extensiones a probar con cada palabra, separadas por comas "
+                             "(ej: .json,.bak,.php)")
+    parser.add_argument("--variantes-caso", action="store_true",
+                        help="Probar también cada palabra como Palabra y PALABRA")
+    parser.add_argument("--profundidad", type=int, default=0,
+                        help="Niveles a explorar dentro de cada ruta encontrada "
+                             "(por defecto: 0, sin recursión)")
+    parser.add_argument("--sin-agrupar", action="store_true",
+                        help="Mostrar todos los hallazgos, aunque sean respuestas casi iguales")
+    parser.add_argument("--estado", default=ARCHIVO_ESTADO,
+                        help=f"Archivo donde guardar el progreso (por defecto: {ARCHIVO_ESTADO})")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continuar el fuzzing guardado en el archivo de --estado")
+    parser.add_argument("--skip", type=int, default=0,
+                        help="Saltar las primeras N palabras del diccionario")
+    parser.add_argument("--capacidad-dedupe", type=int, default=CAPACIDAD_DEDUPE,
+                        help="Palabras distintas que caben en la primera capa del filtro "
+                             "de duplicados; si hay más, crece solo "
+                             f"(por defecto: {CAPACIDAD_DEDUPE})")
+    args = parser.parse_args()
+
+    estado = None
+    if args.resume:
+        # Al reanudar, la configuración es la guardada (no la de la línea de comandos)
+        if not os.path.exists(args.estado):
+            parser.error(f"No hay ningún fuzzing guardado en {args.estado}")
+        estado = cargar_estado(args.estado)
+        configuracion = estado["configuracion"]
+    else:
+        configuracion = {
+            "url_base": args.url.rstrip("/"),
+            "diccionario": args.diccionario,
+            "saltar": args.skip,
+            "capacidad": args.capacidad_dedupe,
+            "metodos": [m.strip().upper() for m in args.metodos.split(",") if m.strip()],
+            "concurrencia": args.concurrencia,
+            "tiempo_maximo": args.timeout,
+            "calibracion": not args.sin_calibracion,
+            "adaptativo": not args.fija,
+            "profundidad": args.profundidad,
+            # Aceptamos "json" o ".json"
+            "extensiones": ["." + e.strip().lstrip(".")
+                            for e in args.extensiones.split(",") if e.strip()],
+            "variantes_caso": args.variantes_caso,
+            "agrupar": not args.sin_agrupar,
+        }
+
+    # PASO 1: PREPARAR EL DICCIONARIO DE RUTAS
+    # -----------------------------------------
+    print("=" * 70)
+    print("API FUZZER - DESCUBRIDOR DE ENDPOINTS")
+    print("=" * 70)
+    print()
+    print(f"Configuración:")
+    print(f"  - URL base: {configuracion['url_base']}")
+    print(f"  - Diccionario: {configuracion['diccionario']}")
+    print(f"  - Métodos HTTP: {', '.join(configuracion['metodos'])}")
+    if configuracion["extensiones"]:
+        print(f"  - Extensiones: {', '.join(configuracion['extensiones'])}")
+    if configuracion["variantes_caso"]:
+        print(f"  - Variantes de mayúsculas: sí")
+    print(f"  - Peticiones simultáneas: {configuracion['concurrencia']}"
+          f"{' como máximo (ajuste automático)' if configuracion['adaptativo'] else ' (fija)'}")
+    if configuracion["profundidad"]:
+        print(f"  - Modo recursivo: hasta {configuracion['profundidad']} niveles")
+    print(f"  - Progreso guardado en: {args.estado}")
+    print()
+
+    # No se lee nada todavía: las rutas se leen a medida que el fuzzer las pide
+    rutas = LectorDiccionario(configuracion["diccionario"], saltar=configuracion["saltar"],
+                              capacidad=configuracion["capacidad"])
+    if configuracion["saltar"]:
+        print(f"Se saltarán las primeras {configuracion['saltar']} palabras del diccionario")
+        print()
+    if estado:
+        anteriores = estado["estadisticas"]
+        print(f"Reanudando: {anteriores['total_peticiones']} peticiones ya hechas, "
+              f"{anteriores['rutas_encontradas']} rutas encontradas:")
+        mostrar_grupos(anteriores["hallazgos"])
+        print()
+    print("Iniciando fuzzing... (esto puede tardar)")
+    print("-" * 70)
+
+    # PASO 2: PROBAR CADA RUTA CON CADA MÉTODO
+    # -----------------------------------------
+    inicio = time.perf_counter()
+    try:
+        estadisticas = asyncio.run(fuzzear(
+            configuracion["url_base"], rutas, configuracion["metodos"],
+            configuracion["concurrencia"], configuracion["tiempo_maximo"],
+            calibracion=configuracion["calibracion"],
+            adaptativo=configuracion["adaptativo"],
+            profundidad=configuracion["profundidad"],
+            extensiones=configuracion["extensiones"],
+            variantes_caso=configuracion["variantes_caso"],
+            agrupar=configuracion["agrupar"],
+            archivo_estado=args.estado, estado=estado))
+    except KeyboardInterrupt:
+        print()
+        print(f"Interrumpido. Progreso guardado en {args.estado}")
+        print(f"Para continuar: python api_fuzzer.py --resume --estado {args.estado}")
+        raise SystemExit(1)
+
+    # PASO 3: MOSTRAR ESTADÍSTICAS FINALES
+    # -------------------------------------
+    print(f"Diccionario: {rutas.leidas} palabras leídas, "
+          f"{rutas.duplicadas} duplicadas descartadas")
+    mostrar_estadisticas(estadisticas, time.perf_counter() - inicio)
 
 # MEJORAS POSIBLES:
 # -----------------
-# 1. Añadir más métodos HTTP (PUT, DELETE, PATCH, OPTIONS, HEAD)
-# 2. Enviar datos en el cuerpo (JSON, formularios)
-# 3. Probar diferentes cabeceras HTTP
-# 4. Añadir delays entre peticiones (time.sleep()) para no saturar
-# 5. Guardar resultados en un archivo
-# 6. Usar threading para ir más rápido
-# 7. Detectar falsos positivos (páginas de error personalizadas)
-# 8. Añadir autenticación (tokens, cookies)
+# 1. Enviar datos en el cuerpo (JSON, formularios)
+# 2. Probar diferentes cabeceras HTTP
+# 3. Guardar resultados en un archivo
+# 4. Añadir autenticación (tokens, cookies)
 #
 # HERRAMIENTAS PROFESIONALES:
 # - ffuf: fuzzer rápido y potente en Go
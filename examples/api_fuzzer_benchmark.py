@@ -0,0 +1,407 @@
+"""
+BANCO DE PRUEBAS DEL API FUZZER - Script Educativo
+===================================================
+Este script mide lo rápido que es api_fuzzer.py, siempre en las mismas
+condiciones, para poder comparar de forma objetiva un cambio en el
+motor del fuzzer con la versión anterior.
+
+¿POR QUÉ UN BANCO DE PRUEBAS?
+"Parece que va más rápido" no es una medida. La velocidad de un fuzzer
+depende del servidor, de la red, del diccionario... Si cada prueba se
+hace contra un sitio distinto, los números no se pueden comparar.
+Aquí todo es local y repetible:
+- El servidor objetivo se arranca en este mismo equipo
+- El diccionario se genera siempre igual (misma semilla aleatoria)
+- Cada medida se repite varias veces y se da la mediana
+
+¿CONTRA QUÉ SERVIDOR?
+- simulado: un servidor aiohttp mínimo, con latencia y errores
+  configurables. Las palabras que empiezan por "real" existen (200),
+  el resto no (404). Es tan ligero que mide sobre todo al fuzzer.
+- users: la API de api_users.py (Flask)
+- honeypot: el honeypot de api_honeypot.py (Flask), que además guarda
+  un registro de cada petición (se escribe en una carpeta temporal)
+
+El servidor se arranca en OTRO proceso: así la CPU y la memoria que se
+miden son solo las del fuzzer.
+
+¿QUÉ MIDE?
+- Peticiones por segundo (tiempo real, time.perf_counter)
+- CPU por petición (time.process_time: tiempo que el proceso ha usado
+  la CPU, sin contar el tiempo esperando a la red)
+- Memoria máxima del proceso (resource.getrusage, ru_maxrss)
+- Opcionalmente, el pico de memoria reservada por Python (tracemalloc)
+
+¿QUÉ APRENDERÁS?
+- Diferencia entre tiempo real y tiempo de CPU
+- Medir la memoria de un proceso con resource y tracemalloc
+- Arrancar y parar un servidor en un subproceso (subprocess)
+- Crear un servidor web mínimo con aiohttp.web
+- Por qué se usa la mediana de varias repeticiones y no una sola medida
+
+REQUISITOS:
+    pip install aiohttp flask
+    (resource solo existe en Linux y macOS; en Windows no se mide la memoria máxima)
+
+EJEMPLOS DE USO:
+    python api_fuzzer_benchmark.py
+    python api_fuzzer_benchmark.py --palabras 20000 --repeticiones 5
+    python api_fuzzer_benchmark.py --latencia 20 --jitter 0.5   (servidor lento)
+    python api_fuzzer_benchmark.py --errores 0.05   (5% de respuestas 503)
+    python api_fuzzer_benchmark.py --objetivo users
+    python api_fuzzer_benchmark.py --objetivo honeypot --palabras 1000
+    python api_fuzzer_benchmark.py --guardar antes.json
+    (cambias el motor del fuzzer)
+    python api_fuzzer_benchmark.py --comparar antes.json
+"""
+
+# Importamos las librerías necesarias
+import argparse    # Para leer opciones de la línea de comandos
+import asyncio     # Para ejecutar el fuzzer (y el servidor simulado)
+import contextlib  # Para silenciar la salida del fuzzer mientras se mide
+import json        # Para guardar y comparar resultados
+import os          # Para rutas de archivos
+import random      # Para el diccionario sintético, la latencia y los errores
+import socket      # Para saber cuándo el servidor ya acepta conexiones
+import statistics  # Para calcular la mediana
+import subprocess  # Para arrancar el servidor en otro proceso
+import sys         # Para saber qué Python usar y en qué sistema estamos
+import tempfile    # Carpeta temporal para el diccionario y los registros
+import time        # Para medir tiempo real y tiempo de CPU
+import tracemalloc  # Para medir la memoria que reserva Python
+import aiohttp.web  # Servidor web asíncrono (objetivo simulado)
+import api_fuzzer  # El fuzzer que medimos (api_fuzzer.py, en este mismo directorio)
+
+# resource es opcional: no existe en Windows
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# CONFIGURACIÓN
+# -------------
+PUERTO = 8790            # Puerto del servidor objetivo
+PALABRAS = 5000          # Palabras del diccionario sintético
+PROPORCION_REALES = 0.01  # Fracción de palabras que existen en el servidor simulado
+REPETICIONES = 3         # Veces que se repite la medida
+SEMILLA = 1234           # Misma semilla = mismo diccionario en cada prueba
+ESPERA_ARRANQUE = 15     # Segundos máximos esperando a que arranque el servidor
+
+# Cada objetivo: qué URL se le pasa al fuzzer
+# (api_users.py tiene /users en la raíz; el honeypot lo captura todo en /api/)
+URL_OBJETIVOS = {
+    "simulado": "http://127.0.0.1:{puerto}/api",
+    "users": "http://127.0.0.1:{puerto}",
+    "honeypot": "http://127.0.0.1:{puerto}/api",
+}
+
+
+# FUNCIÓN 1: SERVIDOR SIMULADO
+# ----------------------------
+def crear_app_simulada(latencia, jitter, errores):
+    """
+    Crea una aplicación aiohttp que responde a cualquier ruta.
+
+    Parámetros:
+        latencia (float): Milisegundos que tarda cada respuesta
+        jitter (float): Variación de la latencia (0.5 = entre 50% y 150%)
+        errores (float): Probabilidad de responder 503 (0 a 1)
+
+    Retorna:
+        aiohttp.web.Application: La aplicación, lista para servir
+    """
+    async def responder(request):
+        if latencia:
+            await asyncio.sleep(latencia / 1000 * random.uniform(1 - jitter, 1 + jitter))
+        # Inyección de errores: el servidor dice que está saturado
+        if random.random() < errores:
+            return aiohttp.web.json_response({"error": "Servicio no disponible"}, status=503)
+        palabra = request.path.rsplit("/", 1)[-1]
+        if palabra.startswith("real"):
+            return aiohttp.web.json_response({"recurso": palabra, "ok": True})
+        return aiohttp.web.json_response({"error": "Ruta no encontrada"}, status=404)
+
+    app = aiohttp.web.Application()
+    # "{ruta:.*}" captura cualquier ruta, con cualquier método
+    app.router.add_route("*", "/{ruta:.*}", responder)
+    return app
+
+
+def servir(objetivo, puerto, latencia, jitter, errores):
+    """
+    Ejecuta el servidor objetivo (esta función corre en el subproceso).
+
+    Para users y honeypot se importa la app de Flask del script
+    correspondiente y se arranca en el puerto indicado. Al importarlos,
+    su bloque "if __name__ == '__main__'" no se ejecuta, así que no se
+    usa su puerto ni su certificado SSL.
+    """
+    if objetivo == "simulado":
+        aiohttp.web.run_app(crear_app_simulada(latencia, jitter, errores),
+                            host="127.0.0.1", port=puerto, print=None, access_log=None)
+        return
+
+    import logging
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # Sin una línea por petición
+    if objetivo == "users":
+        import api_users as modulo
+    else:
+        import api_honeypot as modulo
+    modulo.app.run(host="127.0.0.1", port=puerto, threaded=True)
+
+
+def arrancar_servidor(objetivo, puerto, latencia, jitter, errores, carpeta):
+    """
+    Arranca el servidor objetivo en otro proceso y espera a que escuche.
+
+    El subproceso es este mismo script con la opción --servir. Se
+    ejecuta dentro de 'carpeta' para que los archivos que cree (el
+    registro del honeypot) no ensucien el directorio actual.
+
+    Retorna:
+        subprocess.Popen: El proceso del servidor (hay que pararlo al terminar)
+    """
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    entorno = dict(os.environ, PYTHONPATH=directorio)  # Para importar api_users, etc.
+    proceso = subprocess.Popen(
+        [sys.executable, os.path.join(directorio, os.path.basename(__file__)),
+         "--servir", objetivo, "--puerto", str(puerto), "--latencia", str(latencia),
+         "--jitter", str(jitter), "--errores", str(errores)],
+        cwd=carpeta, env=entorno,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+    # Intentamos conectar hasta que el servidor acepte conexiones
+    limite = time.monotonic() + ESPERA_ARRANQUE
+    while time.monotonic() < limite:
+        if proceso.poll() is not None:
+            raise RuntimeError(f"El servidor '{objetivo}' terminó al arrancar "
+                               f"(código {proceso.returncode}). ¿Está instalado Flask?")
+        try:
+            socket.create_connection(("127.0.0.1", puerto), timeout=0.5).close()
+            return proceso
+        except OSError:
+            time.sleep(0.1)
+    proceso.terminate()
+    raise RuntimeError(f"El servidor '{objetivo}' no respondió en {ESPERA_ARRANQUE} s")
+
+
+# FUNCIÓN 2: DICCIONARIO SINTÉTICO
+# --------------------------------
+def crear_diccionario(ruta_archivo, palabras, proporcion_reales, semilla=SEMILLA):
+    """
+    Escribe un diccionario de prueba, siempre igual para la misma semilla.
+
+    Las palabras son únicas (el filtro de duplicados no descarta ninguna).
+    Una fracción 'proporcion_reales' empieza por "real" y existe en el
+    servidor simulado. Al final se añade "users", que existe en api_users.py.
+    """
+    generador = random.Random(semilla)  # Generador propio: no depende de nadie más
+    with open(ruta_archivo, "w") as archivo:
+        for i in range(palabras):
+            prefijo = "real" if generador.random() < proporcion_reales else "ruta"
+            archivo.write(f"{prefijo}{i:07d}\n")
+        archivo.write("users\n")
+
+
+# FUNCIÓN 3: MEDIR UNA EJECUCIÓN DEL FUZZER
+# -----------------------------------------
+def memoria_maxima_mb():
+    """
+    Memoria máxima que ha usado este proceso (RSS), en MB.
+
+    ru_maxrss está en KB en Linux y en bytes en macOS. Es el máximo desde
+    que arrancó el proceso: no baja entre una repetición y la siguiente.
+    """
+    if resource is None:
+        return None
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        maximo /= 1024
+    return maximo / 1024
+
+
+def medir(url_base, archivo_diccionario, metodos, concurrencia, adaptativo, con_tracemalloc):
+    """
+    Ejecuta el fuzzer una vez y devuelve sus números.
+
+    La salida del fuzzer (cada ruta encontrada) se descarta: escribir en
+    la terminal también cuesta tiempo y no es lo que queremos medir.
+
+    Retorna:
+        dict: peticiones, segundos, peticiones/s, CPU por petición,
+              memoria y contadores de errores
+    """
+    diccionario = api_fuzzer.LectorDiccionario(archivo_diccionario)
+    if con_tracemalloc:
+        # tracemalloc ralentiza Python: solo se activa si se pide
+        tracemalloc.start()
+
+    cpu_inicio = time.process_time()
+    inicio = time.perf_counter()
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        estadisticas = asyncio.run(api_fuzzer.fuzzear(
+            url_base, diccionario, metodos, concurrencia, adaptativo=adaptativo))
+    segundos = time.perf_counter() - inicio
+    cpu = time.process_time() - cpu_inicio
+
+    pico_python = None
+    if con_tracemalloc:
+        pico_python = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+
+    peticiones = estadisticas["total_peticiones"]
+    return {
+        "peticiones": peticiones,
+        "segundos": segundos,
+        "peticiones_s": peticiones / segundos,
+        "cpu_us_peticion": cpu / max(peticiones, 1) * 1_000_000,
+        "memoria_max_mb": memoria_maxima_mb(),
+        "pico_python_mb": pico_python,
+        "encontradas": estadisticas["rutas_encontradas"],
+        "sobrecargas": estadisticas["sobrecargas"],
+        "timeouts": estadisticas["timeouts"],
+        "errores": estadisticas["errores"],
+    }
+
+
+# FUNCIÓN 4: MOSTRAR Y COMPARAR RESULTADOS
+# ----------------------------------------
+# Qué columnas se muestran: (clave, título, ancho, decimales)
+COLUMNAS = [
+    ("peticiones_s", "pet/s", 9, 0),
+    ("cpu_us_peticion", "CPU µs/pet", 12, 1),
+    ("memoria_max_mb", "RSS máx MB", 12, 1),
+    ("pico_python_mb", "Python MB", 11, 1),
+]
+
+
+def mostrar_fila(nombre, medida):
+    """Imprime una fila de la tabla de resultados."""
+    celdas = []
+    for clave, _, ancho, decimales in COLUMNAS:
+        valor = medida.get(clave)
+        celdas.append(f"{valor:>{ancho}.{decimales}f}" if valor is not None else f"{'-':>{ancho}}")
+    print(f"  {nombre:<13}" + "".join(celdas))
+
+
+def resumir(medidas):
+    """Mediana de cada columna (la mediana ignora una repetición anómala)."""
+    resumen = {}
+    for clave in medidas[0]:
+        valores = [m[clave] for m in medidas if m[clave] is not None]
+        resumen[clave] = statistics.median(valores) if valores else None
+    return resumen
+
+
+def comparar(anterior, actual):
+    """Imprime cuánto ha cambiado cada columna respecto a un resultado guardado."""
+    print("Comparado con la medida guardada:")
+    for clave, titulo, _, _ in COLUMNAS:
+        antes, ahora = anterior.get(clave), actual.get(clave)
+        if not antes or ahora is None:
+            continue
+        cambio = (ahora - antes) / antes * 100
+        print(f"  - {titulo}: {antes:.1f} → {ahora:.1f} ({cambio:+.1f}%)")
+    print("  (más pet/s es mejor; menos CPU y memoria es mejor)")
+
+
+# PUNTO DE ENTRADA DEL PROGRAMA
+# ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Mide la velocidad, la CPU y la memoria de api_fuzzer.py en local.",
+        epilog="Ejemplo: python api_fuzzer_benchmark.py --palabras 20000 --latencia 5"
+    )
+    parser.add_argument("--objetivo", choices=sorted(URL_OBJETIVOS), default="simulado",
+                        help="Servidor contra el que medir (por defecto: simulado)")
+    parser.add_argument("--palabras", type=int, default=PALABRAS,
+                        help=f"Palabras del diccionario sintético (por defecto: {PALABRAS})")
+    parser.add_argument("--reales", type=float, default=PROPORCION_REALES,
+                        help="Fracción de palabras que existen en el servidor simulado "
+                             f"(por defecto: {PROPORCION_REALES})")
+    parser.add_argument("--latencia", type=float, default=0,
+                        help="Milisegundos de latencia del servidor simulado (por defecto: 0)")
+    parser.add_argument("--jitter", type=float, default=0.2,
+                        help="Variación de la latencia, de 0 a 1 (por defecto: 0.2)")
+    parser.add_argument("--errores", type=float, default=0,
+                        help="Probabilidad de que el servidor simulado responda 503 "
+                             "(por defecto: 0)")
+    parser.add_argument("--metodos", default=",".join(api_fuzzer.METODOS),
+                        help=f"Métodos HTTP (por defecto: {','.join(api_fuzzer.METODOS)})")
+    parser.add_argument("--concurrencia", type=int, default=api_fuzzer.CONCURRENCIA,
+                        help=f"Concurrencia máxima del fuzzer (por defecto: {api_fuzzer.CONCURRENCIA})")
+    parser.add_argument("--fija", action="store_true",
+                        help="Concurrencia fija, sin ajuste automático")
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES,
+                        help=f"Veces que se repite la medida (por defecto: {REPETICIONES})")
+    parser.add_argument("--puerto", type=int, default=PUERTO,
+                        help=f"Puerto del servidor objetivo (por defecto: {PUERTO})")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Medir también el pico de memoria de Python (más lento)")
+    parser.add_argument("--guardar", metavar="ARCHIVO",
+                        help="Guardar el resultado en un JSON para compararlo después")
+    parser.add_argument("--comparar", metavar="ARCHIVO",
+                        help="Comparar el resultado con uno guardado con --guardar")
+    # Uso interno: el script se llama a sí mismo para hacer de servidor
+    parser.add_argument("--servir", choices=sorted(URL_OBJETIVOS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.servir:
+        servir(args.servir, args.puerto, args.latencia, args.jitter, args.errores)
+        raise SystemExit(0)
+
+    metodos = [m.strip().upper() for m in args.metodos.split(",") if m.strip()]
+    url_base = URL_OBJETIVOS[args.objetivo].format(puerto=args.puerto)
+
+    print("=" * 70)
+    print("BANCO DE PRUEBAS DEL API FUZZER")
+    print("=" * 70)
+    print()
+    print("Configuración:")
+    print(f"  - Objetivo: {args.objetivo} ({url_base})")
+    if args.objetivo == "simulado":
+        print(f"  - Latencia: {args.latencia} ms (±{args.jitter:.0%}), "
+              f"errores 503: {args.errores:.1%}")
+    print(f"  - Diccionario: {args.palabras} palabras sintéticas, métodos {', '.join(metodos)}")
+    print(f"  - Concurrencia: {args.concurrencia}{' (fija)' if args.fija else ' como máximo'}")
+    print(f"  - Repeticiones: {args.repeticiones}")
+    print()
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        archivo_diccionario = os.path.join(carpeta, "diccionario.txt")
+        crear_diccionario(archivo_diccionario, args.palabras, args.reales)
+        servidor = arrancar_servidor(args.objetivo, args.puerto, args.latencia,
+                                     args.jitter, args.errores, carpeta)
+        medidas = []
+        try:
+            print(f"  {'':<13}" + "".join(f"{titulo:>{ancho}}"
+                                          for _, titulo, ancho, _ in COLUMNAS))
+            for repeticion in range(1, args.repeticiones + 1):
+                medida = medir(url_base, archivo_diccionario, metodos, args.concurrencia,
+                               not args.fija, args.tracemalloc)
+                medidas.append(medida)
+                mostrar_fila(f"Repetición {repeticion}", medida)
+        finally:
+            servidor.terminate()
+            servidor.wait()
+
+    resultado = resumir(medidas)
+    mostrar_fila("Mediana", resultado)
+    print()
+    print(f"Cada repetición: {resultado['peticiones']:.0f} peticiones, "
+          f"{resultado['encontradas']:.0f} rutas encontradas, "
+          f"{resultado['sobrecargas']:.0f} respuestas 429/503, "
+          f"{resultado['timeouts']:.0f} timeouts, {resultado['errores']:.0f} errores")
+    print()
+
+    if args.comparar:
+        with open(args.comparar) as archivo:
+            comparar(json.load(archivo)["resultado"], resultado)
+        print()
+    if args.guardar:
+        with open(args.guardar, "w") as archivo:
+            json.dump({"configuracion": vars(args), "resultado": resultado,
+                       "repeticiones": medidas}, archivo, indent=4)
+        print(f"Resultado guardado en {args.guardar}")
@@ -15,7 +15,8 @@ Un honeypot es un sistema señuelo diseñado para:
 1. Simula una API que parece real
 2. Registra TODA la información de cada petición
 3. Responde con errores 404 (como si las rutas no existieran)
-4. Guarda los datos en un archivo JSON para análisis posterior
+4. Añade cada petición como una línea JSON al archivo de registro
+   (formato NDJSON), para analizarlo después
 
 ¿QUÉ INFORMACIÓN CAPTURA?
 - Dirección IP del atacante/visitante
@@ -31,6 +32,10 @@ Un honeypot es un sistema señuelo diseñado para:
 - Cómo interceptar peticiones con @app.before_request
 - Registro detallado de actividad HTTP
 - Análisis de intentos de ataque
+- Registros "solo añadir" en formato NDJSON (un JSON por línea)
+- Buffers de escritura y fsync: velocidad frente a seguridad de los datos
+- Escribir en segundo plano con una cola y un hilo (ver escritor_logs.py)
+- Rotar y comprimir los registros para que no crezcan sin límite
 
 REQUISITOS:
 1. Instalar Flask: pip install flask
@@ -42,14 +47,25 @@ CÓMO PROBAR:
     curl -k https://127.0.0.1/api/usuarios
     curl -k -X POST https://127.0.0.1/api/login -d "user=admin&pass=123"
 
-Luego revisa el archivo "registro_honeypot.json" para ver los datos capturados.
+Luego revisa el archivo "registro_honeypot.jsonl" para ver los datos capturados.
+
+OPCIONES:
+    sudo python api_honeypot.py --fsync siempre   (no perder nada aunque se caiga el equipo)
+    sudo python api_honeypot.py --desbordamiento muestrear   (qué hacer si llegan
+        más peticiones de las que da tiempo a escribir)
+    sudo python api_honeypot.py --rotar-mb 50 --rotar-horas 6 --compresion gzip
+    python api_honeypot.py --convertir registro_honeypot.json
+        (pasa un registro del formato antiguo, una lista JSON, a NDJSON)
+    python api_honeypot.py --consultar --desde 2026-10-19T10:00 --hasta 2026-10-19T11:00
+        (muestra lo que llegó en esa hora UTC, buscando también en los archivos rotados)
 """
 
 # Importamos las librerías necesarias
 from flask import Flask, request, jsonify  # Flask: para crear el servidor web
-import json       # Para trabajar con archivos JSON
-import os         # Para operaciones con archivos del sistema
+import argparse   # Para leer opciones de la línea de comandos
+import json       # Para mostrar los registros con --consultar
 from datetime import datetime  # Para obtener fecha y hora
+import escritor_logs  # Escritura del registro en segundo plano (escritor_logs.py)
 
 # Creamos la aplicación Flask
 app = Flask(__name__)
@@ -57,14 +73,33 @@ app = Flask(__name__)
 # CONFIGURACIÓN
 # -------------
 # Nombre del archivo donde guardaremos todos los registros de acceso
-ARCHIVO_LOG = "registro_honeypot.json"
+# .jsonl = "JSON Lines": un objeto JSON completo en cada línea (NDJSON)
+ARCHIVO_LOG = "registro_honeypot.jsonl"
 
 
 # FUNCIÓN DE REGISTRO
 # --------------------
+# ¿POR QUÉ NDJSON Y NO UNA LISTA JSON?
+# Con una lista JSON, para añadir un registro hay que leer el archivo
+# entero, añadir el elemento y volver a escribirlo todo. Con 100.000
+# registros, CADA petición lee y escribe decenas de MB: el honeypot va
+# cada vez más lento justo cuando más le escanean.
+# Con una línea por registro basta con añadir al final del archivo
+# (modo "a"): el coste es siempre el mismo, tenga el archivo 10 líneas o
+# 10 millones. Y si el programa se corta a mitad de una línea, solo se
+# pierde esa línea, no el archivo entero.
+#
+# ¿POR QUÉ EN SEGUNDO PLANO?
+# Aunque añadir una línea es barato, sigue siendo tocar el disco, y
+# durante un escaneo llegan cientos de peticiones por segundo. La
+# petición solo deja su registro en una cola; un hilo aparte los escribe
+# por lotes (ver escritor_logs.py).
+registro = escritor_logs.EscritorLogs(ARCHIVO_LOG)
+
+
 def guardar_log(data):
     """
-    Guarda la información de cada petición HTTP en un archivo JSON.
+    Guarda la información de cada petición HTTP en el archivo de registro.
     
     Esta función mantiene un historial de TODAS las peticiones recibidas,
     lo cual es crucial para analizar intentos de ataque o escaneos.
@@ -72,22 +107,7 @@ def guardar_log(data):
     Parámetros:
         data (dict): Diccionario con toda la información de la petición
     """
-    # Si el archivo de logs no existe, lo creamos con una lista vacía
-    if not os.path.exists(ARCHIVO_LOG):
-        with open(ARCHIVO_LOG, "w") as f:
-            json.dump([], f)
-
-    # Leemos los logs existentes
-    with open(ARCHIVO_LOG, "r") as f:
-        logs = json.load(f)
-
-    # Agregamos la nueva entrada al final de la lista
-    logs.append(data)
-
-    # Guardamos todo de nuevo en el archivo
-    # indent=4 hace que el JSON sea legible (con formato)
-    with open(ARCHIVO_LOG, "w") as f:
-        json.dump(logs, f, indent=4)
+    registro.escribir(data)
     
     # Mostramos en consola que se registró un acceso
     print(f"[ACCESO REGISTRADO] IP: {data['ip_origen']} - Ruta: {data['ruta']}")
@@ -181,6 +201,64 @@ def todo_no_encontrado(path):
 # PUNTO DE ENTRADA DEL PROGRAMA
 # ------------------------------
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Honeypot que simula una API y registra cada acceso.")
+    parser.add_argument("--fsync", choices=escritor_logs.POLITICAS_FSYNC,
+                        default=escritor_logs.POLITICA_FSYNC,
+                        help=f"Cuándo forzar la escritura en disco (por defecto: "
+                             f"{escritor_logs.POLITICA_FSYNC})")
+    parser.add_argument("--intervalo-fsync", type=float, default=escritor_logs.INTERVALO_FSYNC,
+                        help=f"Segundos entre escrituras en disco con --fsync periodica "
+                             f"(por defecto: {escritor_logs.INTERVALO_FSYNC})")
+    parser.add_argument("--desbordamiento", choices=escritor_logs.POLITICAS_DESBORDAMIENTO,
+                        default=escritor_logs.POLITICA_DESBORDAMIENTO,
+                        help=f"Qué hacer si la cola de registros se llena (por defecto: "
+                             f"{escritor_logs.POLITICA_DESBORDAMIENTO})")
+    parser.add_argument("--capacidad-cola", type=int, default=escritor_logs.CAPACIDAD_COLA,
+                        help=f"Registros que pueden esperar en la cola (por defecto: "
+                             f"{escritor_logs.CAPACIDAD_COLA})")
+    parser.add_argument("--rotar-mb", type=float,
+                        default=escritor_logs.TAMANO_MAXIMO / 1024 / 1024,
+                        help="Empezar un archivo nuevo al llegar a estos MB (0 = no rotar por "
+                             f"tamaño; por defecto: {escritor_logs.TAMANO_MAXIMO // 1024 // 1024})")
+    parser.add_argument("--rotar-horas", type=float, default=escritor_logs.EDAD_MAXIMA / 3600,
+                        help="Empezar un archivo nuevo cada estas horas (0 = no rotar por "
+                             f"tiempo; por defecto: {escritor_logs.EDAD_MAXIMA // 3600})")
+    parser.add_argument("--compresion", choices=escritor_logs.COMPRESIONES,
+                        default=escritor_logs.COMPRESION,
+                        help="Cómo comprimir los archivos rotados (por defecto: auto, "
+                             "zstd si está instalado y si no gzip)")
+    parser.add_argument("--convertir", metavar="ARCHIVO_JSON",
+                        help=f"Convertir un registro antiguo (lista JSON) a {ARCHIVO_LOG} y salir")
+    parser.add_argument("--consultar", action="store_true",
+                        help="No arrancar el servidor: mostrar los registros guardados "
+                             "(de todos los archivos rotados) entre --desde y --hasta")
+    parser.add_argument("--desde", help="Con --consultar: momento inicial, en UTC como los "
+                                         "registros (ej: 2026-10-19T10:00; con zona horaria "
+                                         "también vale: 2026-10-19T12:00+02:00)")
+    parser.add_argument("--hasta", help="Con --consultar: momento final en UTC, no incluido")
+    args = parser.parse_args()
+
+    if args.convertir:
+        total = escritor_logs.convertir_lista_json(args.convertir, ARCHIVO_LOG)
+        print(f"{total} registros de {args.convertir} añadidos a {ARCHIVO_LOG}")
+        raise SystemExit(0)
+
+    if args.consultar:
+        # Una línea JSON por registro: se puede encadenar con jq
+        for datos in escritor_logs.leer_registros(ARCHIVO_LOG, args.desde, args.hasta):
+            print(json.dumps(datos, ensure_ascii=False))
+        raise SystemExit(0)
+
+    if args.compresion == "zstd" and escritor_logs.zstd is None:
+        parser.error("zstd no está disponible: pip install zstandard (o usa --compresion gzip)")
+    if not args.intervalo_fsync > 0:
+        parser.error("--intervalo-fsync debe ser mayor que 0")
+    registro = escritor_logs.EscritorLogs(
+        ARCHIVO_LOG, politica_fsync=args.fsync, intervalo_fsync=args.intervalo_fsync,
+        desbordamiento=args.desbordamiento, capacidad=args.capacidad_cola,
+        tamano_maximo=int(args.rotar_mb * 1024 * 1024), edad_maxima=args.rotar_horas * 3600,
+        compresion=args.compresion)
+
     print("=" * 70)
     print("HONEYPOT API - SISTEMA DE DETECCIÓN INICIADO")
     print("=" * 70)
@@ -190,13 +268,16 @@ if __name__ == "__main__":
     print("  - Host: 0.0.0.0 (accesible desde cualquier IP)")
     print("  - Certificado SSL: cert.pem")
     print("  - Clave privada: key.pem")
-    print(f"  - Archivo de registro: {ARCHIVO_LOG}")
+    print(f"  - Archivo de registro: {ARCHIVO_LOG} (fsync: {registro.politica_fsync}, "
+          f"cola llena: {registro.desbordamiento})")
+    print(f"  - Rotación: cada {args.rotar_mb:g} MB o {args.rotar_horas:g} horas, "
+          f"compresión {registro.compresion}")
     print()
     print("Estado: ACTIVO - Registrando todos los accesos")
     print()
     print("IMPORTANTE:")
     print("  - Ejecuta con sudo para usar el puerto 443")
-    print("  - Todos los accesos se guardan en registro_honeypot.json")
+    print(f"  - Todos los accesos se guardan en {ARCHIVO_LOG}")
     print("  - Revisa el archivo periódicamente para detectar ataques")
     print()
     print("Presiona Ctrl+C para detener")
@@ -237,6 +318,13 @@ if __name__ == "__main__":
 #    - Rutas con ../, ..\\, etc.
 #    - Intentos de acceder a archivos del sistema
 #
-# COMANDO ÚTIL PARA ANALIZAR LOGS:
-# jq '.[] | select(.metodo == "POST")' registro_honeypot.json
-# (Muestra solo las peticiones POST usando jq)
+# COMANDOS ÚTILES PARA ANALIZAR LOGS:
+# jq 'select(.metodo == "POST")' registro_honeypot.jsonl
+# (Muestra solo las peticiones POST usando jq: jq lee un JSON por línea)
+#
+# tail -f registro_honeypot.jsonl | jq .ruta
+# (Muestra en directo las rutas que se van pidiendo)
+#
+# python api_honeypot.py --consultar --desde 2026-10-19 | jq 'select(.metodo == "POST")'
+# (Lo mismo que el primero, pero incluyendo los archivos ya rotados y comprimidos;
+#  registro_honeypot.indice.json dice qué intervalo de tiempo hay en cada uno)
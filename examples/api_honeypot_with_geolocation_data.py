@@ -14,14 +14,29 @@ REQUISITOS PREVIOS:
 3. Crear certificados SSL con este comando:
    openssl req -x509 -newkey rsa:4096 -keyout key.pem -out cert.pem -days 365 -nodes
 4. Ejecutar con permisos de administrador (sudo) si usas el puerto 443
+
+REGISTRO:
+Cada acceso se añade como una línea JSON a "honeypot_log.jsonl" (NDJSON).
+La escritura la hace un hilo aparte (ver escritor_logs.py), así que la
+petición no espera al disco. La consulta de geolocalización, en cambio,
+SÍ se hace mientras la petición espera: es una petición HTTP a otro
+servidor y suele tardar mucho más que escribir el registro.
+Cuando el archivo llega a --rotar-mb MB o cumple --rotar-horas horas se
+guarda aparte comprimido y se empieza otro (ver escritor_logs.py).
+
+OPCIONES:
+    sudo python api_honeypot_with_geolocation_data.py --desbordamiento bloquear
+    sudo python api_honeypot_with_geolocation_data.py --rotar-mb 50 --rotar-horas 6
+    python api_honeypot_with_geolocation_data.py --convertir honeypot_log.json
+        (pasa un registro del formato antiguo, una lista JSON, a NDJSON)
 """
 
 # Importamos las librerías necesarias
 from flask import Flask, request, jsonify  # Flask: para crear el servidor web
-import json  # Para trabajar con archivos JSON
-import os  # Para operaciones con el sistema operativo
+import argparse  # Para leer opciones de la línea de comandos
 from datetime import datetime  # Para obtener la fecha y hora actual
 import requests  # Para hacer peticiones HTTP a APIs externas
+import escritor_logs  # Escritura del registro en segundo plano (escritor_logs.py)
 
 # Creamos la aplicación Flask (nuestro servidor web)
 app = Flask(__name__)
@@ -29,7 +44,12 @@ app = Flask(__name__)
 # CONFIGURACIÓN DEL SCRIPT
 # ------------------------
 # Nombre del archivo donde guardaremos los registros de accesos
-ARCHIVO_REGISTRO = "honeypot_log.json"
+# .jsonl = "JSON Lines": un objeto JSON completo en cada línea (NDJSON)
+ARCHIVO_REGISTRO = "honeypot_log.jsonl"
+
+# El registro se escribe en segundo plano: la petición solo lo deja en una cola
+# campo_tiempo: la clave con la fecha de cada registro (para el índice de rotación)
+registro = escritor_logs.EscritorLogs(ARCHIVO_REGISTRO, campo_tiempo="fecha_hora")
 
 
 def obtener_geolocalizacion(direccion_ip):
@@ -82,28 +102,17 @@ def guardar_registro(datos):
     Guarda los datos de un acceso en el archivo de registro.
     
     Esta función almacena toda la información de cada petición HTTP que
-    recibe nuestro servidor en un archivo JSON.
+    recibe nuestro servidor en un archivo NDJSON (una línea por acceso).
+    
+    Antes se leía el archivo entero, se añadía el registro y se volvía a
+    escribir todo: cada acceso era más lento que el anterior. Ahora el
+    registro se deja en una cola y el hilo escritor lo añade al final del
+    archivo, junto con los demás que estén esperando.
     
     Parámetros:
         datos (dict): Diccionario con la información a guardar
     """
-    # Verificamos si el archivo de registro existe
-    if not os.path.exists(ARCHIVO_REGISTRO):
-        # Si no existe, lo creamos con una lista vacía
-        with open(ARCHIVO_REGISTRO, "w") as archivo:
-            json.dump([], archivo)
-    
-    # Leemos los registros existentes del archivo
-    with open(ARCHIVO_REGISTRO, "r") as archivo:
-        registros_existentes = json.load(archivo)
-    
-    # Añadimos el nuevo registro a la lista
-    registros_existentes.append(datos)
-    
-    # Guardamos la lista actualizada en el archivo
-    # indent=4 hace que el JSON sea más legible (con sangría)
-    with open(ARCHIVO_REGISTRO, "w") as archivo:
-        json.dump(registros_existentes, archivo, indent=4)
+    registro.escribir(datos)
     
     # Mostramos en la consola que se guardó un nuevo registro
     print(f"[NUEVO ACCESO] IP: {datos['ip_origen']} - Ruta: {datos['ruta_solicitada']}")
@@ -124,7 +133,8 @@ def registrar_peticion_entrante():
     
     # Creamos un diccionario con toda la información de la petición
     datos_registro = {
-        # Fecha y hora actual en formato ISO (ej: "2025-11-21T10:30:45")
+        # Fecha y hora actual en formato ISO y en UTC, no en hora local
+        # (ej: "2025-11-21T10:30:45"); el índice de segmentos usa este campo
         "fecha_hora": datetime.utcnow().isoformat(),
         
         # IP del cliente
@@ -152,6 +162,8 @@ def registrar_peticion_entrante():
         "cabeceras_http": dict(request.headers),
         
         # Información geográfica del IP
+        # OJO: esta consulta a ip-api.com se hace aquí, con la petición
+        # esperando; es lo más lento de todo el registro
         "ubicacion_geografica": obtener_geolocalizacion(ip_cliente)
     }
     
@@ -184,6 +196,46 @@ def capturar_todas_las_rutas(ruta):
 # PUNTO DE ENTRADA DEL PROGRAMA
 # ------------------------------
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Honeypot con geolocalización de cada acceso.")
+    parser.add_argument("--fsync", choices=escritor_logs.POLITICAS_FSYNC,
+                        default=escritor_logs.POLITICA_FSYNC,
+                        help=f"Cuándo forzar la escritura en disco (por defecto: "
+                             f"{escritor_logs.POLITICA_FSYNC})")
+    parser.add_argument("--desbordamiento", choices=escritor_logs.POLITICAS_DESBORDAMIENTO,
+                        default=escritor_logs.POLITICA_DESBORDAMIENTO,
+                        help=f"Qué hacer si la cola de registros se llena (por defecto: "
+                             f"{escritor_logs.POLITICA_DESBORDAMIENTO})")
+    parser.add_argument("--capacidad-cola", type=int, default=escritor_logs.CAPACIDAD_COLA,
+                        help=f"Registros que pueden esperar en la cola (por defecto: "
+                             f"{escritor_logs.CAPACIDAD_COLA})")
+    parser.add_argument("--rotar-mb", type=float,
+                        default=escritor_logs.TAMANO_MAXIMO / 1024 / 1024,
+                        help="Empezar un archivo nuevo al llegar a estos MB (0 = no rotar por "
+                             f"tamaño; por defecto: {escritor_logs.TAMANO_MAXIMO // 1024 // 1024})")
+    parser.add_argument("--rotar-horas", type=float, default=escritor_logs.EDAD_MAXIMA / 3600,
+                        help="Empezar un archivo nuevo cada estas horas (0 = no rotar por "
+                             f"tiempo; por defecto: {escritor_logs.EDAD_MAXIMA // 3600})")
+    parser.add_argument("--compresion", choices=escritor_logs.COMPRESIONES,
+                        default=escritor_logs.COMPRESION,
+                        help="Cómo comprimir los archivos rotados (por defecto: auto, "
+                             "zstd si está instalado y si no gzip)")
+    parser.add_argument("--convertir", metavar="ARCHIVO_JSON",
+                        help=f"Convertir un registro antiguo (lista JSON) a {ARCHIVO_REGISTRO} y salir")
+    args = parser.parse_args()
+
+    if args.convertir:
+        total = escritor_logs.convertir_lista_json(args.convertir, ARCHIVO_REGISTRO)
+        print(f"{total} registros de {args.convertir} añadidos a {ARCHIVO_REGISTRO}")
+        raise SystemExit(0)
+
+    if args.compresion == "zstd" and escritor_logs.zstd is None:
+        parser.error("zstd no está disponible: pip install zstandard (o usa --compresion gzip)")
+    registro = escritor_logs.EscritorLogs(
+        ARCHIVO_REGISTRO, politica_fsync=args.fsync,
+        desbordamiento=args.desbordamiento, capacidad=args.capacidad_cola,
+        tamano_maximo=int(args.rotar_mb * 1024 * 1024), edad_maxima=args.rotar_horas * 3600,
+        compresion=args.compresion, campo_tiempo="fecha_hora")
+
     print("=" * 70)
     print("HONEYPOT API CON GEOLOCALIZACIÓN")
     print("=" * 70)
@@ -193,7 +245,8 @@ if __name__ == "__main__":
     print(f"  - Host: 0.0.0.0 (todas las interfaces de red)")
     print(f"  - Certificado SSL: cert.pem")
     print(f"  - Clave privada: key.pem")
-    print(f"  - Archivo de registro: {ARCHIVO_REGISTRO}")
+    print(f"  - Archivo de registro: {ARCHIVO_REGISTRO} (fsync: {registro.politica_fsync}, "
+          f"cola llena: {registro.desbordamiento})")
     print()
     print("IMPORTANTE:")
     print("  - Debes ejecutar este script con 'sudo' para usar el puerto 443")
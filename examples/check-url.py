@@ -21,22 +21,51 @@ el resultado de una petición:
 ¿QUÉ APRENDERÁS?
 - Códigos de estado HTTP
 - Manejo de timeouts en peticiones
+- Diferencia entre HEAD y GET (pedir solo cabeceras vs la página entera)
 - Normalización de URLs
 - Uso de argparse para crear CLIs
 - Manejo específico de excepciones
+- Comprobar miles de URLs a la vez con asyncio y aiohttp
+- Salida en formato NDJSON (un objeto JSON por línea)
+- Cómo evitar consultas DNS repetidas con una caché (ver dns_cache.py)
+- Medir por separado cada fase de una petición: DNS, conexión TCP,
+  negociación TLS y tiempo hasta el primer byte (TTFB)
+- Histogramas para calcular percentiles (p50, p90, p99) con memoria fija
+- Un planificador con heapq para vigilar URLs de forma continua, cada una
+  con su intervalo, "jitter" aleatorio y espera creciente (backoff) si falla
 
 REQUISITOS:
-    pip install requests
+    pip install requests aiohttp
 
 EJEMPLOS DE USO:
     python check-url.py --url https://www.google.com
     python check-url.py --url google.com
     python check-url.py --url http://httpstat.us/404
+    python check-url.py --archivo urls.txt --concurrencia 200 > resultados.ndjson
+    cat urls.txt | python check-url.py --archivo -
+    python check-url.py --url https://www.google.com --tiempos
+    python check-url.py --archivo urls.txt --tiempos --histogramas latencias.json
+    python check-url.py --monitor endpoints.txt --intervalo 60 >> monitor.ndjson
 """
 
 # Importamos las librerías necesarias
 import requests  # Para hacer peticiones HTTP
 import argparse  # Para crear una interfaz de línea de comandos
+import asyncio   # Para hacer muchas peticiones a la vez en un solo hilo
+import bisect    # Búsqueda binaria (para colocar cada medida en su cubo)
+import heapq     # Cola de prioridad: la próxima comprobación del monitor
+import json      # Para escribir los resultados en formato NDJSON
+import os        # Para comprobar si ya existe el archivo de histogramas
+import random    # Para el "jitter" (variación aleatoria) del monitor
+import socket    # Constantes para resolver nombres (SOCK_STREAM)
+import ssl       # Para la negociación TLS del modo --tiempos
+import sys       # Para leer de stdin y escribir mensajes en stderr
+import time      # Para medir cada fase con perf_counter()
+from collections import Counter  # Para el resumen final del modo masivo
+from datetime import datetime  # Para la hora de cada comprobación del monitor
+from urllib.parse import urlsplit  # Para separar servidor, puerto y ruta
+import aiohttp   # Cliente HTTP asíncrono (para el modo masivo)
+import dns_cache  # Caché de DNS compartida (dns_cache.py, en este mismo directorio)
 
 
 # CONFIGURACIÓN DE ARGUMENTOS DE LÍNEA DE COMANDOS
@@ -54,9 +83,90 @@ parser.add_argument(
     help="La URL a comprobar (ej: https://www.google.com o google.com)"
 )
 
+# Definimos el argumento --archivo (modo masivo)
+parser.add_argument(
+    "--archivo",
+    type=str,
+    help="Archivo con una URL por línea ('-' para leer de stdin)"
+)
+
+# Número de comprobaciones simultáneas en el modo masivo
+parser.add_argument(
+    "--concurrencia",
+    type=int,
+    default=100,
+    help="Peticiones simultáneas en el modo masivo (por defecto: 100)"
+)
+
+# Desglose de tiempos por fase (DNS, conexión, TLS, primer byte)
+parser.add_argument(
+    "--tiempos",
+    action="store_true",
+    help="Medir el tiempo de cada fase (DNS, conexión, TLS, TTFB). "
+         "En este modo no se siguen redirecciones"
+)
+
+# Archivo donde se acumulan los histogramas de tiempos entre ejecuciones
+parser.add_argument(
+    "--histogramas",
+    type=str,
+    help="Archivo JSON donde acumular los histogramas de --tiempos "
+         "(se suman a los de ejecuciones anteriores)"
+)
+
+# Modo monitor: comprobar las URLs de un archivo una y otra vez
+parser.add_argument(
+    "--monitor",
+    type=str,
+    help="Archivo con líneas 'url [intervalo]' para vigilar de forma continua "
+         "(Ctrl+C para parar)"
+)
+
+# Intervalo por defecto del monitor (si la línea no indica otro)
+parser.add_argument(
+    "--intervalo",
+    type=float,
+    default=60,
+    help="Segundos entre comprobaciones de cada URL en el monitor (por defecto: 60)"
+)
+
+# Variación aleatoria de cada intervalo
+parser.add_argument(
+    "--jitter",
+    type=float,
+    default=0.1,
+    help="Variación aleatoria del intervalo, en tanto por uno (por defecto: 0.1 = ±10%%)"
+)
+
 # Procesamos los argumentos proporcionados por el usuario
 args = parser.parse_args()
 
+# Un intervalo de 0 (o un jitter de 1, que puede dar esperas de 0) haría que
+# el monitor comprobase las URLs sin descanso
+if not 0 < args.intervalo < float("inf"):
+    parser.error("--intervalo debe ser un número de segundos mayor que 0")
+if not 0 <= args.jitter < 1:
+    parser.error("--jitter debe estar entre 0 y 1 (sin llegar a 1), ej: 0.1 = ±10%")
+
+# Códigos con los que un servidor indica que no acepta el método HEAD
+# 405 = Method Not Allowed, 501 = Not Implemented
+HEAD_NO_SOPORTADO = (405, 501)
+
+# Fases que se miden con --tiempos, en el orden en que ocurren
+FASES = ("dns", "conexion", "tls", "ttfb", "total")
+
+# Límites de los cubos de los histogramas, en milisegundos.
+# Escala logarítmica: cada cubo es un 25% más ancho que el anterior,
+# desde 0.1 ms hasta ~50 segundos. Así el error de un percentil es
+# como mucho del 25%, tanto para 2 ms como para 2 segundos.
+LIMITES_MS = [round(0.1 * 1.25 ** i, 3) for i in range(60)]
+
+# Contexto TLS con la verificación de certificados activada (como requests)
+CONTEXTO_TLS = ssl.create_default_context()
+
+# Espera máxima (segundos) entre comprobaciones de una URL que sigue fallando
+BACKOFF_MAXIMO = 900
+
 
 # FUNCIÓN 1: NORMALIZAR URL
 # --------------------------
@@ -91,9 +201,16 @@ def ensure_https(url):
 # ------------------------------
 def check_endpoint(url):
     """
-    Realiza una petición HTTP GET a la URL y devuelve el código de estado.
+    Averigua el código de estado de la URL descargando lo mínimo posible.
+    
+    Para saber el código de estado NO hace falta descargar la página:
+    1. Primero se prueba HEAD, que pide solo las cabeceras (sin cuerpo)
+    2. Si el servidor no acepta HEAD (405/501), se hace un GET en modo
+       streaming y se cierra la conexión nada más llegar las cabeceras,
+       sin leer el cuerpo
+    
+    En páginas grandes esto ahorra casi todo el tiempo y el ancho de banda.
     
-    Esta función intenta conectarse a la URL y obtener su código de respuesta.
     Maneja específicamente dos tipos de errores:
     - Timeout: cuando la conexión tarda demasiado
     - RequestException: cualquier otro error de red
@@ -107,10 +224,18 @@ def check_endpoint(url):
              - 99 si hay otro tipo de error
     """
     try:
-        # requests.get() hace una petición HTTP GET a la URL
+        # requests.head() pide solo las cabeceras de la URL
         # timeout=10 significa que esperamos máximo 10 segundos
         # Si tarda más, se lanza una excepción Timeout
-        response = requests.get(url, timeout=10)
+        # allow_redirects=True: seguimos redirecciones, igual que haría un GET
+        response = requests.head(url, timeout=10, allow_redirects=True)
+        
+        if response.status_code in HEAD_NO_SOPORTADO:
+            # El servidor no acepta HEAD: usamos GET con stream=True, que
+            # devuelve el control al llegar las cabeceras. Al salir del
+            # 'with' la conexión se cierra sin descargar el cuerpo.
+            with requests.get(url, timeout=10, stream=True) as response:
+                return response.status_code
         
         # response.status_code contiene el código HTTP (200, 404, 500, etc.)
         return response.status_code
@@ -182,9 +307,572 @@ def translate_status_code(code):
     return translations.get(code, "Estado desconocido")
 
 
+# FUNCIÓN 4: VERIFICAR ENDPOINT (VERSIÓN ASÍNCRONA)
+# --------------------------------------------------
+async def check_endpoint_async(sesion, url):
+    """
+    Igual que check_endpoint() (HEAD primero, GET sin cuerpo si hace falta),
+    pero asíncrona y usando una sesión de aiohttp.
+
+    Con 'async'/'await', mientras una petición espera la respuesta del
+    servidor, el programa atiende otras. Así un solo hilo puede tener
+    cientos de peticiones en marcha a la vez.
+
+    Parámetros:
+        sesion (aiohttp.ClientSession): Sesión compartida (reutiliza conexiones)
+        url (str): URL completa a verificar (con protocolo)
+
+    Retorna:
+        int: Código de estado HTTP, 0 si hay timeout o 99 si hay otro error
+    """
+    try:
+        # En aiohttp HEAD no sigue redirecciones salvo que se lo pidamos
+        async with sesion.head(url, allow_redirects=True) as response:
+            if response.status not in HEAD_NO_SOPORTADO:
+                # HEAD no tiene cuerpo: la conexión vuelve al pool para reutilizarse
+                return response.status
+
+        async with sesion.get(url) as response:
+            # close() corta la conexión sin leer el cuerpo de la respuesta
+            response.close()
+            return response.status
+
+    except asyncio.TimeoutError:
+        # La sesión tiene un timeout total de 10 segundos (como check_endpoint)
+        return 0
+
+    except (aiohttp.ClientError, ValueError):
+        # Errores de conexión, DNS, SSL, URL inválida, etc.
+        return 99
+
+
+# FUNCIÓN 5: VERIFICAR ENDPOINT MIDIENDO CADA FASE
+# --------------------------------------------------
+async def _sondear(url, metodo, tiempos):
+    """
+    Hace UNA petición HTTP "a mano" sobre un socket y apunta en 'tiempos'
+    cuántos milisegundos dura cada fase.
+
+    Las librerías HTTP (requests, aiohttp) hacen todo esto por dentro y
+    solo nos dan el total. Haciéndolo paso a paso podemos cronometrar:
+    1. dns:      traducir el nombre del servidor a una IP
+    2. conexion: el "apretón de manos" TCP con el servidor
+    3. tls:      negociar el cifrado (solo en https://)
+    4. ttfb:     desde que enviamos la petición hasta que llega el primer
+                 byte de la respuesta ("time to first byte"); aquí se ve
+                 lo que tarda el servidor en pensar
+    5. total:    la suma de todo lo anterior
+
+    Las fases se apuntan según terminan: si hay un timeout a mitad,
+    'tiempos' conserva las que dio tiempo a medir.
+
+    Retorna:
+        int: Código de estado de la respuesta
+    """
+    partes = urlsplit(url)
+    segura = partes.scheme == "https"
+    puerto = partes.port or (443 if segura else 80)
+    ruta = partes.path or "/"
+    if partes.query:
+        ruta += "?" + partes.query
+
+    inicio = marca = time.perf_counter()
+
+    def medir(fase):
+        # Guarda lo que ha durado la fase que acaba de terminar
+        nonlocal marca
+        ahora = time.perf_counter()
+        tiempos[fase] = (ahora - marca) * 1000
+        tiempos["total"] = (ahora - inicio) * 1000
+        marca = ahora
+
+    # FASE 1: DNS (con la caché compartida, un acierto cuesta casi 0 ms)
+    infos = await dns_cache.cache_global.getaddrinfo_async(
+        partes.hostname, puerto, 0, socket.SOCK_STREAM
+    )
+    direccion = infos[0][4]
+    medir("dns")
+
+    # FASE 2: conexión TCP con la IP obtenida
+    lector, escritor = await asyncio.open_connection(direccion[0], direccion[1])
+    medir("conexion")
+
+    try:
+        # FASE 3: TLS sobre la conexión ya abierta (Python 3.11+)
+        if segura:
+            await escritor.start_tls(CONTEXTO_TLS, server_hostname=partes.hostname)
+            medir("tls")
+
+        # FASE 4: enviamos la petición y esperamos la línea de estado
+        # (ej: "HTTP/1.1 200 OK"). No leemos las cabeceras ni el cuerpo.
+        host = partes.netloc.rpartition("@")[2]  # Quitamos "usuario:clave@"
+        peticion = (f"{metodo} {ruta} HTTP/1.1\r\n"
+                    f"Host: {host}\r\n"
+                    f"User-Agent: check-url/1.0\r\n"
+                    f"Connection: close\r\n\r\n")
+        escritor.write(peticion.encode("latin-1"))
+        await escritor.drain()
+        linea_estado = await lector.readline()
+        medir("ttfb")
+    finally:
+        escritor.close()
+
+    # "HTTP/1.1 200 OK" → 200 (si la línea viene vacía o rota, IndexError/ValueError)
+    return int(linea_estado.split()[1])
+
+
+async def check_endpoint_tiempos(url, tiempo_maximo=10):
+    """
+    Como check_endpoint_async(), pero devolviendo también los tiempos
+    de cada fase en milisegundos.
+
+    Diferencias con el modo normal:
+    - Cada comprobación abre una conexión nueva (si reutilizáramos
+      conexiones, DNS, conexión y TLS medirían 0)
+    - NO sigue redirecciones: el código es el de la primera respuesta
+      (ej: 301), y los tiempos son los de ese servidor
+
+    Parámetros:
+        url (str): URL completa a verificar (con protocolo)
+        tiempo_maximo (int): Segundos máximos por petición
+
+    Retorna:
+        tuple: (código, tiempos) donde tiempos es un diccionario
+               {fase: milisegundos} con las fases que se completaron
+    """
+    tiempos = {}
+    try:
+        status_code = await asyncio.wait_for(_sondear(url, "HEAD", tiempos), tiempo_maximo)
+        if status_code in HEAD_NO_SOPORTADO:
+            # El servidor no acepta HEAD: repetimos con GET y medimos esa
+            tiempos = {}
+            status_code = await asyncio.wait_for(_sondear(url, "GET", tiempos), tiempo_maximo)
+        return status_code, tiempos
+
+    except asyncio.TimeoutError:
+        # Los tiempos parciales dicen en qué fase se quedó atascada
+        return 0, tiempos
+
+    except (OSError, ValueError, IndexError):
+        # OSError incluye errores de DNS, conexión rechazada y de certificado SSL
+        return 99, tiempos
+
+
+class Histograma:
+    """
+    Cuenta cuántas medidas caen en cada intervalo ("cubo") de LIMITES_MS.
+
+    Guardar cada medida para calcular percentiles gastaría memoria sin
+    límite. Un histograma usa siempre la misma memoria (un contador por
+    cubo), permite estimar percentiles y se puede SUMAR con otro: así se
+    acumulan los tiempos de muchas ejecuciones del script.
+    """
+
+    def __init__(self, cuentas=None, total=0, suma=0):
+        self.cuentas = cuentas or [0] * (len(LIMITES_MS) + 1)  # Último cubo: infinito
+        self.total = total
+        self.suma = suma
+
+    def observar(self, valor):
+        """Añade una medida (en ms) al histograma."""
+        # bisect_left encuentra el primer límite >= valor (búsqueda binaria)
+        self.cuentas[bisect.bisect_left(LIMITES_MS, valor)] += 1
+        self.total += 1
+        self.suma += valor
+
+    def percentil(self, p):
+        """
+        Estima el percentil p (0-100): devuelve el límite superior del cubo
+        donde cae (o infinito si cae en el último).
+        """
+        if self.total == 0:
+            return 0
+        objetivo = self.total * p / 100
+        acumulado = 0
+        for indice, cuenta in enumerate(self.cuentas):
+            acumulado += cuenta
+            if acumulado >= objetivo:
+                return LIMITES_MS[indice] if indice < len(LIMITES_MS) else float("inf")
+        return float("inf")
+
+
+def cargar_histogramas(ruta):
+    """
+    Lee los histogramas guardados por ejecuciones anteriores.
+
+    Si el archivo no existe (o se guardó con otros límites de cubos),
+    se empieza con histogramas vacíos.
+
+    Retorna:
+        dict: {fase: Histograma}
+    """
+    histogramas = {fase: Histograma() for fase in FASES}
+    if ruta and os.path.exists(ruta):
+        with open(ruta, "r") as archivo:
+            datos = json.load(archivo)
+        if datos.get("limites_ms") == LIMITES_MS:
+            for fase, h in datos["fases"].items():
+                if fase in histogramas:
+                    histogramas[fase] = Histograma(h["cuentas"], h["total"], h["suma"])
+        else:
+            print(f"Aviso: {ruta} usa otros cubos, se empieza de cero", file=sys.stderr)
+    return histogramas
+
+
+def guardar_histogramas(ruta, histogramas):
+    """Guarda los histogramas (cuentas y percentiles) en un archivo JSON."""
+    datos = {"limites_ms": LIMITES_MS, "fases": {}}
+    for fase, h in histogramas.items():
+        datos["fases"][fase] = {
+            "cuentas": h.cuentas,
+            "total": h.total,
+            "suma": h.suma,
+            # Los percentiles se guardan solo para leerlos cómodamente
+            "p50": h.percentil(50),
+            "p90": h.percentil(90),
+            "p99": h.percentil(99),
+        }
+    with open(ruta, "w") as archivo:
+        json.dump(datos, archivo, indent=4)
+
+
+def mostrar_percentiles(histogramas):
+    """Imprime en stderr una tabla con p50/p90/p99 de cada fase."""
+    print("\nTiempos por fase (ms):", file=sys.stderr)
+    print(f"  {'fase':<9} {'n':>7} {'media':>9} {'p50':>9} {'p90':>9} {'p99':>9}",
+          file=sys.stderr)
+    for fase, h in histogramas.items():
+        if h.total == 0:
+            continue
+        print(f"  {fase:<9} {h.total:>7} {h.suma / h.total:>9.1f} "
+              f"{'≤' + format(h.percentil(50), '.1f'):>9} "
+              f"{'≤' + format(h.percentil(90), '.1f'):>9} "
+              f"{'≤' + format(h.percentil(99), '.1f'):>9}", file=sys.stderr)
+
+
+def leer_urls(origen, con_numero=False):
+    """
+    Generador que lee URLs de un archivo (o de stdin si origen es "-").
+
+    Ignora líneas vacías y comentarios (#). Lee de una en una, así un
+    archivo con millones de URLs no se carga entero en memoria.
+    Con con_numero=True entrega tuplas (número de línea, línea), para
+    poder señalar dónde está una línea con errores.
+    """
+    archivo = sys.stdin if origen == "-" else open(origen, "r")
+    try:
+        for numero, linea in enumerate(archivo, start=1):
+            linea = linea.strip()
+            if linea and not linea.startswith("#"):
+                yield (numero, linea) if con_numero else linea
+    finally:
+        if archivo is not sys.stdin:
+            archivo.close()
+
+
+# FUNCIÓN 6: MODO MASIVO
+# -----------------------
+async def comprobar_en_bloque(origen, concurrencia, medir_tiempos=False, archivo_histogramas=None):
+    """
+    Comprueba todas las URLs de un archivo con 'concurrencia' peticiones a la vez.
+
+    Funcionamiento (patrón productor/consumidor):
+    - El productor lee URLs y las mete en una cola de tamaño limitado
+      (si los trabajadores van lentos, el productor espera: la memoria no crece)
+    - 'concurrencia' trabajadores sacan URLs de la cola y las comprueban
+    - Cada resultado se imprime en cuanto está listo como una línea JSON
+
+    Todos los trabajadores comparten UNA sesión de aiohttp, que mantiene
+    abiertas las conexiones con cada servidor para reutilizarlas.
+
+    Con medir_tiempos=True cada URL se comprueba con check_endpoint_tiempos()
+    y su línea JSON incluye los milisegundos de cada fase. Los tiempos se
+    acumulan en histogramas para mostrar percentiles al final.
+
+    Parámetros:
+        origen (str): Archivo de URLs, o "-" para stdin
+        concurrencia (int): Número de peticiones simultáneas
+        medir_tiempos (bool): Medir DNS, conexión, TLS y TTFB de cada URL
+        archivo_histogramas (str): JSON donde acumular los histogramas (opcional)
+    """
+    cola = asyncio.Queue(maxsize=concurrencia * 2)
+    resumen = Counter()
+    histogramas = cargar_histogramas(archivo_histogramas) if medir_tiempos else {}
+
+    # limit: conexiones abiertas en total
+    # limit_per_host: conexiones por servidor (no saturar a nadie)
+    # resolver: resolvemos nombres con nuestra caché de DNS (cada servidor
+    # se consulta una vez aunque tenga miles de URLs en la lista)
+    conector = aiohttp.TCPConnector(limit=concurrencia, limit_per_host=10,
+                                    resolver=dns_cache.ResolvedorAsync(),
+                                    use_dns_cache=False)
+    # timeout=10 segundos por petición, igual que check_endpoint()
+    tiempo_maximo = aiohttp.ClientTimeout(total=10)
+
+    async with aiohttp.ClientSession(connector=conector, timeout=tiempo_maximo) as sesion:
+
+        async def trabajador():
+            while True:
+                url = await cola.get()
+                if url is None:
+                    break  # Señal de fin: no quedan URLs
+                resultado = {"url": url}
+                # Un error inesperado con UNA URL no puede matar al trabajador:
+                # si murieran todos, nadie vaciaría la cola y el productor
+                # se quedaría esperando en cola.put() para siempre
+                try:
+                    if medir_tiempos:
+                        status_code, tiempos = await check_endpoint_tiempos(url)
+                        # Solo las peticiones completas van a los histogramas:
+                        # un timeout a mitad falsearía los percentiles
+                        if status_code not in (0, 99):
+                            for fase, ms in tiempos.items():
+                                histogramas[fase].observar(ms)
+                        resultado["tiempos_ms"] = {f: round(tiempos[f], 2) for f in FASES if f in tiempos}
+                    else:
+                        status_code = await check_endpoint_async(sesion, url)
+                except asyncio.CancelledError:
+                    # Si a quien cancelan es a ESTE trabajador (ej: Ctrl+C),
+                    # paramos de verdad; si no, la cancelación venía de
+                    # otra tarea y solo cuenta como un fallo de esta URL
+                    if asyncio.current_task().cancelling():
+                        raise
+                    status_code = 99
+                    resultado["error"] = "CancelledError"
+                except Exception as error:
+                    status_code = 99
+                    resultado["error"] = f"{type(error).__name__}: {error}"
+                resumen[status_code] += 1
+
+                # NDJSON: un objeto JSON por línea. Se puede procesar
+                # mientras se escribe (ej: con jq o línea a línea en Python)
+                resultado["codigo"] = status_code
+                resultado["estado"] = translate_status_code(status_code)
+                print(json.dumps(resultado, ensure_ascii=False))
+
+        trabajadores = [asyncio.create_task(trabajador()) for _ in range(concurrencia)]
+
+        # Productor: metemos las URLs en la cola (await espera si está llena)
+        for url in leer_urls(origen):
+            await cola.put(ensure_https(url))
+
+        # Una señal de fin (None) por cada trabajador
+        for _ in trabajadores:
+            await cola.put(None)
+        await asyncio.gather(*trabajadores)
+
+    # El resumen va a stderr para no mezclarse con el NDJSON de stdout
+    total = sum(resumen.values())
+    print(f"\nComprobadas {total} URLs", file=sys.stderr)
+    for status_code, cantidad in resumen.most_common():
+        print(f"  {status_code:>3} {translate_status_code(status_code)}: {cantidad}",
+              file=sys.stderr)
+    print(dns_cache.cache_global.estadisticas(), file=sys.stderr)
+
+    if medir_tiempos:
+        mostrar_percentiles(histogramas)
+        if archivo_histogramas:
+            guardar_histogramas(archivo_histogramas, histogramas)
+            print(f"Histogramas acumulados en {archivo_histogramas}", file=sys.stderr)
+
+
+# FUNCIÓN 7: MODO MONITOR
+# ------------------------
+def leer_endpoints(origen, intervalo_defecto):
+    """
+    Lee el archivo del monitor: una URL por línea, con un intervalo opcional.
+
+    EJEMPLO DE ARCHIVO:
+        https://www.google.com          30
+        https://api.ejemplo.com/salud   10
+        ejemplo.org                     (usa --intervalo)
+
+    Las líneas con un intervalo que no es un número mayor que 0 se avisan
+    por stderr (con su número de línea) y se ignoran: un intervalo de 0
+    comprobaría la URL sin parar.
+
+    Retorna:
+        list: Lista de diccionarios {url, intervalo, fallos}
+    """
+    endpoints = []
+    for numero, linea in leer_urls(origen, con_numero=True):
+        partes = linea.split()
+        if len(partes) > 1:
+            try:
+                intervalo = float(partes[1])
+            except ValueError:
+                intervalo = None
+            if not intervalo_valido(intervalo):
+                print(f"{origen}, línea {numero}: intervalo no válido {partes[1]!r} "
+                      "(debe ser un número de segundos mayor que 0); se ignora",
+                      file=sys.stderr)
+                continue
+        else:
+            intervalo = intervalo_defecto
+        endpoints.append({"url": ensure_https(partes[0]), "intervalo": intervalo, "fallos": 0})
+    return endpoints
+
+
+def intervalo_valido(intervalo):
+    """¿Es un número de segundos mayor que 0 (y no infinito ni NaN)?"""
+    # Con NaN todas las comparaciones dan False, así que también se rechaza
+    return intervalo is not None and 0 < intervalo < float("inf")
+
+
+def siguiente_espera(endpoint, jitter):
+    """
+    Calcula cuántos segundos esperar hasta la próxima comprobación.
+
+    - Si la URL funciona: su intervalo normal
+    - Si falla: el intervalo se duplica con cada fallo seguido (backoff
+      exponencial) hasta BACKOFF_MAXIMO, para no machacar a un servidor
+      caído. En cuanto vuelve a responder, recupera su intervalo.
+
+    Después se aplica el jitter (por defecto ±10% al azar), que evita que URLs con
+    el mismo intervalo acaben comprobándose siempre en el mismo instante.
+    """
+    # El exponente se limita: 2**16 ya supera BACKOFF_MAXIMO con cualquier
+    # intervalo razonable, y tras ~1024 fallos seguidos (unos días caída)
+    # 2**fallos sería tan grande que convertirlo a float daría OverflowError
+    espera = endpoint["intervalo"] * 2 ** min(endpoint["fallos"], 16)
+    espera = min(espera, max(BACKOFF_MAXIMO, endpoint["intervalo"]))
+    return espera * random.uniform(1 - jitter, 1 + jitter)
+
+
+async def monitorizar(origen, intervalo, jitter, concurrencia):
+    """
+    Vigila las URLs de un archivo sin parar, cada una a su ritmo.
+
+    A diferencia de lanzar el script con cron cada minuto:
+    - El proceso no se reinicia: la sesión de aiohttp mantiene las
+      conexiones abiertas y la caché de DNS sigue caliente
+    - Cada URL empieza en un momento aleatorio de su intervalo, así las
+      comprobaciones se reparten en el tiempo en vez de ir todas a la vez
+
+    La agenda es un "heap" (montículo) de tuplas (momento, número, endpoint):
+    heapq siempre deja en agenda[0] la comprobación más próxima, y meter
+    o sacar una cuesta O(log n) aunque haya miles de URLs.
+
+    Cada comprobación se imprime como una línea JSON en stdout.
+
+    Parámetros:
+        origen (str): Archivo con líneas "url [intervalo]"
+        intervalo (float): Intervalo por defecto, en segundos
+        jitter (float): Variación aleatoria del intervalo (0.1 = ±10%)
+        concurrencia (int): Comprobaciones simultáneas como máximo
+    """
+    endpoints = leer_endpoints(origen, intervalo)
+    if not endpoints:
+        print("El archivo del monitor no contiene URLs", file=sys.stderr)
+        return
+
+    bucle = asyncio.get_running_loop()
+    ahora = bucle.time()
+
+    # PASO 1: agenda inicial, con cada URL desplazada al azar dentro de su
+    # intervalo. El número de orden desempata cuando dos momentos coinciden.
+    agenda = [(ahora + random.uniform(0, e["intervalo"]), n, e) for n, e in enumerate(endpoints)]
+    heapq.heapify(agenda)
+
+    despertar = asyncio.Event()  # Avisa al planificador de cambios en la agenda
+    limite = asyncio.Semaphore(concurrencia)
+    en_curso = set()             # Referencias a las tareas (si no, asyncio podría perderlas)
+
+    print(f"Monitorizando {len(endpoints)} URLs (Ctrl+C para parar)", file=sys.stderr)
+
+    # keepalive_timeout: cuánto tiempo se guarda abierta una conexión sin
+    # usar. Lo subimos para que sobreviva entre una comprobación y la siguiente
+    conector = aiohttp.TCPConnector(limit=concurrencia, limit_per_host=10,
+                                    resolver=dns_cache.ResolvedorAsync(),
+                                    use_dns_cache=False,
+                                    keepalive_timeout=max(e["intervalo"] for e in endpoints) + 5)
+    tiempo_maximo = aiohttp.ClientTimeout(total=10)
+
+    async with aiohttp.ClientSession(connector=conector, timeout=tiempo_maximo) as sesion:
+
+        async def comprobar(numero, endpoint):
+            # Un error inesperado cuenta como un fallo más de la URL: si se
+            # escapara, la URL no volvería a la agenda y dejaría de vigilarse
+            # sin que nadie se enterase
+            error = None
+            inicio = time.perf_counter()
+            try:
+                status_code = await check_endpoint_async(sesion, endpoint["url"])
+            except asyncio.CancelledError:
+                # Si lo que se cancela es el monitor (Ctrl+C), paramos
+                if asyncio.current_task().cancelling():
+                    raise
+                status_code, error = 99, "CancelledError"
+            except Exception as excepcion:
+                status_code, error = 99, f"{type(excepcion).__name__}: {excepcion}"
+            finally:
+                limite.release()
+            milisegundos = (time.perf_counter() - inicio) * 1000
+
+            # 0 (timeout), 99 (error de conexión) y 5xx cuentan como fallo
+            if status_code in (0, 99) or status_code >= 500:
+                endpoint["fallos"] += 1
+            else:
+                endpoint["fallos"] = 0
+
+            # PASO 3: volvemos a meter la URL en la agenda
+            espera = siguiente_espera(endpoint, jitter)
+            heapq.heappush(agenda, (bucle.time() + espera, numero, endpoint))
+            despertar.set()
+
+            linea = {
+                "momento": datetime.now().isoformat(timespec="seconds"),
+                "url": endpoint["url"],
+                "codigo": status_code,
+                "estado": translate_status_code(status_code),
+                "ms": round(milisegundos, 1),
+                "fallos_seguidos": endpoint["fallos"],
+                "proxima_en_s": round(espera, 1),
+            }
+            if error:
+                linea["error"] = error
+            print(json.dumps(linea, ensure_ascii=False), flush=True)
+
+        # PASO 2: el planificador duerme hasta la próxima comprobación,
+        # la lanza y vuelve a dormir
+        while True:
+            espera = agenda[0][0] - bucle.time() if agenda else None
+            if espera is None or espera > 0:
+                # Dormimos hasta que toque, o hasta que una comprobación que
+                # acaba de terminar meta en la agenda una URL más próxima
+                despertar.clear()
+                try:
+                    await asyncio.wait_for(despertar.wait(), espera)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, numero, endpoint = heapq.heappop(agenda)
+            await limite.acquire()  # No más de 'concurrencia' a la vez
+            tarea = asyncio.create_task(comprobar(numero, endpoint))
+            en_curso.add(tarea)
+            tarea.add_done_callback(en_curso.discard)
+
+
 # CÓDIGO PRINCIPAL DEL SCRIPT
 # ----------------------------
-if args.url:
+# Las peticiones de requests también pasan por la caché de DNS
+dns_cache.instalar()
+
+if args.monitor:
+    # MODO MONITOR: se ejecuta hasta que el usuario pulse Ctrl+C
+    try:
+        asyncio.run(monitorizar(args.monitor, args.intervalo, args.jitter, args.concurrencia))
+    except KeyboardInterrupt:
+        print("\nMonitor detenido", file=sys.stderr)
+        print(dns_cache.cache_global.estadisticas(), file=sys.stderr)
+
+elif args.archivo:
+    # MODO MASIVO: muchas URLs, resultados en NDJSON por stdout
+    asyncio.run(comprobar_en_bloque(args.archivo, args.concurrencia,
+                                    args.tiempos, args.histogramas))
+
+elif args.url:
     # El usuario proporcionó una URL
     
     # PASO 1: Normalizar la URL (asegurar que tenga protocolo)
@@ -192,7 +880,10 @@ if args.url:
     
     # PASO 2: Verificar el endpoint (hacer la petición HTTP)
     print(f"Verificando: {url}")
-    status_code = check_endpoint(url)
+    if args.tiempos:
+        status_code, tiempos = asyncio.run(check_endpoint_tiempos(url))
+    else:
+        status_code = check_endpoint(url)
     
     # PASO 3: Traducir el código de estado a texto legible
     status_text = translate_status_code(status_code)
@@ -202,6 +893,11 @@ if args.url:
     print(f"  URL: {url}")
     print(f"  Código: {status_code}")
     print(f"  Estado: {status_text}")
+    if args.tiempos:
+        print(f"\nTiempos (ms):")
+        for fase in FASES:
+            if fase in tiempos:
+                print(f"  {fase:<9} {tiempos[fase]:8.1f}")
     
     # Indicador visual según el resultado
     if status_code == 200:
@@ -217,11 +913,13 @@ if args.url:
         
 else:
     # El usuario NO proporcionó una URL
-    print("Error: Debes especificar una URL con --url")
+    print("Error: Debes especificar una URL con --url o un archivo con --archivo o --monitor")
     print("\nEjemplos de uso:")
     print("  python check-url.py --url https://www.google.com")
     print("  python check-url.py --url google.com")
     print("  python check-url.py --url http://httpstat.us/404")
+    print("  python check-url.py --archivo urls.txt")
+    print("  python check-url.py --monitor endpoints.txt")
     print("\nPara ver ayuda completa: python check-url.py --help")
 
 # CÓDIGOS DE ESTADO HTTP MÁS COMUNES:
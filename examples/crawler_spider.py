@@ -11,8 +11,8 @@ automáticamente por sitios web, siguiendo los enlaces de una página a otra.
 ¿CÓMO FUNCIONA?
 1. Empieza en una URL inicial
 2. Descarga la página y extrae todos los enlaces
-3. Visita cada enlace encontrado
-4. Repite el proceso recursivamente hasta cierta profundidad
+3. Guarda los enlaces nuevos en una "frontera" (cola de URLs pendientes)
+4. Saca lotes de URLs de la frontera y repite hasta cierta profundidad
 
 ¿PARA QUÉ SIRVE?
 - Buscadores web (Google, Bing) usan crawlers para indexar internet
@@ -22,44 +22,913 @@ automáticamente por sitios web, siguiendo los enlaces de una página a otra.
 - Mapear la estructura de un sitio
 
 ¿QUÉ APRENDERÁS?
-- Uso de BeautifulSoup para parsear HTML
-- Funciones recursivas
-- Uso de set() para evitar duplicados
+- Uso de HTMLParser para analizar HTML por trozos (mientras se descarga)
+- Descarga en streaming con límites de tamaño, tiempo y tipo de contenido
+- Uso de una base de datos SQLite como cola persistente (frontera)
+- Cómo reanudar un trabajo largo después de un corte o Ctrl+C
+- Uso de ThreadPoolExecutor para descargar varias páginas a la vez
+- Cómo leer y respetar robots.txt (con una caché por servidor)
+- Uso de un árbol de prefijos (trie) para buscar reglas rápidamente
+- Cómo medir un programa en marcha: contadores, histogramas y un
+  pequeño servidor HTTP de métricas
 - Manejo de URLs relativas vs absolutas con urljoin()
 - Concepto de profundidad en exploración de grafos
 
 REQUISITOS:
-    pip install requests beautifulsoup4
+    pip install requests
+
+EJEMPLOS DE USO:
+    python crawler_spider.py --url https://example.com --profundidad 2
+    python crawler_spider.py --reanudar            (continúa un crawl cortado)
+    python crawler_spider.py --puerto-metricas 9100   (métricas en /metrics)
 
 ADVERTENCIA:
 Usar crawlers de forma irresponsable puede sobrecargar servidores.
-Respeta el archivo robots.txt y los términos de servicio del sitio.
+Este crawler respeta robots.txt por defecto; respeta también los
+términos de servicio del sitio.
 """
 
 # Importamos las librerías necesarias
+import argparse              # Para leer opciones de la línea de comandos
+import bisect                # Para buscar el cubo de un histograma rápidamente
+import codecs                # Para decodificar el HTML trozo a trozo
+import re                    # Para compilar reglas de robots.txt con comodines
+import socket                # Para detectar que se agotó el tiempo de una lectura
+import sqlite3               # Base de datos en un archivo (incluida en Python)
+import threading             # Para proteger la caché de robots.txt entre hilos
+import time                  # Para saber cuándo caduca una entrada de la caché
+from collections import Counter  # Para contar códigos de estado
+from concurrent.futures import ThreadPoolExecutor  # Para descargar en paralelo
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # Métricas por HTTP
 import requests              # Para hacer peticiones HTTP
-from bs4 import BeautifulSoup  # Para analizar y extraer datos de HTML
-from urllib.parse import urljoin  # Para manejar URLs relativas y absolutas
+import urllib3               # La librería sobre la que funciona requests
+from html.parser import HTMLParser  # Parser de HTML incremental (incluido en Python)
+from urllib.parse import urljoin, urlsplit  # Para manejar y descomponer URLs
+import dns_cache             # Caché de DNS compartida (dns_cache.py, en este directorio)
 
 
-# FUNCIÓN PRINCIPAL DEL CRAWLER
-# ------------------------------
-def simple_spider(start_url, max_depth=2):
+# CONFIGURACIÓN POR DEFECTO
+# --------------------------
+# Archivo SQLite donde se guarda el estado del crawl (frontera + URLs vistas)
+ARCHIVO_ESTADO = "crawler_estado.db"
+
+# Cuántas URLs sacamos de la frontera en cada vuelta
+# Trabajar por lotes reduce muchísimo las escrituras en disco
+TAM_LOTE = 50
+
+# Cuántas páginas se descargan a la vez
+HILOS = 8
+
+# Cómo se identifica el crawler ante los servidores (y ante robots.txt)
+USER_AGENT = "CrawlerEducativo/1.0"
+
+# Segundos que guardamos un robots.txt antes de volver a descargarlo
+TTL_ROBOTS = 3600
+
+# Bytes máximos que leemos de un robots.txt (el RFC 9309 permite ignorar
+# lo que pase de 500 KiB)
+TAMANO_MAXIMO_ROBOTS = 500 * 1024
+
+# LÍMITES DE DESCARGA
+# Una URL que apunta a un binario de 2 GB o a un stream infinito no debe
+# bloquear un hilo ni llenar la memoria
+TAMANO_MAXIMO = 5 * 1024 * 1024   # Bytes máximos que leemos de una página (5 MB)
+TIEMPO_MAXIMO = 30                # Segundos máximos descargando una página
+TAM_TROZO = 64 * 1024             # Tamaño de cada trozo que pasamos al parser
+TIPOS_HTML = ("text/html", "application/xhtml+xml")
+
+# Cada cuántos segundos se imprime una línea de resumen con las métricas
+INTERVALO_RESUMEN = 10
+
+
+# LA FRONTERA PERSISTENTE
+# ------------------------
+class FronteraPersistente:
+    """
+    Cola de URLs pendientes y conjunto de URLs vistas guardados en SQLite.
+
+    Antes, el crawler guardaba todo en memoria (la pila de recursión y un set).
+    Si el programa se cortaba, se perdía todo el trabajo. Ahora el estado vive
+    en un archivo, así que:
+    - Un crawl de varios días sobrevive a reinicios (ver reanudar())
+    - La memoria no crece aunque la frontera tenga millones de URLs
+
+    TABLAS:
+        meta     → configuración del crawl (URL inicial, profundidad, contador)
+        frontera → URLs pendientes (estado 0) o en proceso (estado 1)
+        vistas   → todas las URLs que ya se encolaron alguna vez (evita duplicados)
+    """
+
+    # Estados de una fila de la frontera
+    PENDIENTE = 0
+    EN_CURSO = 1
+
+    def __init__(self, ruta):
+        """
+        Abre (o crea) la base de datos de la frontera.
+
+        Parámetros:
+            ruta (str): Archivo SQLite donde se guarda el estado
+        """
+        self.conexion = sqlite3.connect(ruta)
+
+        # Modo WAL (Write-Ahead Log): las escrituras se añaden a un diario
+        # en lugar de reescribir páginas, lo que es más rápido y resiste cortes
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        # NORMAL es seguro con WAL y evita un fsync en cada commit
+        self.conexion.execute("PRAGMA synchronous=NORMAL")
+
+        self.conexion.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (
+                clave TEXT PRIMARY KEY,
+                valor TEXT
+            );
+            CREATE TABLE IF NOT EXISTS frontera (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                profundidad INTEGER NOT NULL,
+                estado INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_frontera_estado ON frontera (estado, id);
+            CREATE TABLE IF NOT EXISTS vistas (
+                url TEXT PRIMARY KEY
+            );
+        """)
+        self.conexion.commit()
+
+    def vaciar(self):
+        """Borra cualquier estado anterior para empezar un crawl desde cero."""
+        self.conexion.executescript("""
+            DELETE FROM meta;
+            DELETE FROM frontera;
+            DELETE FROM vistas;
+        """)
+        self.conexion.commit()
+
+    def guardar_meta(self, clave, valor):
+        """Guarda un valor de configuración (se almacena como texto)."""
+        self.conexion.execute(
+            "INSERT OR REPLACE INTO meta (clave, valor) VALUES (?, ?)",
+            (clave, str(valor))
+        )
+        self.conexion.commit()
+
+    def leer_meta(self, clave, por_defecto=None):
+        """Lee un valor de configuración, o por_defecto si no existe."""
+        fila = self.conexion.execute(
+            "SELECT valor FROM meta WHERE clave = ?", (clave,)
+        ).fetchone()
+        return fila[0] if fila else por_defecto
+
+    def _encolar(self, pares):
+        """
+        Inserta URLs nuevas en la frontera (sin hacer commit).
+
+        Una URL solo entra si NO está en la tabla 'vistas'. Así cada URL
+        se descarga una única vez aunque aparezca en cientos de páginas.
+
+        Retorna:
+            int: Cuántas URLs eran realmente nuevas
+        """
+        nuevas = 0
+        for url, profundidad in pares:
+            # INSERT OR IGNORE no hace nada si la URL ya existe (PRIMARY KEY)
+            cursor = self.conexion.execute(
+                "INSERT OR IGNORE INTO vistas (url) VALUES (?)", (url,)
+            )
+            if cursor.rowcount == 1:
+                self.conexion.execute(
+                    "INSERT INTO frontera (url, profundidad) VALUES (?, ?)",
+                    (url, profundidad)
+                )
+                nuevas += 1
+        return nuevas
+
+    def encolar_lote(self, pares):
+        """
+        Añade un lote de (url, profundidad) en UNA sola transacción.
+
+        Retorna:
+            int: Cuántas URLs eran realmente nuevas
+        """
+        with self.conexion:  # 'with' hace commit al final (o rollback si falla)
+            return self._encolar(pares)
+
+    def extraer_lote(self, cantidad):
+        """
+        Saca hasta 'cantidad' URLs pendientes y las marca como EN_CURSO.
+
+        No se borran todavía: si el programa se corta a mitad del lote,
+        reanudar() las devolverá a la frontera y no se perderán.
+
+        Retorna:
+            list: Lista de tuplas (id, url, profundidad)
+        """
+        with self.conexion:
+            filas = self.conexion.execute(
+                "SELECT id, url, profundidad FROM frontera "
+                "WHERE estado = ? ORDER BY id LIMIT ?",
+                (self.PENDIENTE, cantidad)
+            ).fetchall()
+            self.conexion.executemany(
+                "UPDATE frontera SET estado = ? WHERE id = ?",
+                [(self.EN_CURSO, fila[0]) for fila in filas]
+            )
+        return filas
+
+    def confirmar_lote(self, ids_completados, nuevas_urls):
+        """
+        Cierra un lote: borra las URLs procesadas y encola las descubiertas.
+
+        Las dos cosas van en la MISMA transacción, así el archivo nunca queda
+        en un estado a medias (o se guardan ambas o ninguna).
+
+        Retorna:
+            int: Cuántas URLs nuevas entraron en la frontera
+        """
+        with self.conexion:
+            self.conexion.executemany(
+                "DELETE FROM frontera WHERE id = ?",
+                [(id_fila,) for id_fila in ids_completados]
+            )
+            nuevas = self._encolar(nuevas_urls)
+            self.conexion.execute(
+                "UPDATE meta SET valor = CAST(valor AS INTEGER) + ? "
+                "WHERE clave = 'paginas_visitadas'",
+                (len(ids_completados),)
+            )
+        return nuevas
+
+    def devolver_en_curso(self):
+        """Devuelve a la frontera las URLs que quedaron a medias tras un corte."""
+        with self.conexion:
+            cursor = self.conexion.execute(
+                "UPDATE frontera SET estado = ? WHERE estado = ?",
+                (self.PENDIENTE, self.EN_CURSO)
+            )
+        return cursor.rowcount
+
+    def pendientes(self):
+        """Número de URLs que quedan por visitar."""
+        return self.conexion.execute("SELECT COUNT(*) FROM frontera").fetchone()[0]
+
+    def cerrar(self):
+        """Cierra la conexión con la base de datos."""
+        self.conexion.close()
+
+
+# REGLAS DE ROBOTS.TXT
+# ---------------------
+class ReglasRobots:
+    """
+    Reglas Allow/Disallow de un robots.txt, compiladas para consultarlas rápido.
+
+    Comprobar una URL recorriendo la lista de reglas una a una costaría más
+    cuantas más reglas tuviera el sitio. En su lugar:
+    - Las reglas "normales" (prefijos como /admin) se guardan en un trie
+      (árbol de prefijos): basta con recorrer la ruta UNA vez, carácter a
+      carácter, sin importar cuántas reglas haya.
+    - Las pocas reglas con comodines (* o $) se compilan a expresiones regulares.
+
+    Como en el estándar (RFC 9309), gana la regla más larga que coincida y,
+    si empatan, gana Allow.
+
+    EJEMPLO:
+        Disallow: /privado
+        Allow: /privado/publico
+        → /privado/x          bloqueada
+        → /privado/publico/y  permitida (la regla Allow es más larga)
+    """
+
+    # Clave especial dentro de un nodo del trie para guardar la decisión
+    FIN = None
+
+    def __init__(self, texto="", user_agent=USER_AGENT, permitir_todo=True):
+        """
+        Parámetros:
+            texto (str): Contenido del robots.txt
+            user_agent (str): Nuestro User-Agent, para elegir el grupo de reglas
+            permitir_todo (bool): Decisión si no hay ninguna regla aplicable
+        """
+        self.trie = {}
+        self.comodines = []  # Lista de (regex, longitud, permitido)
+        self.por_defecto = permitir_todo
+
+        for directiva, valor in self._reglas_para(texto, user_agent):
+            permitido = directiva == "allow"
+            if not valor:
+                continue  # "Disallow:" vacío significa "todo permitido"
+            if "*" in valor or valor.endswith("$"):
+                # '*' = cualquier cosa, '$' al final = fin de la ruta
+                patron = re.escape(valor).replace(r"\*", ".*")
+                if patron.endswith(r"\$"):
+                    patron = patron[:-2] + "$"
+                self.comodines.append((re.compile(patron), len(valor), permitido))
+            else:
+                self._insertar(valor, permitido)
+
+    @staticmethod
+    def _reglas_para(texto, user_agent):
+        """
+        Devuelve las reglas (directiva, valor) del grupo que nos corresponde.
+
+        Un robots.txt tiene grupos que empiezan con una o varias líneas
+        "User-agent:". Usamos el grupo que nombra a nuestro crawler y, si
+        no hay ninguno, el grupo comodín "*".
+
+        El nombre se compara entero y sin distinguir mayúsculas (RFC 9309):
+        "User-agent: crawlereducativo" es nuestro grupo, pero
+        "User-agent: crawler" o "User-agent: c" no lo son.
+        """
+        nombre_bot = user_agent.split("/")[0].lower()
+        grupos = {}          # agente → lista de reglas
+        agentes_actuales = []
+        leyendo_agentes = False
+
+        for linea in texto.splitlines():
+            linea = linea.split("#", 1)[0].strip()  # Quitamos comentarios
+            if ":" not in linea:
+                continue
+            directiva, valor = linea.split(":", 1)
+            directiva = directiva.strip().lower()
+            valor = valor.strip()
+
+            if directiva == "user-agent":
+                # Varias líneas User-agent seguidas comparten el mismo grupo
+                if not leyendo_agentes:
+                    agentes_actuales = []
+                agentes_actuales.append(valor.lower())
+                leyendo_agentes = True
+            elif directiva in ("allow", "disallow"):
+                leyendo_agentes = False
+                for agente in agentes_actuales:
+                    grupos.setdefault(agente, []).append((directiva, valor))
+
+        for agente, reglas in grupos.items():
+            if agente == nombre_bot:
+                return reglas
+        return grupos.get("*", [])
+
+    def _insertar(self, prefijo, permitido):
+        """Añade un prefijo al trie (Allow gana si el mismo prefijo aparece dos veces)."""
+        nodo = self.trie
+        for caracter in prefijo:
+            nodo = nodo.setdefault(caracter, {})
+        nodo[self.FIN] = nodo.get(self.FIN, False) or permitido
+
+    def permitido(self, ruta):
+        """
+        Indica si podemos visitar una ruta (ej: "/admin/login?x=1").
+
+        Retorna:
+            bool: True si está permitida
+        """
+        if ruta == "/robots.txt":
+            return True
+
+        mejor_longitud = -1
+        decision = self.por_defecto
+
+        # Recorremos el trie siguiendo los caracteres de la ruta.
+        # Cada nodo con decisión es una regla que coincide; la última que
+        # encontremos es la más larga.
+        nodo = self.trie
+        for posicion, caracter in enumerate(ruta):
+            nodo = nodo.get(caracter)
+            if nodo is None:
+                break
+            if self.FIN in nodo:
+                mejor_longitud = posicion + 1
+                decision = nodo[self.FIN]
+
+        # Reglas con comodines (normalmente hay muy pocas o ninguna)
+        for regex, longitud, permitido in self.comodines:
+            if regex.match(ruta) and (
+                longitud > mejor_longitud or (longitud == mejor_longitud and permitido)
+            ):
+                mejor_longitud = longitud
+                decision = permitido
+
+        return decision
+
+
+class CacheRobots:
+    """
+    Caché de robots.txt: se descarga UNA vez por servidor y se reutiliza.
+
+    - Cada entrada caduca a los 'ttl' segundos y entonces se vuelve a descargar.
+    - Si varios hilos piden a la vez el robots.txt del mismo servidor, solo
+      uno lo descarga; los demás esperan a que termine y usan su resultado.
+    """
+
+    def __init__(self, user_agent=USER_AGENT, ttl=TTL_ROBOTS):
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.entradas = {}     # "https://sitio.com" → (ReglasRobots, caduca_en)
+        self.en_descarga = {}  # "https://sitio.com" → threading.Event
+        self.bloqueo = threading.Lock()
+
+    def permitido(self, url):
+        """Indica si robots.txt permite visitar esta URL."""
+        partes = urlsplit(url)
+        if partes.scheme not in ("http", "https"):
+            return True  # mailto:, javascript:, etc. no tienen robots.txt
+
+        servidor = f"{partes.scheme}://{partes.netloc}"
+        ruta = partes.path or "/"
+        if partes.query:
+            ruta += "?" + partes.query
+        return self._reglas(servidor).permitido(ruta)
+
+    def _reglas(self, servidor):
+        """Devuelve las reglas del servidor, descargándolas si hace falta."""
+        while True:
+            with self.bloqueo:
+                entrada = self.entradas.get(servidor)
+                if entrada and entrada[1] > time.monotonic():
+                    return entrada[0]  # Caso rápido: está en la caché
+
+                evento = self.en_descarga.get(servidor)
+                if evento is None:
+                    # Somos el primer hilo: nos toca descargarlo
+                    evento = threading.Event()
+                    self.en_descarga[servidor] = evento
+                    break
+
+            # Otro hilo ya lo está descargando: esperamos y volvemos a mirar
+            evento.wait()
+
+        try:
+            reglas, ttl = self._descargar(servidor)
+            with self.bloqueo:
+                self.entradas[servidor] = (reglas, time.monotonic() + ttl)
+        finally:
+            with self.bloqueo:
+                del self.en_descarga[servidor]
+            evento.set()
+        return reglas
+
+    def _descargar(self, servidor):
+        """
+        Descarga y compila el robots.txt de un servidor.
+
+        Retorna:
+            tuple: (ReglasRobots, segundos_de_validez)
+        """
+        try:
+            # stream=True: leemos el cuerpo poco a poco y paramos en
+            # TAMANO_MAXIMO_ROBOTS, aunque el servidor mande megas
+            with requests.get(f"{servidor}/robots.txt", timeout=5, stream=True,
+                              headers={"User-Agent": self.user_agent}) as respuesta:
+                if respuesta.status_code >= 500:
+                    # Error del servidor: igual que inalcanzable
+                    return ReglasRobots(permitir_todo=False), min(self.ttl, 300)
+                if respuesta.status_code >= 400:
+                    # No hay robots.txt (404, 403...): todo permitido
+                    return ReglasRobots(), self.ttl
+
+                contenido = b""
+                for trozo in respuesta.iter_content(chunk_size=16 * 1024):
+                    contenido += trozo
+                    if len(contenido) >= TAMANO_MAXIMO_ROBOTS:
+                        # Cortamos en el último salto de línea para no
+                        # quedarnos con media regla
+                        contenido = contenido[:TAMANO_MAXIMO_ROBOTS].rsplit(b"\n", 1)[0]
+                        break
+        except requests.RequestException:
+            # Servidor inalcanzable: por prudencia no visitamos nada y
+            # lo reintentamos pronto
+            return ReglasRobots(permitir_todo=False), min(self.ttl, 300)
+
+        texto = contenido.decode(respuesta.encoding or "utf-8", errors="replace")
+        return ReglasRobots(texto, self.user_agent), self.ttl
+
+
+class BloqueadoPorRobots(Exception):
+    """La URL no se descarga porque robots.txt lo prohíbe."""
+
+
+class ContenidoDescartado(Exception):
+    """La respuesta no es HTML o es demasiado grande para analizarla."""
+
+
+# MÉTRICAS DEL CRAWL
+# -------------------
+class Histograma:
+    """
+    Cuenta cuántos valores caen en cada intervalo ("cubo") de una escala fija.
+
+    Guardar cada medida para calcular percentiles gastaría memoria sin
+    límite. Un histograma usa siempre la misma memoria (un contador por
+    cubo) y permite estimar percentiles como p50 o p95.
+
+    EJEMPLO con límites [0.1, 0.5, 1]:
+        0.05 → cubo "≤ 0.1",  0.3 → cubo "≤ 0.5",  7 → cubo "> 1"
+    """
+
+    def __init__(self, limites):
+        self.limites = limites
+        self.cuentas = [0] * (len(limites) + 1)  # El último cubo es "infinito"
+        self.total = 0
+        self.suma = 0
+
+    def observar(self, valor):
+        """Añade una medida al histograma."""
+        # bisect_left encuentra el primer límite >= valor (búsqueda binaria)
+        self.cuentas[bisect.bisect_left(self.limites, valor)] += 1
+        self.total += 1
+        self.suma += valor
+
+    def percentil(self, p):
+        """
+        Estima el percentil p (0-100): devuelve el límite superior del cubo
+        donde cae (o infinito si cae en el último).
+        """
+        if self.total == 0:
+            return 0
+        objetivo = self.total * p / 100
+        acumulado = 0
+        for indice, cuenta in enumerate(self.cuentas):
+            acumulado += cuenta
+            if acumulado >= objetivo:
+                return self.limites[indice] if indice < len(self.limites) else float("inf")
+        return float("inf")
+
+
+class MetricasCrawl:
+    """
+    Contadores e histogramas del crawl, compartidos por todos los hilos.
+
+    Responden a preguntas como: ¿cuántas páginas por segundo descargamos?,
+    ¿qué servidor es lento?, ¿cuántos errores hay?, ¿crece la frontera?
+    """
+
+    def __init__(self):
+        self.bloqueo = threading.Lock()  # Varios hilos escriben a la vez
+        self.inicio = time.monotonic()
+        self.resultados = Counter()      # ok / error / descartada / bloqueada
+        self.codigos = Counter()         # 200, 404, 500...
+        self.bytes_totales = 0
+        self.tamano_frontera = 0
+        # Tiempo hasta recibir las cabeceras, en segundos
+        self.latencia = Histograma([0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10])
+        # Tiempo total que pasa el parser analizando una página, en segundos
+        self.parseo = Histograma([0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1])
+        # Bytes descargados por página
+        self.tamanos = Histograma([1024, 10240, 102400, 1048576, TAMANO_MAXIMO])
+        # Latencia por servidor: servidor → [peticiones, segundos totales]
+        self.por_servidor = {}
+
+    def registrar_descarga(self, servidor, codigo, latencia, num_bytes, parseo):
+        """Lo llama cada hilo tras descargar una página."""
+        with self.bloqueo:
+            self.codigos[codigo] += 1
+            self.bytes_totales += num_bytes
+            self.latencia.observar(latencia)
+            self.parseo.observar(parseo)
+            self.tamanos.observar(num_bytes)
+            datos = self.por_servidor.setdefault(servidor, [0, 0.0])
+            datos[0] += 1
+            datos[1] += latencia
+
+    def registrar_resultado(self, tipo):
+        """Cuenta el resultado final de una URL (ok, error, descartada, bloqueada)."""
+        with self.bloqueo:
+            self.resultados[tipo] += 1
+
+    def linea_resumen(self):
+        """Devuelve una línea corta con el estado actual del crawl."""
+        with self.bloqueo:
+            segundos = max(time.monotonic() - self.inicio, 1e-9)
+            procesadas = sum(self.resultados.values())
+            errores = self.resultados["error"]
+            return (
+                f"[MÉTRICAS] {procesadas / segundos:.1f} pág/s | "
+                f"frontera: {self.tamano_frontera} | "
+                f"latencia p50 ≤{self.latencia.percentil(50)}s p95 ≤{self.latencia.percentil(95)}s | "
+                f"errores: {errores / max(procesadas, 1):.1%} | "
+                f"{self.bytes_totales / 1048576:.1f} MB"
+            )
+
+    def texto_prometheus(self):
+        """
+        Devuelve las métricas en el formato de texto de Prometheus,
+        el estándar que leen herramientas de monitorización como Grafana.
+        """
+        lineas = []
+        with self.bloqueo:
+            for tipo, cuenta in sorted(self.resultados.items()):
+                lineas.append(f'crawler_urls_total{{resultado="{tipo}"}} {cuenta}')
+            for codigo, cuenta in sorted(self.codigos.items()):
+                lineas.append(f'crawler_respuestas_total{{codigo="{codigo}"}} {cuenta}')
+            lineas.append(f"crawler_bytes_total {self.bytes_totales}")
+            lineas.append(f"crawler_frontera {self.tamano_frontera}")
+            for nombre, histograma in (("crawler_latencia_segundos", self.latencia),
+                                       ("crawler_parseo_segundos", self.parseo),
+                                       ("crawler_pagina_bytes", self.tamanos)):
+                # Prometheus usa cubos acumulados: "cuántas medidas son <= límite"
+                acumulado = 0
+                for limite, cuenta in zip(histograma.limites + ["+Inf"], histograma.cuentas):
+                    acumulado += cuenta
+                    lineas.append(f'{nombre}_bucket{{le="{limite}"}} {acumulado}')
+                lineas.append(f"{nombre}_sum {histograma.suma}")
+                lineas.append(f"{nombre}_count {histograma.total}")
+            for servidor, (peticiones, segundos) in sorted(self.por_servidor.items()):
+                lineas.append(f'crawler_servidor_latencia_segundos_sum{{servidor="{servidor}"}} {segundos}')
+                lineas.append(f'crawler_servidor_latencia_segundos_count{{servidor="{servidor}"}} {peticiones}')
+        return "\n".join(lineas) + "\n"
+
+    def servir_http(self, puerto):
+        """
+        Arranca un servidor HTTP local con las métricas en /metrics.
+
+        Corre en un hilo aparte (daemon), así no molesta al crawler y
+        se cierra solo cuando termina el programa.
+
+        Prueba con: curl http://127.0.0.1:9100/metrics
+        """
+        metricas = self
+
+        class ManejadorMetricas(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                cuerpo = metricas.texto_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, *args):
+                pass  # No llenamos la consola con cada consulta
+
+        servidor = ThreadingHTTPServer(("127.0.0.1", puerto), ManejadorMetricas)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        return servidor
+
+
+# EXTRACTOR DE ENLACES INCREMENTAL
+# ---------------------------------
+class ExtractorEnlaces(HTMLParser):
+    """
+    Parser que recoge los enlaces <a href="..."> a medida que le llega el HTML.
+
+    A diferencia de BeautifulSoup, que necesita el documento completo,
+    HTMLParser acepta el HTML en trozos con feed(). Así podemos analizar
+    la página mientras se descarga, sin guardarla entera en memoria.
+    """
+
+    def __init__(self, url_base):
+        super().__init__(convert_charrefs=True)
+        self.url_base = url_base
+        self.enlaces = []
+
+    def handle_starttag(self, tag, attrs):
+        """Se llama automáticamente por cada etiqueta de apertura."""
+        if tag != "a":
+            return
+        for nombre, valor in attrs:
+            if nombre == "href" and valor is not None:
+                # urljoin() convierte URLs relativas en absolutas
+                # Ejemplos:
+                #   urljoin("https://example.com/page", "/about") → "https://example.com/about"
+                #   urljoin("https://example.com/page", "contact") → "https://example.com/contact"
+                #   urljoin("https://example.com/page", "https://other.com") → "https://other.com"
+                self.enlaces.append(urljoin(self.url_base, valor))
+
+
+# DESCARGA Y EXTRACCIÓN DE ENLACES
+# ---------------------------------
+def leer_con_plazo(response, limite_tiempo):
+    """
+    Devuelve los trozos del cuerpo hasta terminar o hasta 'limite_tiempo'.
+
+    iter_content() no sirve para un plazo real: cada lectura espera hasta
+    completar el trozo, y un servidor que manda un byte cada pocos
+    segundos nunca agota el timeout de requests (que es POR lectura).
+    Aquí cada lectura devuelve lo que haya llegado (read1) y, antes de
+    cada una, el timeout del socket se ajusta al tiempo que queda.
+
+    Parámetros:
+        response: Respuesta de requests pedida con stream=True
+        limite_tiempo (float): Momento (time.monotonic) en que hay que parar
+    """
+    conexion = getattr(response.raw, "connection", None)
+    sock = getattr(conexion, "sock", None)
+    while True:
+        restante = limite_tiempo - time.monotonic()
+        if restante <= 0:
+            return
+        if sock is not None:
+            sock.settimeout(min(restante, 5))
+        try:
+            trozo = response.raw.read1(TAM_TROZO, decode_content=True)
+        except (urllib3.exceptions.ReadTimeoutError, socket.timeout):
+            return  # Se acabó el tiempo esperando datos
+        # Otros errores de urllib3 (cuerpo cortado, gzip corrupto...) llegan
+        # a descargar_y_extraer(), que los anota como error de esa URL
+        if not trozo:
+            return  # Fin del cuerpo
+        yield trozo
+
+
+def descargar_y_extraer(url, robots=None, metricas=None):
+    """
+    Descarga una página y devuelve la lista de enlaces absolutos que contiene.
+
+    Esta función se ejecuta en varios hilos a la vez, por eso NO toca la
+    base de datos: solo devuelve resultados y el hilo principal los guarda.
+
+    Parámetros:
+        url (str): URL a descargar
+        robots (CacheRobots): Caché de robots.txt (None = no comprobar)
+        metricas (MetricasCrawl): Donde anotar tiempos y bytes (None = no medir)
+
+    Retorna:
+        tuple: (enlaces, error) - error es None si todo fue bien
+    """
+    # PASO 0: COMPROBAR ROBOTS.TXT
+    # -----------------------------
+    if robots is not None and not robots.permitido(url):
+        return [], BloqueadoPorRobots(url)
+
+    try:
+        # PASO 1: PEDIR LA PÁGINA (SOLO CABECERAS)
+        # -----------------------------------------
+        # stream=True hace que requests devuelva el control en cuanto llegan
+        # las cabeceras, SIN descargar todavía el cuerpo de la respuesta.
+        # timeout evita esperas infinitas; User-Agent nos identifica
+        inicio = time.monotonic()
+        with requests.get(url, timeout=5, stream=True,
+                          headers={"User-Agent": USER_AGENT}) as response:
+            latencia = time.monotonic() - inicio
+            if metricas is not None and response.status_code >= 400:
+                # Las respuestas de error no se descargan, pero sí se cuentan
+                metricas.registrar_descarga(urlsplit(url).netloc, response.status_code,
+                                            latencia, 0, 0)
+
+            # raise_for_status() lanza excepción si hay error HTTP (404, 500, etc.)
+            response.raise_for_status()
+
+            # PASO 2: DESCARTAR LO QUE NO SEA HTML (antes de bajar el cuerpo)
+            # ----------------------------------------------------------------
+            tipo = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            if tipo not in TIPOS_HTML:
+                return [], ContenidoDescartado(f"no es HTML ({tipo or 'tipo desconocido'})")
+
+            longitud = response.headers.get("Content-Length", "")
+            if longitud.isdigit() and int(longitud) > TAMANO_MAXIMO:
+                return [], ContenidoDescartado(f"demasiado grande ({longitud} bytes)")
+
+            # PASO 3: DESCARGAR Y ANALIZAR POR TROZOS
+            # ----------------------------------------
+            # El decodificador incremental convierte bytes en texto aunque un
+            # carácter (ej: 'ñ' en UTF-8 = 2 bytes) quede partido entre trozos
+            try:
+                decodificador = codecs.getincrementaldecoder(
+                    response.encoding or "utf-8")(errors="replace")
+            except LookupError:
+                decodificador = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+            parser = ExtractorEnlaces(url)
+            recibidos = 0
+            tiempo_parseo = 0.0
+            limite_tiempo = time.monotonic() + TIEMPO_MAXIMO
+
+            # Si la página supera el tamaño o el tiempo máximo, dejamos de
+            # leer y nos quedamos con los enlaces encontrados hasta ahí
+            for trozo in leer_con_plazo(response, limite_tiempo):
+                recibidos += len(trozo)
+                if recibidos > TAMANO_MAXIMO:
+                    break
+                antes = time.monotonic()
+                parser.feed(decodificador.decode(trozo))
+                tiempo_parseo += time.monotonic() - antes
+
+            parser.feed(decodificador.decode(b"", final=True))
+            parser.close()
+
+            if metricas is not None:
+                metricas.registrar_descarga(urlsplit(url).netloc, response.status_code,
+                                            latencia, recibidos, tiempo_parseo)
+
+    except requests.RequestException as e:
+        # Si hay cualquier error (conexión, timeout, 404, etc.)
+        return [], e
+    except urllib3.exceptions.HTTPError as e:
+        # Errores al leer el cuerpo con leer_con_plazo(): cuerpo cortado
+        # antes de Content-Length (ProtocolError) o gzip corrupto
+        # (DecodeError). requests los envolvería en su propia excepción,
+        # pero aquí leemos directamente de urllib3
+        return [], e
+
+    return parser.enlaces, None
+
+
+# BUCLE PRINCIPAL DEL CRAWLER
+# ----------------------------
+def _ejecutar_crawl(frontera, max_depth, hilos, tam_lote, respetar_robots=True,
+                    puerto_metricas=None):
+    """
+    Saca lotes de la frontera, los descarga en paralelo y guarda los resultados.
+
+    Se usa tanto para un crawl nuevo como para uno reanudado.
+    """
+    # Una sola caché para todo el crawl: cada robots.txt se descarga una vez
+    robots = CacheRobots() if respetar_robots else None
+
+    metricas = MetricasCrawl()
+    metricas.tamano_frontera = frontera.pendientes()
+    if puerto_metricas:
+        metricas.servir_http(puerto_metricas)
+        print(f"Métricas en: http://127.0.0.1:{puerto_metricas}/metrics")
+    ultimo_resumen = time.monotonic()
+
+    try:
+        with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+            while True:
+                lote = frontera.extraer_lote(tam_lote)
+                if not lote:
+                    break  # La frontera está vacía: hemos terminado
+
+                # map() reparte las URLs del lote entre los hilos
+                # y devuelve los resultados en el mismo orden
+                resultados = ejecutor.map(lambda url: descargar_y_extraer(url, robots, metricas),
+                                          [fila[1] for fila in lote])
+
+                nuevas_urls = []
+                for (id_fila, url, depth), (enlaces, error) in zip(lote, resultados):
+                    # Sangría visual para mostrar la profundidad
+                    indent = "  " * depth
+                    print(f"{indent}[Nivel {depth}] Explorando: {url}")
+
+                    if isinstance(error, BloqueadoPorRobots):
+                        metricas.registrar_resultado("bloqueada")
+                        print(f"{indent}  🚫 Bloqueado por robots.txt")
+                        continue
+                    if isinstance(error, ContenidoDescartado):
+                        metricas.registrar_resultado("descartada")
+                        print(f"{indent}  ⏭️ Descartada: {error}")
+                        continue
+                    if error is not None:
+                        metricas.registrar_resultado("error")
+                        print(f"{indent}  ⚠️ Error al acceder: {error}")
+                        continue
+
+                    metricas.registrar_resultado("ok")
+                    print(f"{indent}  → {len(enlaces)} enlaces encontrados")
+
+                    # Solo encolamos los hijos si no superan la profundidad máxima
+                    if depth + 1 <= max_depth:
+                        nuevas_urls.extend((enlace, depth + 1) for enlace in enlaces)
+
+                frontera.confirmar_lote([fila[0] for fila in lote], nuevas_urls)
+
+                # Resumen periódico (contar la frontera tiene un coste,
+                # por eso solo lo hacemos cada INTERVALO_RESUMEN segundos)
+                if time.monotonic() - ultimo_resumen >= INTERVALO_RESUMEN:
+                    metricas.tamano_frontera = frontera.pendientes()
+                    print(metricas.linea_resumen())
+                    ultimo_resumen = time.monotonic()
+
+    except KeyboardInterrupt:
+        # Ctrl+C: el estado ya está en disco, solo avisamos de cómo seguir
+        print()
+        print("-" * 70)
+        print("Crawl interrumpido. Continúa más tarde con: python crawler_spider.py --reanudar")
+        print(metricas.linea_resumen())
+        return False
+
+    metricas.tamano_frontera = 0
+    print(metricas.linea_resumen())
+    return True
+
+
+def simple_spider(start_url, max_depth=2, archivo_estado=ARCHIVO_ESTADO,
+                  hilos=HILOS, tam_lote=TAM_LOTE, respetar_robots=True,
+                  puerto_metricas=None):
     """
     Explora un sitio web siguiendo enlaces hasta una profundidad máxima.
-    
-    Esta función implementa un crawler simple que:
+
+    Esta función implementa un crawler que:
     - Visita cada página una sola vez (evita bucles infinitos)
     - Limita la exploración a cierta profundidad (evita explorar infinitamente)
-    - Extrae y sigue todos los enlaces encontrados
-    
+    - Guarda la frontera en disco para poder reanudar con reanudar()
+
     Parámetros:
         start_url (str): URL inicial desde donde empezar a explorar
         max_depth (int): Profundidad máxima de exploración
                         0 = solo la página inicial
                         1 = página inicial + enlaces directos
                         2 = dos niveles de enlaces, etc.
-    
+        archivo_estado (str): Archivo SQLite donde se guarda el progreso
+        hilos (int): Número de descargas simultáneas
+        tam_lote (int): URLs que se sacan de la frontera en cada vuelta
+        respetar_robots (bool): Comprobar robots.txt antes de cada descarga
+        puerto_metricas (int): Puerto del servidor de métricas (None = sin servidor)
+
     EJEMPLO DE PROFUNDIDAD:
         Página A (depth=0)
         ├── Página B (depth=1)
@@ -67,132 +936,128 @@ def simple_spider(start_url, max_depth=2):
         │   └── Página E (depth=2)
         └── Página C (depth=1)
     """
-    # set() es una estructura de datos que NO permite duplicados
-    # Usamos un set para guardar las URLs ya visitadas
-    # Esto es MUY importante para evitar visitar la misma página múltiples veces
-    visited = set()
-    
+    frontera = FronteraPersistente(archivo_estado)
+
+    # Un crawl nuevo empieza siempre con la frontera vacía
+    frontera.vaciar()
+    frontera.guardar_meta("start_url", start_url)
+    frontera.guardar_meta("max_depth", max_depth)
+    frontera.guardar_meta("paginas_visitadas", 0)
+    frontera.encolar_lote([(start_url, 0)])
+
     print(f"Iniciando crawler desde: {start_url}")
     print(f"Profundidad máxima: {max_depth}")
+    print(f"Estado guardado en: {archivo_estado}")
     print("-" * 70)
 
-    # FUNCIÓN RECURSIVA INTERNA
-    # --------------------------
-    def crawl(url, depth):
-        """
-        Función recursiva que explora una URL y sigue sus enlaces.
-        
-        La recursividad permite explorar el sitio como un árbol:
-        cada página llama a crawl() para sus enlaces hijos.
-        
-        Parámetros:
-            url (str): URL a explorar
-            depth (int): Profundidad actual en el árbol de exploración
-        """
-        
-        # CONDICIÓN DE PARADA 1: Profundidad máxima alcanzada
-        # Si llegamos más allá de la profundidad permitida, detenemos
-        if depth > max_depth:
-            return
-        
-        # CONDICIÓN DE PARADA 2: URL ya visitada
-        # Si ya visitamos esta URL, la ignoramos para evitar bucles infinitos
-        if url in visited:
-            return
+    _terminar(frontera, _ejecutar_crawl(frontera, max_depth, hilos, tam_lote,
+                                        respetar_robots, puerto_metricas))
 
-        # Mostramos la URL que estamos explorando con su profundidad
-        indent = "  " * depth  # Sangría visual para mostrar la profundidad
-        print(f"{indent}[Nivel {depth}] Explorando: {url}")
-        
-        # Añadimos la URL al conjunto de visitadas
-        visited.add(url)
 
-        # PASO 1: DESCARGAR LA PÁGINA
-        # ----------------------------
-        try:
-            # Descargamos el contenido HTML de la página
-            response = requests.get(url, timeout=5)  # timeout evita esperas infinitas
-            
-            # raise_for_status() lanza excepción si hay error HTTP (404, 500, etc.)
-            response.raise_for_status()
-            
-        except requests.RequestException as e:
-            # Si hay cualquier error (conexión, timeout, 404, etc.)
-            print(f"{indent}  ⚠️ Error al acceder: {e}")
-            return  # Detenemos la exploración de esta rama
-
-        # PASO 2: PARSEAR EL HTML
-        # ------------------------
-        # BeautifulSoup convierte el HTML en un objeto navegable
-        # 'html.parser' es el parser que usamos (viene incluido con Python)
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # PASO 3: EXTRAER TODOS LOS ENLACES
-        # ----------------------------------
-        # find_all("a", href=True) encuentra todas las etiquetas <a> que tengan atributo href
-        # href=True asegura que solo obtengamos enlaces con href válido
-        enlaces_encontrados = 0
-        
-        for link in soup.find_all("a", href=True):
-            # link["href"] contiene la URL del enlace
-            # Puede ser relativa ("/about") o absoluta ("https://example.com/about")
-            
-            # urljoin() convierte URLs relativas en absolutas
-            # Ejemplos:
-            #   urljoin("https://example.com/page", "/about") → "https://example.com/about"
-            #   urljoin("https://example.com/page", "contact") → "https://example.com/contact"
-            #   urljoin("https://example.com/page", "https://other.com") → "https://other.com"
-            full_url = urljoin(url, link["href"])
-            
-            enlaces_encontrados += 1
-            
-            # RECURSIÓN: Llamamos a crawl() para explorar este enlace
-            # depth + 1 significa que bajamos un nivel en el árbol
-            crawl(full_url, depth + 1)
-        
-        print(f"{indent}  → {enlaces_encontrados} enlaces encontrados")
-
-    # INICIAR EL CRAWLING
-    # --------------------
-    # Llamamos a crawl() con la URL inicial y profundidad 0
-    crawl(start_url, depth=0)
-    
-    # Resumen final
+def reanudar(archivo_estado=ARCHIVO_ESTADO, hilos=HILOS, tam_lote=TAM_LOTE,
+             respetar_robots=True, puerto_metricas=None):
+    """
+    Continúa un crawl que se interrumpió (Ctrl+C, corte de luz, error...).
+
+    Lee la configuración guardada en el archivo de estado y devuelve a la
+    frontera las URLs que estaban a medias cuando se cortó el programa.
+
+    Parámetros:
+        archivo_estado (str): Archivo SQLite creado por simple_spider()
+        hilos (int): Número de descargas simultáneas
+        tam_lote (int): URLs que se sacan de la frontera en cada vuelta
+        respetar_robots (bool): Comprobar robots.txt antes de cada descarga
+        puerto_metricas (int): Puerto del servidor de métricas (None = sin servidor)
+    """
+    frontera = FronteraPersistente(archivo_estado)
+
+    start_url = frontera.leer_meta("start_url")
+    if start_url is None:
+        print(f"No hay ningún crawl guardado en {archivo_estado}")
+        frontera.cerrar()
+        return
+
+    max_depth = int(frontera.leer_meta("max_depth"))
+    recuperadas = frontera.devolver_en_curso()
+
+    print(f"Reanudando crawler desde: {start_url}")
+    print(f"Profundidad máxima: {max_depth}")
+    print(f"URLs pendientes: {frontera.pendientes()} ({recuperadas} recuperadas a medias)")
     print("-" * 70)
-    print(f"Crawling completado. Total de páginas visitadas: {len(visited)}")
+
+    _terminar(frontera, _ejecutar_crawl(frontera, max_depth, hilos, tam_lote,
+                                        respetar_robots, puerto_metricas))
+
+
+def _terminar(frontera, completado):
+    """Muestra el resumen final y cierra la frontera."""
+    if completado:
+        print("-" * 70)
+        visitadas = frontera.leer_meta("paginas_visitadas", 0)
+        print(f"Crawling completado. Total de páginas visitadas: {visitadas}")
+    frontera.cerrar()
 
 
 # PUNTO DE ENTRADA DEL PROGRAMA
 # ------------------------------
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Web crawler con frontera persistente (se puede reanudar).",
+        epilog="Ejemplo: python crawler_spider.py --url https://example.com --profundidad 2"
+    )
     # URL inicial desde donde empezar a explorar
-    # Puedes cambiar esta URL por cualquier sitio web que quieras explorar
-    start_url = "https://example.com"
-    
-    # Profundidad máxima de exploración
+    parser.add_argument("--url", default="https://example.com",
+                        help="URL inicial (por defecto: https://example.com)")
     # CUIDADO: profundidades altas (3+) pueden visitar MUCHAS páginas
     # Empieza con 1 o 2 para pruebas
-    max_depth = 2
-    
+    parser.add_argument("--profundidad", type=int, default=2,
+                        help="Profundidad máxima de exploración (por defecto: 2)")
+    parser.add_argument("--estado", default=ARCHIVO_ESTADO,
+                        help=f"Archivo de estado SQLite (por defecto: {ARCHIVO_ESTADO})")
+    parser.add_argument("--hilos", type=int, default=HILOS,
+                        help=f"Descargas simultáneas (por defecto: {HILOS})")
+    parser.add_argument("--reanudar", action="store_true",
+                        help="Continuar el crawl guardado en el archivo de estado")
+    parser.add_argument("--ignorar-robots", action="store_true",
+                        help="No comprobar robots.txt (solo en tus propios sitios)")
+    parser.add_argument("--puerto-metricas", type=int,
+                        help="Servir métricas en http://127.0.0.1:PUERTO/metrics")
+    args = parser.parse_args()
+
     print("=" * 70)
     print("WEB CRAWLER SIMPLE")
     print("=" * 70)
     print()
-    
-    # Ejecutamos el spider
-    simple_spider(start_url, max_depth=max_depth)
+
+    # Todas las descargas (páginas y robots.txt) resuelven nombres con la
+    # caché de DNS: cada servidor se consulta una vez y no una vez por página
+    cache = dns_cache.instalar()
+
+    # Ejecutamos el spider (nuevo o reanudado)
+    if args.reanudar:
+        reanudar(args.estado, hilos=args.hilos,
+                 respetar_robots=not args.ignorar_robots,
+                 puerto_metricas=args.puerto_metricas)
+    else:
+        simple_spider(args.url, max_depth=args.profundidad,
+                      archivo_estado=args.estado, hilos=args.hilos,
+                      respetar_robots=not args.ignorar_robots,
+                      puerto_metricas=args.puerto_metricas)
+    print(cache.estadisticas())
 
 # CONSIDERACIONES IMPORTANTES:
 # -----------------------------
 # 1. RESPETA robots.txt: Los sitios indican qué pueden explorar los bots
+#    (este crawler lo hace salvo que uses --ignorar-robots)
 # 2. AÑADE DELAYS: No hagas peticiones demasiado rápido (usa time.sleep())
 # 3. RESPETA TOS: Lee los términos de servicio del sitio
-# 4. IDENTIFÍCATE: Usa un User-Agent apropiado
+# 4. IDENTIFÍCATE: Usa un User-Agent apropiado (ver USER_AGENT)
 # 5. LIMITA PROFUNDIDAD: Crawlers sin límite pueden tardar eternamente
 #
 # MEJORAS POSIBLES:
 # - Filtrar por dominio (solo explorar el mismo sitio)
-# - Guardar URLs en archivo o base de datos
 # - Extraer y guardar contenido de las páginas
 # - Añadir delays entre peticiones (time.sleep())
-# - Implementar cola con threading para paralelizar
+#
+# PARA VER EL ESTADO GUARDADO:
+#   sqlite3 crawler_estado.db "SELECT COUNT(*) FROM frontera"
@@ -0,0 +1,287 @@
+"""
+CACHÉ DE DNS EN MEMORIA - Módulo Educativo
+===========================================
+Este módulo guarda en memoria las respuestas DNS (nombre → dirección IP)
+para que las herramientas HTTP de este directorio no pregunten una y
+otra vez lo mismo al sistema.
+
+¿QUÉ ES DNS?
+DNS es la "agenda telefónica" de Internet: traduce nombres como
+"www.google.com" a direcciones IP como "142.250.184.4". Cada conexión
+nueva necesita esa traducción, y cada consulta puede tardar desde
+unos milisegundos hasta varios segundos.
+
+¿POR QUÉ UNA CACHÉ?
+Un fuzzer o un comprobador masivo abre miles de conexiones contra
+unos pocos servidores. Sin caché, son miles de consultas DNS idénticas.
+Con caché, cada nombre se resuelve una vez cada TTL segundos.
+
+¿QUÉ HACE ESTE MÓDULO?
+- Guarda cada respuesta durante TTL segundos (caché positiva)
+- Guarda también las respuestas de "ese nombre no existe" durante
+  TTL_NEGATIVO segundos (caché negativa): un dominio que no existe no se
+  vuelve a consultar enseguida. Los fallos PASAJEROS (ej: el servidor DNS
+  no contestó a tiempo) no se guardan: la siguiente consulta lo reintenta
+- Si varios hilos o tareas piden el mismo nombre a la vez, solo se
+  hace UNA consulta y todos reciben su resultado
+- Funciona con requests (código normal) y con aiohttp (código asyncio)
+
+¿QUÉ APRENDERÁS?
+- Cómo resuelve Python los nombres (socket.getaddrinfo)
+- Qué es "monkey patching": reemplazar una función de una librería
+- Sincronización entre hilos con threading.Lock y threading.Event
+- Tareas de asyncio y shield() para compartir un resultado entre tareas
+
+USO:
+    import dns_cache
+
+    # requests (y cualquier código que use socket) pasa por la caché
+    dns_cache.instalar()
+
+    # aiohttp: se le pasa un resolvedor propio al conector
+    conector = aiohttp.TCPConnector(resolver=dns_cache.ResolvedorAsync(),
+                                    use_dns_cache=False)
+
+NOTA:
+socket.getaddrinfo() no informa del TTL real de cada registro DNS,
+así que usamos un TTL fijo y configurable.
+"""
+
+# Importamos las librerías necesarias
+import asyncio    # Para la versión asíncrona (aiohttp)
+import socket     # Contiene getaddrinfo(), la función que resuelve nombres
+import threading  # Para que varios hilos usen la caché sin pisarse
+import time       # Para saber cuándo caduca una entrada
+
+# aiohttp es opcional: solo hace falta para ResolvedorAsync
+try:
+    from aiohttp.abc import AbstractResolver
+except ImportError:
+    AbstractResolver = object
+
+
+# CONFIGURACIÓN
+# -------------
+TTL = 300          # Segundos que guardamos una respuesta correcta
+TTL_NEGATIVO = 30  # Segundos que guardamos un "ese dominio no existe"
+
+# Errores de getaddrinfo que son una RESPUESTA definitiva ("ese nombre no
+# existe" o "no tiene direcciones") y se pueden guardar en la caché negativa.
+# Los demás, como EAI_AGAIN ("fallo temporal, inténtalo otra vez"), no: un
+# corte de un segundo dejaría el nombre sin resolver TTL_NEGATIVO segundos.
+# getattr() porque no todos los sistemas definen todas las constantes
+ERRORES_DEFINITIVOS = {getattr(socket, nombre) for nombre in ("EAI_NONAME", "EAI_NODATA")
+                       if hasattr(socket, nombre)}
+
+# Guardamos la función original antes de que instalar() la reemplace
+_getaddrinfo_original = socket.getaddrinfo
+
+
+class CacheDNS:
+    """
+    Caché de resultados de socket.getaddrinfo() con caducidad.
+
+    La clave de la caché son los argumentos de la consulta (nombre, puerto,
+    familia...), y el valor es el resultado o el error que se obtuvo.
+    """
+
+    def __init__(self, ttl=TTL, ttl_negativo=TTL_NEGATIVO):
+        self.ttl = ttl
+        self.ttl_negativo = ttl_negativo
+        self.entradas = {}        # clave → (caduca_en, resultado, error)
+        self.en_vuelo = {}        # clave → threading.Event (consultas en curso)
+        self.en_vuelo_async = {}  # clave → asyncio.Task (consultas en curso)
+        self.bloqueo = threading.Lock()
+        self.aciertos = 0         # Consultas respondidas desde la caché
+        self.fallos = 0           # Consultas que tuvieron que ir al DNS
+
+    def _consultar(self, clave):
+        """Devuelve la entrada si existe y no ha caducado (llamar con el bloqueo)."""
+        entrada = self.entradas.get(clave)
+        if entrada and entrada[0] > time.monotonic():
+            self.aciertos += 1
+            return entrada
+        return None
+
+    def _guardar(self, clave, resultado, error):
+        """Guarda un resultado (o un error) con su caducidad."""
+        ttl = self.ttl if error is None else self.ttl_negativo
+        with self.bloqueo:
+            self.entradas[clave] = (time.monotonic() + ttl, resultado, error)
+
+    @staticmethod
+    def _responder(entrada):
+        """Devuelve el resultado guardado o relanza el error guardado."""
+        _, resultado, error = entrada
+        if error is not None:
+            raise error
+        return resultado
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        """
+        Igual que socket.getaddrinfo(), pero pasando por la caché.
+
+        Tiene exactamente los mismos parámetros, por eso puede sustituir
+        a la función original (ver instalar()).
+        """
+        clave = (host, port, family, type, proto, flags)
+
+        while True:
+            with self.bloqueo:
+                entrada = self._consultar(clave)
+                if entrada:
+                    return self._responder(entrada)
+
+                evento = self.en_vuelo.get(clave)
+                if evento is None:
+                    # Somos los primeros: nos toca hacer la consulta
+                    evento = threading.Event()
+                    self.en_vuelo[clave] = evento
+                    self.fallos += 1
+                    break
+
+            # Otro hilo ya está consultando este nombre: esperamos su resultado
+            evento.wait()
+
+        try:
+            resultado = _getaddrinfo_original(host, port, family, type, proto, flags)
+            self._guardar(clave, resultado, None)
+            return resultado
+        except socket.gaierror as error:
+            # Caché negativa: recordamos que este nombre no existe
+            if error.errno in ERRORES_DEFINITIVOS:
+                self._guardar(clave, None, error)
+            raise
+        finally:
+            with self.bloqueo:
+                del self.en_vuelo[clave]
+            evento.set()
+
+    async def getaddrinfo_async(self, host, port, family=0, type=0, proto=0, flags=0):
+        """
+        Versión asíncrona de getaddrinfo() con la misma caché.
+
+        Si la respuesta está en la caché se devuelve al momento, sin
+        salir del bucle de eventos. Si no, la consulta se lanza como una
+        TAREA PROPIA (que la hace en un hilo aparte, porque getaddrinfo
+        bloquea) y todas las tareas que pidan el mismo nombre, incluida
+        la primera, esperan sobre esa misma tarea en lugar de repetirla.
+
+        ¿POR QUÉ UNA TAREA APARTE Y NO HACER LA CONSULTA AQUÍ MISMO?
+        Si la hiciera la primera tarea que llega, cancelarla (basta con que
+        aiohttp agote el tiempo de SU petición) cancelaría la consulta que
+        esperan todas las demás. Así, cancelar a quien espera solo cancela
+        su espera: la consulta sigue y las demás reciben el resultado.
+        """
+        clave = (host, port, family, type, proto, flags)
+
+        with self.bloqueo:
+            entrada = self._consultar(clave)
+        if entrada:
+            return self._responder(entrada)
+
+        tarea = self.en_vuelo_async.get(clave)
+        if tarea is None:
+            # Somos los primeros: lanzamos la consulta compartida
+            tarea = asyncio.create_task(self._resolver_async(clave))
+            tarea.add_done_callback(self._marcar_vista)
+            self.en_vuelo_async[clave] = tarea
+            with self.bloqueo:
+                self.fallos += 1
+
+        # shield() evita que cancelar esta tarea cancele la consulta de todas
+        return await asyncio.shield(tarea)
+
+    async def _resolver_async(self, clave):
+        """Hace la consulta real en un hilo aparte (la comparten todas las tareas)."""
+        try:
+            resultado = await asyncio.get_running_loop().run_in_executor(
+                None, _getaddrinfo_original, *clave
+            )
+            self._guardar(clave, resultado, None)
+            return resultado
+        except socket.gaierror as error:
+            # Caché negativa (solo si el nombre no existe); el error llega
+            # igualmente a todas las tareas que esperan
+            if error.errno in ERRORES_DEFINITIVOS:
+                self._guardar(clave, None, error)
+            raise
+        finally:
+            del self.en_vuelo_async[clave]
+
+    @staticmethod
+    def _marcar_vista(tarea):
+        """
+        Marca la excepción de la consulta como "vista" aunque ya nadie la
+        esperase, así asyncio no avisa de "Task exception was never retrieved".
+        """
+        if not tarea.cancelled():
+            tarea.exception()
+
+    def estadisticas(self):
+        """Devuelve un texto corto con aciertos y fallos de la caché."""
+        total = self.aciertos + self.fallos
+        porcentaje = self.aciertos / total * 100 if total else 0
+        return (f"DNS: {self.aciertos} aciertos de caché, {self.fallos} consultas "
+                f"reales ({porcentaje:.1f}% desde caché)")
+
+
+# Caché compartida por defecto (una por proceso)
+cache_global = CacheDNS()
+
+
+def instalar(cache=None):
+    """
+    Hace que TODO el proceso resuelva nombres a través de la caché.
+
+    Reemplaza socket.getaddrinfo por la versión con caché ("monkey
+    patching"). requests, urllib3 y la librería estándar llaman a
+    socket.getaddrinfo para conectarse, así que empiezan a usar la
+    caché sin cambiar nada más.
+
+    Parámetros:
+        cache (CacheDNS): Caché a usar (por defecto, la global)
+
+    Retorna:
+        CacheDNS: La caché instalada
+    """
+    cache = cache or cache_global
+    socket.getaddrinfo = cache.getaddrinfo
+    return cache
+
+
+def desinstalar():
+    """Restaura la función original socket.getaddrinfo."""
+    socket.getaddrinfo = _getaddrinfo_original
+
+
+class ResolvedorAsync(AbstractResolver):
+    """
+    Resolvedor para aiohttp que usa la caché de DNS.
+
+    aiohttp permite cambiar la forma de resolver nombres pasando un
+    objeto "resolver" a TCPConnector. Este usa getaddrinfo_async().
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache or cache_global
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        """Devuelve las direcciones de 'host' en el formato que espera aiohttp."""
+        infos = await self.cache.getaddrinfo_async(
+            host, port, family, socket.SOCK_STREAM, 0, socket.AI_ADDRCONFIG
+        )
+        direcciones = []
+        for familia, _, protocolo, _, direccion in infos:
+            direcciones.append({
+                "hostname": host,
+                "host": direccion[0],
+                "port": direccion[1],
+                "family": familia,
+                "proto": protocolo,
+                "flags": socket.AI_NUMERICHOST | socket.AI_NUMERICSERV,
+            })
+        return direcciones
+
+    async def close(self):
+        pass
@@ -0,0 +1,653 @@
+"""
+ESCRITOR DE REGISTROS EN SEGUNDO PLANO - Módulo Educativo
+==========================================================
+Este módulo escribe los registros de los honeypots (api_honeypot.py y
+api_honeypot_with_geolocation_data.py) en un archivo NDJSON desde un
+hilo aparte, para que ninguna petición tenga que esperar al disco.
+
+¿QUÉ PROBLEMA RESUELVE?
+Escribir en un archivo es lento comparado con responder una petición,
+y a veces MUY lento: si el disco está ocupado, un fsync puede tardar
+decenas de milisegundos. Si cada petición escribe su registro antes de
+responder, durante un escaneo todas las respuestas se retrasan.
+
+¿CÓMO FUNCIONA?
+1. La petición mete su registro en una COLA en memoria y sigue (rápido)
+2. Un único hilo "escritor" saca los registros de la cola
+3. Al despertar, el escritor espera un momento (ESPERA_LOTE) para que
+   se acumulen más, junta todos los que haya esperando (un LOTE) y los
+   escribe de una vez: 50 líneas en una escritura en lugar de 50
+   escrituras. También el fsync se hace una vez por lote
+4. Si no llega nada durante INTERVALO_FSYNC segundos, el escritor
+   aprovecha para sincronizar con el disco lo pendiente
+
+¿Y SI LA COLA SE LLENA?
+La cola tiene un tamaño máximo (así un ataque no puede agotar la
+memoria). Cuando se llena, hay que elegir (política de desbordamiento):
+- "descartar_antiguos": se tira el registro más viejo de la cola y se
+  mete el nuevo. Las peticiones nunca esperan
+- "bloquear": la petición espera a que haya sitio. No se pierde nada,
+  pero el escritor marca la velocidad del servidor
+- "muestrear": a partir de media cola solo se guarda 1 de cada
+  FACTOR_MUESTREO registros; así queda una muestra de todo el ataque
+  en lugar de solo su principio o su final
+Los registros descartados se cuentan, y el escritor deja una línea de
+aviso en el archivo con cuántos se perdieron.
+
+¿Y SI FALLA EL DISCO?
+Un error al escribir (disco lleno, no se puede renombrar un segmento...)
+o un registro que no se puede pasar a JSON no paran el hilo escritor:
+se avisa por stderr, se cuenta en 'errores' y se sigue con lo siguiente.
+Lo mismo si falla la compresión de un segmento: queda sin comprimir y se
+vuelve a intentar la próxima vez que arranque el programa.
+
+ROTACIÓN (para que el registro no crezca sin límite):
+Cuando el archivo pasa de TAMANO_MAXIMO bytes, o lleva EDAD_MAXIMA
+segundos abierto, el escritor lo cierra, le cambia el nombre (un
+"segmento" con la fecha: registro.20261019T101500.jsonl) y empieza uno
+nuevo vacío. Otro hilo comprime el segmento (zstd si está disponible,
+si no gzip) sin frenar al escritor.
+Un ÍNDICE (registro.indice.json) guarda de cada segmento el primer y el
+último momento que contiene. Para buscar lo que pasó entre las 10:00 y
+las 11:00, leer_registros() solo abre los segmentos de esas horas.
+
+TODAS LAS FECHAS VAN EN UTC
+Los honeypots fechan cada registro con datetime.utcnow(), así que el
+índice y las búsquedas de leer_registros() están en UTC, no en la hora
+local del equipo. Una búsqueda puede indicar su zona horaria
+("2026-10-19T12:00+02:00" o "2026-10-19T10:00Z") y se pasa a UTC.
+
+¿QUÉ APRENDERÁS?
+- Patrón productor/consumidor con queue.Queue y un hilo
+- Escrituras por lotes ("group commit"): menos llamadas al sistema
+- Qué hace os.fsync() y cuánto cuesta
+- Cómo decidir qué hacer cuando una cola se llena (backpressure)
+- Rotación de registros y compresión con gzip/zstd
+- Un índice para no leer archivos que no hacen falta
+
+USO:
+    import escritor_logs
+
+    registro = escritor_logs.EscritorLogs("registro.jsonl")
+    registro.escribir({"ruta": "/api/login", "metodo": "POST"})
+    # Al salir del programa se escribe lo que quede en la cola
+
+    # Registros de un intervalo, en UTC (solo se abren los segmentos necesarios)
+    for datos in escritor_logs.leer_registros("registro.jsonl",
+                                              desde="2026-10-19T10:00", hasta="2026-10-19T11:00"):
+        print(datos["ruta"])
+"""
+
+# Importamos las librerías necesarias
+import atexit     # Para vaciar la cola al cerrar el programa
+import gzip       # Compresión de los segmentos rotados
+import json       # Para convertir cada registro en una línea JSON
+import os         # Para os.fsync(), renombrar y borrar archivos
+import queue      # Cola segura entre hilos
+import re         # Para separar la zona horaria de una fecha (a_utc)
+import shutil     # Para copiar un archivo en otro a trozos (al comprimir)
+import sys        # Para avisar de los errores por stderr
+import threading  # Para el hilo escritor y los de compresión
+import time       # Para saber cuándo toca sincronizar con el disco
+from datetime import datetime, timezone  # Para fechar los avisos y los segmentos
+
+# zstd es opcional: comprime más y más rápido que gzip
+try:
+    from compression import zstd  # Incluido en Python 3.14 o posterior
+except ImportError:
+    try:
+        import zstandard as zstd  # pip install zstandard
+    except ImportError:
+        zstd = None
+
+
+# CONFIGURACIÓN
+# -------------
+# Cuándo se obliga al sistema a escribir en el disco (fsync):
+# - "siempre": después de cada lote. No se pierde nada de lo ya escrito
+# - "periodica": cada INTERVALO_FSYNC segundos. Se pierde como mucho ese
+#   tiempo de registros si se va la luz
+# - "nunca": el sistema operativo decide (normalmente, unos 30 segundos)
+POLITICAS_FSYNC = ("siempre", "periodica", "nunca")
+POLITICA_FSYNC = "periodica"
+INTERVALO_FSYNC = 1.0      # Segundos entre sincronizaciones (política "periodica")
+
+POLITICAS_DESBORDAMIENTO = ("descartar_antiguos", "bloquear", "muestrear")
+POLITICA_DESBORDAMIENTO = "descartar_antiguos"
+CAPACIDAD_COLA = 10_000    # Registros que caben en la cola
+TAMANO_LOTE = 500          # Registros máximos por escritura
+ESPERA_LOTE = 0.05         # Segundos que el escritor deja acumularse registros
+FACTOR_MUESTREO = 10       # "muestrear": con la cola a medias, se guarda 1 de cada 10
+
+# Rotación: 0 = no rotar por ese motivo
+# (el tamaño se comprueba después de cada lote: un segmento puede pasarse un poco)
+TAMANO_MAXIMO = 100 * 1024 * 1024  # Bytes por segmento (100 MB)
+EDAD_MAXIMA = 24 * 3600            # Segundos por segmento (un día)
+COMPRESIONES = ("auto", "zstd", "gzip", "ninguna")
+COMPRESION = "auto"                # "auto" = zstd si está instalado, si no gzip
+EXTENSIONES = {"zstd": ".zst", "gzip": ".gz", "ninguna": ""}
+
+# Marca que indica al hilo escritor que debe terminar
+_FIN = object()
+
+
+def a_linea(datos):
+    """Convierte un registro en una línea NDJSON (bytes UTF-8)."""
+    # json.dumps() sin indent escribe todo en una sola línea
+    # ensure_ascii=False mantiene las tildes legibles (no "\u00e1")
+    return (json.dumps(datos, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def a_utc(momento):
+    """
+    Pasa a UTC una fecha ISO con zona horaria, en el mismo formato que los
+    registros (sin zona). Si no trae zona se entiende que ya es UTC y se
+    devuelve tal cual, igual que si no se puede interpretar (ej: "2026-10").
+
+    EJEMPLOS:
+        "2026-10-19T12:00+02:00" → "2026-10-19T10:00"
+        "2026-10-19T10:00Z"      → "2026-10-19T10:00"
+        "2026-10-19T10"          → "2026-10-19T10"
+    """
+    try:
+        fecha = datetime.fromisoformat(momento)
+    except ValueError:
+        return momento
+    if fecha.tzinfo is None:
+        return momento
+    # Se recorta a la precisión que se pidió: "12:10+02:00" → "10:10" y no
+    # "10:10:00", que como texto quedaría DESPUÉS de un registro de las "10:10"
+    largo = len(re.sub(r"(Z|[+-]\d{2}:?\d{2}(:\d{2}(\.\d+)?)?)$", "", momento))
+    return fecha.astimezone(timezone.utc).replace(tzinfo=None).isoformat()[:largo]
+
+
+# FUNCIÓN 1: EL ÍNDICE DE SEGMENTOS
+# ---------------------------------
+def ruta_indice(ruta_archivo):
+    """registro.jsonl → registro.indice.json"""
+    return os.path.splitext(ruta_archivo)[0] + ".indice.json"
+
+
+def leer_indice(ruta_archivo):
+    """
+    Devuelve la lista de segmentos rotados de un registro.
+
+    Cada segmento es un diccionario: archivo (nombre, en la misma carpeta
+    que el registro), desde y hasta (primer y último momento que
+    contiene), registros, bytes y, una vez comprimido, comprimido (bytes).
+    """
+    try:
+        with open(ruta_indice(ruta_archivo)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def guardar_indice(ruta_archivo, segmentos):
+    """Guarda el índice de forma atómica (archivo temporal + os.replace)."""
+    ruta = ruta_indice(ruta_archivo)
+    with open(ruta + ".tmp", "w") as f:
+        json.dump(segmentos, f, indent=4)
+    # os.replace es atómico: quien lea el índice ve el viejo o el nuevo, nunca uno a medias
+    os.replace(ruta + ".tmp", ruta)
+
+
+class EscritorLogs:
+    """
+    Registro NDJSON escrito por un hilo aparte, a través de una cola.
+
+    escribir() solo mete el registro en la cola, así que es rápido y no
+    depende del disco. Es seguro llamarlo desde varios hilos a la vez
+    (Flask atiende cada petición en un hilo).
+
+    'campo_tiempo' es la clave de cada registro que guarda su fecha (en
+    formato ISO y en UTC, ej: "2026-10-19T10:15:00"). Con ella se calcula
+    qué intervalo de tiempo cubre cada segmento en el índice.
+    """
+
+    def __init__(self, ruta_archivo, politica_fsync=POLITICA_FSYNC,
+                 intervalo_fsync=INTERVALO_FSYNC, desbordamiento=POLITICA_DESBORDAMIENTO,
+                 capacidad=CAPACIDAD_COLA, tamano_maximo=TAMANO_MAXIMO,
+                 edad_maxima=EDAD_MAXIMA, compresion=COMPRESION, campo_tiempo="momento"):
+        if compresion == "auto":
+            compresion = "zstd" if zstd else "gzip"
+        if compresion == "zstd" and zstd is None:
+            raise ValueError("zstd no está disponible: pip install zstandard (o usa gzip)")
+        if not intervalo_fsync > 0:
+            # Con 0 el escritor no esperaría nada en cola.get() y daría
+            # vueltas sin parar, gastando una CPU entera
+            raise ValueError("intervalo_fsync debe ser mayor que 0")
+        self.ruta_archivo = ruta_archivo
+        self.politica_fsync = politica_fsync
+        self.intervalo_fsync = intervalo_fsync
+        self.desbordamiento = desbordamiento
+        self.tamano_maximo = tamano_maximo
+        self.edad_maxima = edad_maxima
+        self.compresion = compresion
+        self.campo_tiempo = campo_tiempo
+        self.compresores = []     # Hilos de compresión en marcha
+        self.bloqueo_indice = threading.Lock()  # El índice lo tocan escritor y compresores
+        self.cola = queue.Queue(maxsize=capacidad)
+        self.hilo = None          # Se arranca con el primer registro
+        self.cerrado = False
+        self.bloqueo = threading.Lock()
+        self.descartados = 0      # Registros perdidos por tener la cola llena
+        self.avisados = 0         # Descartados de los que ya se dejó aviso
+        self.errores = 0          # Errores del escritor y los compresores (ver _avisar_error())
+        self.contador_muestreo = 0
+
+    # PARTE 1: LO QUE HACE CADA PETICIÓN (rápido)
+    # -------------------------------------------
+    def escribir(self, datos):
+        """
+        Pone un registro en la cola para que el hilo escritor lo guarde.
+
+        Parámetros:
+            datos (dict): Diccionario con la información a guardar
+        """
+        if self.hilo is None:
+            self._arrancar()
+        if self.cerrado:
+            return
+
+        if self.desbordamiento == "bloquear":
+            # Espera si la cola está llena, pero no para siempre: si mientras
+            # tanto se cierra el registro, ya nadie sacaría nada de la cola
+            while not self.cerrado and self.hilo.is_alive():
+                try:
+                    self.cola.put(datos, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+            with self.bloqueo:
+                self.descartados += 1
+            return
+
+        if self.desbordamiento == "muestrear" and self.cola.qsize() >= self.cola.maxsize // 2:
+            with self.bloqueo:
+                self.contador_muestreo += 1
+                muestra = self.contador_muestreo % FACTOR_MUESTREO == 0
+                if not muestra:
+                    self.descartados += 1
+                    return
+
+        while True:
+            try:
+                self.cola.put_nowait(datos)
+                return
+            except queue.Full:
+                if self.desbordamiento != "descartar_antiguos":
+                    with self.bloqueo:
+                        self.descartados += 1
+                    return
+            # Cola llena: sacamos el registro más antiguo para hacer sitio
+            try:
+                self.cola.get_nowait()
+                with self.bloqueo:
+                    self.descartados += 1
+            except queue.Empty:
+                pass  # El escritor se lo llevó justo ahora: ya hay sitio
+
+    def _arrancar(self):
+        """Arranca el hilo escritor (una sola vez, aunque lo pidan varios hilos)."""
+        with self.bloqueo:
+            if self.hilo is None:
+                # daemon=True: el hilo no impide que el programa termine;
+                # cerrar() (registrado con atexit) vacía antes la cola
+                self.hilo = threading.Thread(target=self._escribir_en_segundo_plano,
+                                             name="escritor_logs", daemon=True)
+                self.hilo.start()
+                atexit.register(self.cerrar)
+
+    # PARTE 2: EL HILO ESCRITOR (el único que toca el archivo)
+    # --------------------------------------------------------
+    def _sacar_lote(self, primero):
+        """Junta 'primero' con los registros que ya esperan, hasta TAMANO_LOTE."""
+        lote = [primero]
+        while len(lote) < TAMANO_LOTE:
+            try:
+                lote.append(self.cola.get_nowait())
+            except queue.Empty:
+                break
+        return lote
+
+    def _aviso_descartados(self):
+        """Línea de aviso con los registros perdidos desde el último aviso (o None)."""
+        with self.bloqueo:
+            perdidos = self.descartados - self.avisados
+            self.avisados = self.descartados
+        if not perdidos:
+            return None
+        return a_linea({"momento": datetime.utcnow().isoformat(),
+                        "aviso": "registros descartados por cola llena",
+                        "cantidad": perdidos, "politica": self.desbordamiento})
+
+    def _avisar_error(self, que, error):
+        """
+        Cuenta un error del hilo escritor o de un compresor y lo avisa por
+        stderr (el hilo sigue). Lo llaman varios hilos: se cuenta con el bloqueo.
+        """
+        with self.bloqueo:
+            self.errores += 1
+            total = self.errores
+        print(f"[escritor_logs] Error al {que} ({total} en total): {error!r}",
+              file=sys.stderr)
+
+    def _escribir_en_segundo_plano(self):
+        # Ningún error puede parar este hilo: si muriera, el registro dejaría
+        # de escribirse sin que nadie se enterase, y con "bloquear" las
+        # peticiones esperarían sitio en una cola que ya nadie vacía.
+        # Cada error se cuenta, se avisa por stderr y se sigue con lo siguiente
+        try:
+            self._reanudar_compresiones()
+        except Exception as error:
+            self._avisar_error("reanudar las compresiones", error)
+
+        archivo = None                 # Se (re)abre cuando hace falta escribir
+        pendiente = False              # ¿Hay datos escritos sin fsync?
+        ultimo_fsync = time.monotonic()
+        terminar = False
+        try:
+            while not terminar:
+                try:
+                    primero = self.cola.get(timeout=self.intervalo_fsync)
+                except queue.Empty:
+                    primero = None
+                if primero is not None and primero is not _FIN:
+                    # Sin esta espera el escritor despertaría con CADA registro
+                    # y escribiría lotes de uno, peleando con Flask por la CPU
+                    time.sleep(ESPERA_LOTE)
+
+                # PASO 1: pasar el lote a líneas JSON. Un registro que no se
+                # puede convertir (ej: un objeto raro) se pierde solo él
+                registros, lineas = [], []
+                if primero is not None:
+                    for datos in self._sacar_lote(primero):
+                        if datos is _FIN:
+                            terminar = True
+                            continue
+                        try:
+                            lineas.append(a_linea(datos))
+                        except (TypeError, ValueError) as error:
+                            self._avisar_error("convertir un registro a JSON", error)
+                            continue
+                        registros.append(datos)
+
+                # PASO 2: escribir, sincronizar y rotar. Si falla (disco lleno,
+                # no se puede renombrar...), se pierde este lote, se cierra el
+                # archivo y en la siguiente vuelta se vuelve a abrir
+                try:
+                    if archivo is None:
+                        archivo = self._abrir_segmento()
+                    for datos in registros:
+                        self._contar(datos)
+                    aviso = self._aviso_descartados()
+                    if aviso:
+                        lineas.append(aviso)
+                        self.segmento["registros"] += 1
+
+                    if lineas:
+                        # Una sola escritura para todo el lote
+                        archivo.write(b"".join(lineas))
+                        archivo.flush()  # Del buffer de Python al sistema operativo
+                        pendiente = True
+
+                    # ¿Toca sincronizar con el disco?
+                    ahora = time.monotonic()
+                    if pendiente and self.politica_fsync != "nunca" and (
+                            terminar or self.politica_fsync == "siempre"
+                            or ahora - ultimo_fsync >= self.intervalo_fsync):
+                        os.fsync(archivo.fileno())  # Del sistema operativo al disco
+                        pendiente = False
+                        ultimo_fsync = ahora
+
+                    # ¿Toca empezar un segmento nuevo? (se comprueba también
+                    # cuando no llega nada, para rotar por edad)
+                    if not terminar and self._toca_rotar(archivo):
+                        if pendiente and self.politica_fsync != "nunca":
+                            os.fsync(archivo.fileno())
+                        pendiente = False
+                        archivo = self._rotar(archivo)
+                except Exception as error:
+                    self._avisar_error(f"escribir en {self.ruta_archivo}", error)
+                    if archivo is not None:
+                        try:
+                            archivo.close()  # Si ya estaba cerrado no hace nada
+                        except OSError:
+                            pass  # No se pudo vaciar el buffer: ya contado arriba
+                    archivo = None
+                    pendiente = False
+        finally:
+            if archivo is not None:
+                try:
+                    archivo.close()
+                except OSError as error:
+                    self._avisar_error(f"cerrar {self.ruta_archivo}", error)
+
+    # PARTE 3: ROTACIÓN Y COMPRESIÓN DE SEGMENTOS
+    # --------------------------------------------
+    def _abrir_segmento(self):
+        """
+        Abre el archivo activo y prepara las cuentas del segmento.
+
+        Si el archivo ya tiene datos (de una ejecución anterior), se
+        recorre una vez para saber qué intervalo de tiempo cubre.
+        """
+        self.segmento = {"desde": None, "hasta": None, "registros": 0,
+                         "abierto": time.monotonic()}
+        if os.path.exists(self.ruta_archivo):
+            with open(self.ruta_archivo, "rb") as f:
+                for linea in f:
+                    try:
+                        self._contar(json.loads(linea))
+                    except ValueError:
+                        pass  # Línea cortada (el programa se cerró a mitad)
+        # "ab": añadir al final, en binario (escribimos bytes UTF-8)
+        return open(self.ruta_archivo, "ab")
+
+    def _contar(self, datos):
+        """Actualiza registros, desde y hasta del segmento activo con un registro."""
+        self.segmento["registros"] += 1
+        momento = datos.get(self.campo_tiempo) if isinstance(datos, dict) else None
+        if isinstance(momento, str):
+            # Las fechas ISO se ordenan bien como texto: "2026-10-19T09..." < "2026-10-19T10..."
+            if self.segmento["desde"] is None or momento < self.segmento["desde"]:
+                self.segmento["desde"] = momento
+            if self.segmento["hasta"] is None or momento > self.segmento["hasta"]:
+                self.segmento["hasta"] = momento
+
+    def _toca_rotar(self, archivo):
+        """¿El segmento activo ya es demasiado grande o demasiado viejo?"""
+        if not self.segmento["registros"]:
+            return False  # Nunca se rota un archivo vacío
+        if self.tamano_maximo and archivo.tell() >= self.tamano_maximo:
+            return True
+        edad = time.monotonic() - self.segmento["abierto"]
+        return bool(self.edad_maxima) and edad >= self.edad_maxima
+
+    def _rotar(self, archivo):
+        """
+        Cierra el segmento activo, lo renombra, lo apunta en el índice y
+        lanza su compresión en otro hilo. Devuelve el nuevo archivo activo.
+        """
+        tamano = archivo.tell()
+        archivo.close()
+
+        # registro.jsonl → registro.20261019T101500.jsonl (fecha de su primer registro)
+        base, extension = os.path.splitext(self.ruta_archivo)
+        fecha = (self.segmento["desde"] or datetime.utcnow().isoformat())[:19]
+        sello = fecha.replace("-", "").replace(":", "")
+        ruta_segmento = f"{base}.{sello}{extension}"
+        numero = 1
+        while os.path.exists(ruta_segmento) or os.path.exists(
+                ruta_segmento + EXTENSIONES[self.compresion]):
+            numero += 1  # Dos segmentos en el mismo segundo: registro.xxx-2.jsonl
+            ruta_segmento = f"{base}.{sello}-{numero}{extension}"
+        os.rename(self.ruta_archivo, ruta_segmento)
+
+        with self.bloqueo_indice:
+            segmentos = leer_indice(self.ruta_archivo)
+            segmentos.append({"archivo": os.path.basename(ruta_segmento),
+                              "desde": self.segmento["desde"], "hasta": self.segmento["hasta"],
+                              "registros": self.segmento["registros"], "bytes": tamano})
+            guardar_indice(self.ruta_archivo, segmentos)
+
+        self._comprimir_en_segundo_plano(ruta_segmento)
+        return self._abrir_segmento()
+
+    def _comprimir_en_segundo_plano(self, ruta_segmento):
+        if self.compresion == "ninguna":
+            return
+        # Sin daemon: al salir, Python espera a que terminen de comprimir
+        hilo = threading.Thread(target=self._comprimir, args=(ruta_segmento,),
+                                name="comprimir_segmento")
+        self.compresores = [h for h in self.compresores if h.is_alive()] + [hilo]
+        hilo.start()
+
+    def _comprimir(self, ruta_segmento):
+        """
+        Comprime un segmento y, cuando ha terminado bien, actualiza el
+        índice y borra el original.
+
+        Se comprime a un archivo temporal y se renombra al final: si el
+        programa se corta a mitad, el segmento original sigue intacto.
+        Si algo falla (ej: disco lleno) se avisa como los errores del
+        escritor; el segmento queda sin comprimir y se reintenta la
+        próxima vez que arranque el programa (_reanudar_compresiones()).
+        """
+        ruta_comprimida = ruta_segmento + EXTENSIONES[self.compresion]
+        modulo = zstd if self.compresion == "zstd" else gzip
+        try:
+            with open(ruta_segmento, "rb") as origen, \
+                    modulo.open(ruta_comprimida + ".tmp", "wb") as destino:
+                shutil.copyfileobj(origen, destino, 1024 * 1024)  # A trozos de 1 MB
+            os.replace(ruta_comprimida + ".tmp", ruta_comprimida)
+
+            with self.bloqueo_indice:
+                segmentos = leer_indice(self.ruta_archivo)
+                for segmento in segmentos:
+                    if segmento["archivo"] == os.path.basename(ruta_segmento):
+                        segmento["archivo"] = os.path.basename(ruta_comprimida)
+                        segmento["comprimido"] = os.path.getsize(ruta_comprimida)
+                guardar_indice(self.ruta_archivo, segmentos)
+            os.remove(ruta_segmento)
+        except Exception as error:
+            self._avisar_error(f"comprimir {ruta_segmento}", error)
+            if os.path.exists(ruta_comprimida + ".tmp"):
+                try:
+                    os.remove(ruta_comprimida + ".tmp")
+                except OSError:
+                    pass
+
+    def _reanudar_compresiones(self):
+        """Comprime los segmentos que quedaron sin comprimir en una ejecución anterior."""
+        if self.compresion == "ninguna":
+            return
+        carpeta = os.path.dirname(self.ruta_archivo)
+        for segmento in leer_indice(self.ruta_archivo):
+            ruta = os.path.join(carpeta, segmento["archivo"])
+            if "comprimido" not in segmento and os.path.exists(ruta):
+                self._comprimir_en_segundo_plano(ruta)
+
+    def cerrar(self):
+        """Escribe lo que quede en la cola y para el hilo escritor y los compresores."""
+        if self.hilo is None or self.cerrado:
+            return
+        self.cerrado = True
+        # _FIN va detrás de todos los registros pendientes. Si la cola está
+        # llena esperamos a que el escritor haga sitio (mientras siga vivo)
+        while self.hilo.is_alive():
+            try:
+                self.cola.put(_FIN, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        self.hilo.join()
+        for hilo in self.compresores:
+            hilo.join()
+
+
+def convertir_lista_json(ruta_antigua, ruta_nueva):
+    """
+    Pasa un registro del formato antiguo (una lista JSON) a NDJSON.
+
+    Las líneas se AÑADEN al final de 'ruta_nueva', así que se puede
+    convertir un registro antiguo aunque el nuevo ya tenga datos.
+
+    Retorna:
+        int: Número de registros convertidos
+    """
+    # Aquí sí hay que cargar la lista entera: es lo que tiene el formato antiguo
+    with open(ruta_antigua, "r") as f:
+        registros = json.load(f)
+
+    with open(ruta_nueva, "ab") as f:
+        for datos in registros:
+            f.write(a_linea(datos))
+    return len(registros)
+
+
+# FUNCIÓN 2: LEER LOS REGISTROS (TODOS LOS SEGMENTOS)
+# ---------------------------------------------------
+def _abrir_para_leer(ruta):
+    """Abre un segmento según su extensión (.gz, .zst o sin comprimir)."""
+    if ruta.endswith(".gz"):
+        return gzip.open(ruta, "rb")
+    if ruta.endswith(".zst"):
+        if zstd is None:
+            raise RuntimeError(f"Para leer {ruta} hace falta zstd: pip install zstandard")
+        return zstd.open(ruta, "rb")
+    return open(ruta, "rb")
+
+
+def leer_registros(ruta_archivo, desde=None, hasta=None, campo_tiempo="momento"):
+    """
+    Recorre los registros de todos los segmentos y del archivo activo.
+
+    Con 'desde' y/o 'hasta' (fechas ISO, se vale abreviar: "2026-10-19T10")
+    solo devuelve los registros con desde <= momento < hasta, y gracias al
+    índice ni siquiera abre los segmentos que quedan fuera de ese intervalo.
+    Son horas UTC, como las de los registros; si llevan zona horaria
+    ("+02:00" o "Z") se pasan antes a UTC con a_utc().
+
+    Es un generador: lee una línea cada vez, así que sirve aunque los
+    registros ocupen muchos GB.
+
+    Parámetros:
+        ruta_archivo (str): Archivo activo del registro (ej: "registro.jsonl")
+        desde (str): Momento inicial en UTC (incluido)
+        hasta (str): Momento final en UTC (excluido)
+        campo_tiempo (str): Clave de cada registro con su fecha
+
+    Retorna:
+        generador de dict: Los registros, de más antiguo a más reciente
+    """
+    desde = a_utc(desde) if desde else desde
+    hasta = a_utc(hasta) if hasta else hasta
+    carpeta = os.path.dirname(ruta_archivo)
+    segmentos = sorted(leer_indice(ruta_archivo), key=lambda s: s["desde"] or "")
+    rutas = []
+    for segmento in segmentos:
+        # Un segmento sin fechas (registros sin campo_tiempo) no se puede descartar
+        if desde and segmento["hasta"] and segmento["hasta"] < desde:
+            continue  # Todo el segmento es anterior
+        if hasta and segmento["desde"] and segmento["desde"] >= hasta:
+            continue  # Todo el segmento es posterior
+        rutas.append(os.path.join(carpeta, segmento["archivo"]))
+    if os.path.exists(ruta_archivo):
+        rutas.append(ruta_archivo)
+
+    for ruta in rutas:
+        with _abrir_para_leer(ruta) as archivo:
+            for linea in archivo:
+                try:
+                    datos = json.loads(linea)
+                except ValueError:
+                    continue  # Línea cortada
+                if desde or hasta:
+                    momento = datos.get(campo_tiempo)
+                    if not isinstance(momento, str):
+                        continue
+                    if (desde and momento < desde) or (hasta and momento >= hasta):
+                        continue
+                yield datos
@@ -1,8 +1,8 @@
 """
 WEB SCRAPING CON EXPRESIONES REGULARES - Script Educativo
 ==========================================================
-Este script descarga el HTML de una página web y extrae información
-específica usando expresiones regulares (regex).
+Este script descarga el HTML de una o muchas páginas web y extrae
+información específica usando expresiones regulares (regex).
 
 ¿QUÉ ES WEB SCRAPING?
 Web scraping es el proceso de extraer datos de sitios web de forma automática.
@@ -15,16 +15,30 @@ y extraer información específica de cadenas de texto.
 ¿QUÉ APRENDERÁS?
 - Cómo descargar contenido HTML con requests
 - Uso básico de expresiones regulares con re
-- Procesamiento de argumentos con sys.argv
+- Cómo aplicar una regex a una página MIENTRAS se descarga (por trozos)
+- Cómo combinar muchas regex en una sola con grupos con nombre (?P<nombre>...)
+- Procesamiento de argumentos con argparse
+- Leer una lista de URLs desde un archivo o desde la entrada estándar (stdin)
+- Descargar muchas páginas a la vez con ThreadPoolExecutor
 - Manejo de errores de red con try/except
 - Uso de set() para eliminar duplicados
 - Uso de sorted() para ordenar resultados
+- Qué hacer cuando los resultados no caben en memoria:
+  ordenación externa con archivos temporales y heapq.merge()
+- Estructuras probabilísticas: HyperLogLog y Misra-Gries (top-K)
 
 REQUISITOS:
     pip install requests
 
-EJEMPLO DE USO:
+EJEMPLOS DE USO:
     python scrap.py http://www.ewhois.com/ebay.com/
+    python scrap.py --lista urls.txt --hilos 20
+    cat urls.txt | python scrap.py --lista -
+    python scrap.py --lista urls.txt -e email -e ip -e md5
+    python scrap.py URL --patron "telefono=\d{3}-\d{3}-\d{4}"
+    python scrap.py --listar-extractores
+    python scrap.py --lista urls.txt --agregacion externa --top 20
+    python scrap.py --lista urls.txt --agregacion aproximada
 
 NOTA IMPORTANTE:
 Algunos sitios web prohíben el scraping en sus términos de servicio.
@@ -32,80 +46,743 @@ Verifica siempre los términos de uso y el archivo robots.txt del sitio.
 """
 
 # Importamos las librerías necesarias
-import sys       # Para acceder a los argumentos de línea de comandos
+import sys       # Para leer URLs desde la entrada estándar (stdin)
 import re        # Para usar expresiones regulares (regex)
+import argparse  # Para procesar los argumentos de línea de comandos
+import threading  # Para tener una sesión HTTP por hilo
+import os        # Para construir rutas de archivos temporales
+import heapq     # Para mezclar archivos ordenados y quedarnos con el top-K
+import hashlib   # Para calcular hashes en HyperLogLog
+import math      # Para el logaritmo de la estimación de HyperLogLog
+import tempfile  # Para crear una carpeta temporal que se borra sola
+from collections import Counter  # Para contar repeticiones
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED  # Paralelismo
 import requests  # Para hacer peticiones HTTP y descargar páginas web
 
 
+# CONFIGURACIÓN
+# -------------
+# REGISTRO DE EXTRACTORES: nombre → expresión regular
+#
+# Desglose del patrón "dominio": rb"<div>(?P<valor>[a-z0-9.\-]+?)\s"
+# <div>           = literal, busca la etiqueta <div>
+# (?P<valor>...)  = grupo de captura con nombre: lo que queremos extraer
+#                   (si un patrón no tiene grupo "valor" se extrae todo)
+# [a-z0-9.\-]     = caracteres permitidos: letras, números, punto, guión
+# +?              = uno o más caracteres (modo no-codicioso)
+# \s              = espacio en blanco (espacio, tab, salto de línea)
+#
+# Los patrones son de BYTES (rb"..."): los aplicamos directamente a los
+# trozos descargados, sin decodificar la página entera a texto. Funciona con
+# codificaciones compatibles con ASCII (UTF-8, Latin-1...), que son casi todas.
+#
+# El ORDEN importa: si dos patrones coinciden en la misma posición, gana
+# el primero (por eso sha256 va antes que sha1 y md5).
+EXTRACTORES = {
+    "dominio": rb"<div>(?P<valor>[a-z0-9.\-]+?)\s",
+    "email":   rb"[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}",
+    "url":     rb"https?://[a-z0-9./?=&%_~#:+-]+",
+    "ip":      rb"\b(?:\d{1,3}\.){3}\d{1,3}\b",
+    "sha256":  rb"\b[a-f0-9]{64}\b",
+    "sha1":    rb"\b[a-f0-9]{40}\b",
+    "md5":     rb"\b[a-f0-9]{32}\b",
+}
+
+# Tamaño de cada trozo que leemos de la respuesta
+TAM_TROZO = 64 * 1024
+
+# Bytes del final de cada trozo que se guardan para el siguiente.
+# Una coincidencia puede quedar partida entre dos trozos; con este solape
+# la encontramos igualmente. Debe ser mayor que la coincidencia más larga
+# posible (un dominio tiene como mucho 253 caracteres).
+SOLAPE = 4096
+
+# Bytes ANTERIORES al corte que también se arrastran, pero solo como
+# contexto: permiten que \b (límite de palabra) sepa qué había justo antes
+# y no acepte un trozo de palabra como si fuera una palabra completa
+CONTEXTO = 64
+
+# Número de descargas simultáneas por defecto
+HILOS = 10
+
+# Valores distintos que la agregación "externa" guarda en memoria antes
+# de volcarlos, ordenados, a un archivo temporal
+LIMITE_MEMORIA = 100_000
+
+# Cada hilo guarda aquí su propia sesión HTTP (ver obtener_sesion())
+_datos_hilo = threading.local()
+
+
+def registrar_extractor(nombre, patron):
+    """
+    Añade (o reemplaza) un extractor en el registro.
+
+    Parámetros:
+        nombre (str): Identificador del extractor (letras, números y _)
+        patron (bytes o str): Expresión regular; puede usar (?P<valor>...)
+                              para indicar qué parte se extrae
+
+    Lanza:
+        ValueError: Si el nombre no es válido o la regex tiene errores
+    """
+    if not nombre.isidentifier() or "__" in nombre:
+        raise ValueError(f"Nombre de extractor no válido: {nombre!r}")
+    if isinstance(patron, str):
+        patron = patron.encode()
+    try:
+        re.compile(patron)
+    except re.error as error:
+        raise ValueError(f"Regex no válida para {nombre!r}: {error}")
+    EXTRACTORES[nombre] = patron
+
+
+def compilar_extractores(nombres):
+    """
+    Une varios extractores en UNA sola expresión regular.
+
+    Pasar 5 regex por un documento significa recorrerlo 5 veces. Si las
+    unimos con '|' (alternativa), cada documento se recorre UNA vez,
+    sin importar cuántos extractores haya. Cada patrón va dentro de un
+    grupo con nombre, y al encontrar una coincidencia sabemos qué
+    extractor la produjo con coincidencia.lastgroup.
+
+    ¿POR QUÉ CADA PATRÓN VA DENTRO DE (?=...)?
+    Una alternativa normal CONSUME el texto: en "http://10.0.0.1/x" la URL
+    se come la IP y con "-e url -e ip" la IP no aparecería nunca. Con una
+    búsqueda anticipada (lookahead) el patrón mira el texto sin avanzar:
+    la coincidencia mide 0 bytes, finditer() prueba la posición siguiente
+    y la IP se encuentra también. El grupo con nombre sigue capturando el
+    valor, y extraer_por_trozos() lleva la cuenta de dónde acabó cada
+    extractor para no repetir trozos de una misma coincidencia.
+
+    ¿Y SI DOS EXTRACTORES COINCIDEN EN LA MISMA POSICIÓN?
+    La alternativa solo informa de la PRIMERA que coincide: las de detrás
+    ni se prueban. Por eso se guarda también cada extractor compilado por
+    separado (en _SUELTOS) y, solo en las posiciones donde algo coincidió,
+    extraer_por_trozos() prueba además los extractores que iban detrás.
+    Así un --patron propio que empieza igual que un email no queda oculto.
+
+    EJEMPLO con ["email", "ip"]:
+        (?=(?P<email>[a-z0-9._%+-]+@...))|(?=(?P<ip>\\b(?:\\d{1,3}\\.){3}\\d{1,3}\\b))
+
+    Parámetros:
+        nombres (list): Nombres de extractores del registro
+
+    Retorna:
+        re.Pattern: Patrón combinado (de bytes, sin distinguir mayúsculas)
+    """
+    partes = []
+    # Respetamos el orden del registro (ver el comentario de EXTRACTORES)
+    for nombre in [n for n in EXTRACTORES if n in nombres]:
+        # Cada extractor tiene su propio grupo "valor"; como los nombres de
+        # grupo no pueden repetirse, lo renombramos a "<nombre>__valor"
+        patron = EXTRACTORES[nombre].replace(b"(?P<valor>", f"(?P<{nombre}__valor>".encode())
+        partes.append(f"(?=(?P<{nombre}>".encode() + patron + b"))")
+    # re.IGNORECASE = hace que la búsqueda no distinga mayúsculas/minúsculas
+    # re.compile() prepara el patrón UNA sola vez; así no se vuelve a
+    # analizar con cada página cuando procesamos miles de ellas
+    combinado = re.compile(b"|".join(partes), re.IGNORECASE)
+    _SUELTOS[combinado] = [re.compile(parte, re.IGNORECASE) for parte in partes]
+    return combinado
+
+
+# Patrón combinado → sus extractores compilados uno a uno, en el mismo orden
+# (ver compilar_extractores(); se usan en extraer_por_trozos())
+_SUELTOS = {}
+
+
+# Patrón por defecto: el extractor original de dominios
+PATRON = compilar_extractores(["dominio"])
+
+
+def obtener_sesion():
+    """
+    Devuelve la sesión HTTP del hilo actual (la crea la primera vez).
+
+    Una sesión reutiliza las conexiones abiertas con un servidor, así que
+    descargar muchas páginas del mismo sitio es mucho más rápido que
+    abrir una conexión nueva con cada requests.get().
+    """
+    if not hasattr(_datos_hilo, "sesion"):
+        _datos_hilo.sesion = requests.Session()
+    return _datos_hilo.sesion
+
+
+def _resultado(coincidencia, desplazamiento, finales):
+    """
+    Convierte una coincidencia del patrón combinado en (extractor, valor).
+
+    Como los patrones van dentro de (?=...), en "abc@x.com" el extractor
+    de emails coincide en "abc@x.com", en "bc@x.com", en "c@x.com"...
+    Solo aceptamos la coincidencia si empieza donde acabó la anterior del
+    MISMO extractor o más tarde, igual que haría finditer() con él solo.
+
+    Parámetros:
+        coincidencia (re.Match): Coincidencia dentro del búfer actual
+        desplazamiento (int): Posición del búfer dentro de la página
+        finales (dict): extractor → posición (en la página) donde acabó
+                        su última coincidencia aceptada; se actualiza
+
+    Retorna:
+        tuple o None: (extractor, valor), o None si hay que descartarla
+    """
+    # lastgroup es el nombre del grupo exterior que coincidió (el extractor)
+    nombre = coincidencia.lastgroup
+    inicio = desplazamiento + coincidencia.start(nombre)
+    if inicio < finales.get(nombre, 0):
+        return None
+    finales[nombre] = desplazamiento + coincidencia.end(nombre)
+
+    grupo_valor = f"{nombre}__valor"
+    if grupo_valor in coincidencia.re.groupindex:
+        valor = coincidencia.group(grupo_valor)
+    else:
+        valor = coincidencia.group(nombre)
+    return nombre, valor.decode("utf-8", "replace")
+
+
+def _resultados_en(coincidencia, bufer, desplazamiento, finales, sueltos):
+    """
+    Resultados en la posición de una coincidencia del patrón combinado: el
+    del extractor que ganó y los de los extractores que iban DETRÁS en la
+    alternativa, que en esa posición no llegaron a probarse.
+
+    Parámetros:
+        coincidencia (re.Match): Coincidencia del patrón combinado
+        bufer (bytes): Búfer en el que se buscó
+        desplazamiento (int): Posición del búfer dentro de la página
+        finales (dict): Ver _resultado()
+        sueltos (list): Los extractores compilados por separado, en orden
+    """
+    resultado = _resultado(coincidencia, desplazamiento, finales)
+    if resultado:
+        yield resultado
+    # Los grupos de cada extractor se numeran en orden: el grupo exterior
+    # del que ganó nos dice cuántos extractores iban delante
+    ganador = coincidencia.re.groupindex[coincidencia.lastgroup]
+    delante = sum(1 for nombre, numero in coincidencia.re.groupindex.items()
+                  if "__" not in nombre and numero < ganador)
+    for extractor in sueltos[delante + 1:]:
+        # match(bufer, posicion) mira el byte anterior para \b, como finditer()
+        otra = extractor.match(bufer, coincidencia.start())
+        if otra:
+            resultado = _resultado(otra, desplazamiento, finales)
+            if resultado:
+                yield resultado
+
+
+def extraer_por_trozos(trozos, patron=PATRON, solape=SOLAPE):
+    """
+    Aplica una regex a una secuencia de trozos de bytes, sin unirlos todos.
+
+    Es un GENERADOR: entrega cada coincidencia en cuanto la encuentra,
+    así la extracción empieza antes de que termine la descarga y la memoria
+    usada depende del tamaño del trozo, no del tamaño de la página.
+
+    CÓMO SE EVITA PERDER COINCIDENCIAS PARTIDAS:
+        trozo 1: "...<div>ejem"      trozo 2: "plo.com ..."
+        Solo aceptamos coincidencias que EMPIEZAN antes de los últimos
+        'solape' bytes del búfer. El final del búfer se guarda y se une
+        al trozo siguiente, donde "<div>ejemplo.com " ya aparece completo.
+
+    CÓMO SE EVITA INVENTAR COINCIDENCIAS EN EL CORTE:
+        El corte cae en un byte cualquiera, a veces en mitad de una palabra.
+        Si el búfer siguiente empezara justo ahí, \\b vería un "principio de
+        texto" que no existe y una IP como "1234.5.6.7" daría "34.5.6.7".
+        Por eso arrastramos también CONTEXTO bytes ANTERIORES al corte y
+        buscamos a partir de la posición 'inicio': finditer(bufer, inicio)
+        no empieza a buscar antes de 'inicio', pero \\b sí mira el byte
+        anterior. El resultado es el mismo que con el archivo entero.
+
+    Parámetros:
+        trozos (iterable): Trozos de bytes (ej: response.iter_content())
+        patron (re.Pattern): Regex creada con compilar_extractores()
+        solape (int): Bytes que se arrastran de un trozo al siguiente
+
+    Retorna:
+        generador de tuplas (nombre_extractor, valor)
+    """
+    pendiente = b""
+    inicio = 0          # Posición de pendiente donde empieza lo que falta por buscar
+    desplazamiento = 0  # Posición de pendiente[0] dentro de la página
+    finales = {}        # Dónde acabó la última coincidencia de cada extractor
+    sueltos = _SUELTOS.get(patron, [])
+
+    for trozo in trozos:
+        bufer = pendiente + trozo
+        limite = len(bufer) - solape  # Lo que empiece después aún puede crecer
+
+        for coincidencia in patron.finditer(bufer, inicio):
+            if coincidencia.start() >= limite:
+                break
+            yield from _resultados_en(coincidencia, bufer, desplazamiento, finales, sueltos)
+
+        # Las coincidencias miden 0 bytes (ver compilar_extractores()), así
+        # que el siguiente búfer sigue justo en el límite; 'finales' evita
+        # repetir lo que ya se aceptó aunque se extienda más allá.
+        # Guardamos además unos bytes de antes del corte como contexto para \b
+        corte = max(limite, inicio)
+        contexto = min(corte, CONTEXTO)
+        desplazamiento += corte - contexto
+        pendiente = bufer[corte - contexto:]
+        inicio = contexto
+
+    # Al terminar la descarga, lo que quede en el búfer ya es definitivo
+    for coincidencia in patron.finditer(pendiente, inicio):
+        yield from _resultados_en(coincidencia, pendiente, desplazamiento, finales, sueltos)
+
+
+def scrapear(url, patron=PATRON):
+    """
+    Descarga una página y aplica la expresión regular a su HTML por trozos.
+
+    Se ejecuta en varios hilos a la vez.
+
+    Parámetros:
+        url (str): Página a descargar
+        patron (re.Pattern): Regex creada con compilar_extractores()
+
+    Retorna:
+        tuple: (url, resultados, error) - resultados es una lista de
+               tuplas (extractor, valor); error es None si todo fue bien
+    """
+    # Usamos try/except para manejar errores de red
+    try:
+        # Hacemos una petición HTTP GET al sitio
+        # Es como abrir la página en un navegador, pero obteniendo el HTML crudo.
+        # stream=True: el cuerpo NO se descarga entero; lo leemos por trozos
+        with obtener_sesion().get(url, timeout=10, stream=True) as response:
+            # iter_content() entrega el HTML en trozos de bytes según llegan
+            resultados = list(extraer_por_trozos(response.iter_content(TAM_TROZO), patron))
+
+    except requests.RequestException as e:
+        # RequestException captura todos los errores de requests:
+        # - Conexión fallida
+        # - Timeout
+        # - URL inválida, etc.
+        return url, [], e
+
+    return url, resultados, None
+
+
+def leer_urls(origen):
+    """
+    Lee URLs de un archivo (una por línea), o de stdin si origen es "-".
+
+    Es un GENERADOR (usa yield): entrega las URLs de una en una según se
+    leen, así no hace falta cargar un archivo de millones de líneas en memoria.
+    Las líneas vacías y las que empiezan por # se ignoran.
+    """
+    archivo = sys.stdin if origen == "-" else open(origen, "r")
+    try:
+        for linea in archivo:
+            linea = linea.strip()
+            if linea and not linea.startswith("#"):
+                yield linea
+    finally:
+        if archivo is not sys.stdin:
+            archivo.close()
+
+
+def scrapear_en_paralelo(urls, hilos=HILOS, patron=PATRON):
+    """
+    Descarga muchas URLs a la vez y entrega cada resultado en cuanto termina.
+
+    No enviamos todas las URLs al pool de golpe: con una lista enorme se
+    crearían millones de tareas en memoria. Mantenemos como mucho
+    'hilos * 2' tareas pendientes y pedimos más URLs según van acabando.
+
+    Parámetros:
+        urls (iterable): URLs a procesar (puede ser un generador)
+        hilos (int): Número máximo de descargas simultáneas
+        patron (re.Pattern): Regex creada con compilar_extractores()
+
+    Retorna:
+        generador de tuplas (url, resultados, error)
+    """
+    urls = iter(urls)
+    with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+        pendientes = set()
+        while True:
+            # Rellenamos la "ventana" de tareas en curso
+            while len(pendientes) < hilos * 2:
+                url = next(urls, None)
+                if url is None:
+                    break
+                pendientes.add(ejecutor.submit(scrapear, url, patron))
+
+            if not pendientes:
+                break  # No quedan URLs ni tareas: hemos terminado
+
+            # Esperamos a que termine al menos una tarea
+            terminadas, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+            for tarea in terminadas:
+                yield tarea.result()
+
+
+# AGREGACIÓN DE RESULTADOS
+# -------------------------
+# Las tres clases tienen los mismos métodos, así main() puede usar
+# cualquiera de ellas sin saber cuál es:
+#   agregar(valor)       → cuenta una coincidencia
+#   finalizar(k)         → prepara los resultados y el top-k (una vez, al final)
+#   unicos()             → número de valores distintos
+#   ordenados()          → (valor, repeticiones) en orden alfabético
+#   mas_frecuentes(k)    → los k valores más repetidos
+#   cerrar()             → libera archivos temporales
+
+class AgregadorMemoria:
+    """
+    Guarda todos los valores en un Counter (un dict de valor → repeticiones).
+
+    Es lo más sencillo y exacto, pero la memoria crece con cada valor
+    distinto. Perfecto mientras los resultados quepan en RAM.
+    """
+
+    exacto = True
+
+    def __init__(self):
+        self.cuentas = Counter()
+
+    def agregar(self, valor):
+        self.cuentas[valor] += 1
+
+    def finalizar(self, k=10):
+        pass
+
+    def unicos(self):
+        return len(self.cuentas)
+
+    def ordenados(self):
+        for valor in sorted(self.cuentas):
+            yield valor, self.cuentas[valor]
+
+    def mas_frecuentes(self, k):
+        return self.cuentas.most_common(k)
+
+    def cerrar(self):
+        pass
+
+
+class AgregadorExterno:
+    """
+    Deduplicación y conteo EXACTOS usando disco en lugar de memoria
+    (ordenación externa, "external merge sort").
+
+    CÓMO FUNCIONA:
+    1. Contamos valores en memoria hasta tener LIMITE_MEMORIA distintos
+    2. Los escribimos ORDENADOS a un archivo temporal ("tramo") y vaciamos
+    3. Al final, heapq.merge() mezcla todos los tramos leyendo una línea
+       de cada uno a la vez: como están ordenados, los valores iguales
+       salen seguidos y basta con sumar sus cuentas
+
+    La memoria usada es fija (LIMITE_MEMORIA valores + una línea por tramo),
+    sin importar cuántos millones de resultados haya.
+    """
+
+    exacto = True
+
+    def __init__(self, limite_memoria=LIMITE_MEMORIA):
+        self.limite_memoria = limite_memoria
+        self.cuentas = Counter()
+        self.carpeta = tempfile.TemporaryDirectory(prefix="scrap_")
+        self.tramos = []          # Rutas de los archivos temporales ordenados
+        self.archivo_final = None
+        self.total_unicos = 0
+        self.top = []
+
+    def agregar(self, valor):
+        # Se guarda ya "limpio": así se ordena por el mismo texto que se
+        # escribe en los tramos, que es el orden que necesita heapq.merge()
+        self.cuentas[self._limpiar(valor)] += 1
+        if len(self.cuentas) >= self.limite_memoria:
+            self._volcar()
+
+    def _volcar(self):
+        """Escribe los valores en memoria, ordenados, a un tramo nuevo."""
+        if not self.cuentas:
+            return
+        ruta = os.path.join(self.carpeta.name, f"tramo_{len(self.tramos)}.txt")
+        with open(ruta, "w", encoding="utf-8", newline="\n") as archivo:
+            for valor in sorted(self.cuentas):
+                # Formato: valor<TAB>repeticiones (el valor nunca tiene tabs ni saltos)
+                archivo.write(f"{valor}\t{self.cuentas[valor]}\n")
+        self.tramos.append(ruta)
+        self.cuentas.clear()
+
+    @staticmethod
+    def _limpiar(valor):
+        return valor.replace("\t", " ").replace("\n", " ")
+
+    @staticmethod
+    def _leer_tramo(ruta):
+        """Generador que lee un tramo línea a línea como (valor, cuenta)."""
+        # newline="\n": solo "\n" separa líneas. Sin esto Python también
+        # corta en "\r", y un valor de --patron que lo contenga se partiría
+        with open(ruta, encoding="utf-8", newline="\n") as archivo:
+            for linea in archivo:
+                valor, cuenta = linea.rstrip("\n").rsplit("\t", 1)
+                yield valor, int(cuenta)
+
+    def finalizar(self, k=10):
+        """
+        Mezcla todos los tramos en un único archivo final sin duplicados.
+
+        En la misma pasada contamos los valores únicos y calculamos el
+        top-k con un montículo (heap) de tamaño k.
+        """
+        self._volcar()
+        self.archivo_final = os.path.join(self.carpeta.name, "final.txt")
+        top = []  # Montículo de (cuenta, valor) con los k mayores
+
+        with open(self.archivo_final, "w", encoding="utf-8", newline="\n") as salida:
+            actual, acumulado = None, 0
+            # heapq.merge() entrega los elementos de todos los tramos en orden
+            tramos = [self._leer_tramo(ruta) for ruta in self.tramos]
+            for valor, cuenta in heapq.merge(*tramos):
+                if valor == actual:
+                    acumulado += cuenta
+                    continue
+                if actual is not None:
+                    self._emitir(salida, top, k, actual, acumulado)
+                actual, acumulado = valor, cuenta
+            if actual is not None:
+                self._emitir(salida, top, k, actual, acumulado)
+
+        # Quitamos los tramos intermedios: ya está todo en el archivo final
+        for ruta in self.tramos:
+            os.remove(ruta)
+        self.tramos = []
+        self.top = sorted(top, reverse=True)
+
+    def _emitir(self, salida, top, k, valor, cuenta):
+        """Escribe un valor ya deduplicado y actualiza el top-k."""
+        salida.write(f"{valor}\t{cuenta}\n")
+        self.total_unicos += 1
+        # Sin --top (k=0) no hay montículo que mantener: top[0] no existiría
+        if k <= 0:
+            return
+        if len(top) < k:
+            heapq.heappush(top, (cuenta, valor))
+        elif cuenta > top[0][0]:
+            heapq.heapreplace(top, (cuenta, valor))
+
+    def unicos(self):
+        return self.total_unicos
+
+    def ordenados(self):
+        return self._leer_tramo(self.archivo_final)
+
+    def mas_frecuentes(self, k):
+        return [(valor, cuenta) for cuenta, valor in self.top[:k]]
+
+    def cerrar(self):
+        self.carpeta.cleanup()
+
+
+class HyperLogLog:
+    """
+    Estima cuántos valores DISTINTOS hay usando solo unos pocos KB.
+
+    IDEA: si calculamos un hash aleatorio de cada valor, ver un hash que
+    empieza por muchos ceros seguidos es raro; cuantos más valores
+    distintos vemos, más ceros seguidos llegamos a ver. Repartiendo los
+    hashes en 2^p "registros" y promediando, el error típico es
+    1.04 / sqrt(2^p) (≈ 0.8% con p=14, usando 16 KB de memoria).
+    """
+
+    def __init__(self, p=14):
+        self.p = p
+        self.m = 1 << p                    # Número de registros (2^p)
+        self.registros = bytearray(self.m)
+        self.alfa = 0.7213 / (1 + 1.079 / self.m)
+
+    def agregar(self, valor):
+        h = int.from_bytes(hashlib.blake2b(valor.encode(), digest_size=8).digest(), "big")
+        indice = h >> (64 - self.p)             # Los primeros p bits eligen el registro
+        resto = h & ((1 << (64 - self.p)) - 1)  # Con el resto contamos ceros iniciales
+        ceros = (64 - self.p) - resto.bit_length() + 1
+        if ceros > self.registros[indice]:
+            self.registros[indice] = ceros
+
+    def estimar(self):
+        suma = sum(2.0 ** -r for r in self.registros)
+        estimacion = self.alfa * self.m * self.m / suma
+        vacios = self.registros.count(0)
+        if estimacion <= 2.5 * self.m and vacios:
+            # Con pocos valores es más precisa la fórmula de "linear counting"
+            estimacion = self.m * math.log(self.m / vacios)
+        return round(estimacion)
+
+
+class AgregadorAproximado:
+    """
+    Cuenta únicos y valores más frecuentes en memoria FIJA, de forma aproximada.
+
+    - Únicos: HyperLogLog (error ≈ 1%)
+    - Más frecuentes: algoritmo Misra-Gries con 'capacidad' contadores.
+      Cuando no queda sitio para un valor nuevo, se resta 1 a todos los
+      contadores y se eliminan los que llegan a 0. Un valor que aparece
+      en más de 1/capacidad de las coincidencias nunca se pierde.
+      Las cuentas mostradas son un mínimo (pueden quedarse algo cortas).
+
+    No puede listar todos los valores (no los guarda): solo el top-K.
+    """
+
+    exacto = False
+
+    def __init__(self, capacidad=1000):
+        self.hll = HyperLogLog()
+        self.capacidad = capacidad
+        self.contadores = {}
+
+    def agregar(self, valor):
+        self.hll.agregar(valor)
+        if valor in self.contadores:
+            self.contadores[valor] += 1
+        elif len(self.contadores) < self.capacidad:
+            self.contadores[valor] = 1
+        else:
+            for clave in list(self.contadores):
+                self.contadores[clave] -= 1
+                if self.contadores[clave] == 0:
+                    del self.contadores[clave]
+
+    def finalizar(self, k=10):
+        pass
+
+    def unicos(self):
+        return self.hll.estimar()
+
+    def ordenados(self):
+        return iter(())  # No guardamos todos los valores
+
+    def mas_frecuentes(self, k):
+        return heapq.nlargest(k, self.contadores.items(), key=lambda par: par[1])
+
+    def cerrar(self):
+        pass
+
+
+AGREGADORES = {
+    "memoria": AgregadorMemoria,
+    "externa": AgregadorExterno,
+    "aproximada": AgregadorAproximado,
+}
+
+
 def main():
     """
     Función principal que coordina todo el proceso de scraping.
     """
-    
+
     # PASO 1: VALIDAR ARGUMENTOS
     # ---------------------------
-    # Verificamos que el usuario proporcionó una URL
-    # sys.argv[0] = nombre del script
-    # sys.argv[1] = primer argumento (la URL)
-    if len(sys.argv) < 2:
+    parser = argparse.ArgumentParser(
+        description="Extrae dominios, emails, IPs, hashes... de una o varias páginas.",
+        epilog="Ejemplo: python scrap.py http://www.ewhois.com/ebay.com/"
+    )
+    parser.add_argument("url", nargs="?", help="URL de la página a analizar")
+    parser.add_argument("-l", "--lista",
+                        help="Archivo con una URL por línea ('-' para leer de stdin)")
+    parser.add_argument("--hilos", type=int, default=HILOS,
+                        help=f"Descargas simultáneas (por defecto: {HILOS})")
+    parser.add_argument("-e", "--extractor", action="append", dest="extractores",
+                        help="Extractor a usar (se puede repetir; por defecto: dominio)")
+    parser.add_argument("--patron", action="append", default=[],
+                        help="Extractor propio con formato NOMBRE=REGEX (se puede repetir)")
+    parser.add_argument("--listar-extractores", action="store_true",
+                        help="Muestra los extractores disponibles y termina")
+    parser.add_argument("--agregacion", choices=AGREGADORES, default="memoria",
+                        help="Cómo guardar los resultados: memoria (por defecto), "
+                             "externa (disco, exacta) o aproximada (memoria fija)")
+    parser.add_argument("--top", type=int, default=0,
+                        help="Muestra los N valores más repetidos de cada extractor")
+    args = parser.parse_args()
+
+    # Registramos los extractores propios que haya indicado el usuario
+    for definicion in args.patron:
+        nombre, _, regex = definicion.partition("=")
+        try:
+            registrar_extractor(nombre, regex)
+        except ValueError as error:
+            parser.error(str(error))
+    extractores = args.extractores or [d.partition("=")[0] for d in args.patron] or ["dominio"]
+
+    if args.listar_extractores:
+        for nombre, regex in EXTRACTORES.items():
+            print(f"{nombre:10} {regex.decode()}")
+        return
+
+    desconocidos = [nombre for nombre in extractores if nombre not in EXTRACTORES]
+    if desconocidos:
+        parser.error(f"Extractores desconocidos: {', '.join(desconocidos)} "
+                     f"(usa --listar-extractores)")
+    patron = compilar_extractores(extractores)
+
+    # Verificamos que el usuario proporcionó una URL o una lista
+    if not args.url and not args.lista:
         print("Uso: python scrap.py <URL>")
+        print("     python scrap.py --lista <ARCHIVO>")
         print("\nEjemplo:")
         print("  python scrap.py http://www.ewhois.com/ebay.com/")
         return  # Termina la función si no hay argumentos suficientes
 
-    # Obtenemos la URL desde los argumentos
-    site = sys.argv[1]
-    print(f"Descargando contenido de: {site}\n")
+    if args.url:
+        urls = [args.url]
+        print(f"Descargando contenido de: {args.url}\n")
+    else:
+        urls = leer_urls(args.lista)
+        print(f"Descargando URLs de: {'stdin' if args.lista == '-' else args.lista}\n")
+
+    # PASO 2: DESCARGAR Y EXTRAER INFORMACIÓN
+    # ----------------------------------------
+    # Vamos fusionando los resultados en un agregador por extractor a medida
+    # que llegan; así no guardamos en memoria el HTML ni las listas de cada página
+    agregadores = {nombre: AGREGADORES[args.agregacion]() for nombre in extractores}
+    total_coincidencias = 0
+    paginas = 0
 
-    # PASO 2: DESCARGAR EL CONTENIDO HTML
-    # ------------------------------------
-    # Usamos try/except para manejar errores de red
     try:
-        # requests.get() hace una petición HTTP GET al sitio
-        # Es como abrir la página en un navegador, pero obteniendo el HTML crudo
-        response = requests.get(site)
-        
-        # response.text contiene el HTML de la página como texto
-        html = response.text
-        
-    except requests.RequestException as e:
-        # RequestException captura todos los errores de requests:
-        # - Conexión fallida
-        # - Timeout
-        # - URL inválida, etc.
-        print(f"Error al acceder al sitio: {e}")
-        return  # Termina la función si hay error
-
-    # PASO 3: EXTRAER INFORMACIÓN CON EXPRESIONES REGULARES
-    # ------------------------------------------------------
-    # re.findall() busca TODAS las coincidencias del patrón en el HTML
-    # y retorna una lista con los resultados
-    
-    # Desglose del patrón regex: r"<div>([a-z0-9.\-]+?)\s"
-    # <div>           = literal, busca la etiqueta <div>
-    # (...)           = grupo de captura (lo que queremos extraer)
-    # [a-z0-9.\-]     = caracteres permitidos: letras, números, punto, guión
-    # +?              = uno o más caracteres (modo no-codicioso)
-    # \s              = espacio en blanco (espacio, tab, salto de línea)
-    #
-    # re.IGNORECASE   = hace que la búsqueda no distinga mayúsculas/minúsculas
-    resultados = re.findall(r"<div>([a-z0-9.\-]+?)\s", html, re.IGNORECASE)
-    
-    print(f"Se encontraron {len(resultados)} coincidencias (con duplicados)\n")
-
-    # PASO 4: PROCESAR Y MOSTRAR RESULTADOS
-    # --------------------------------------
-    # set() elimina duplicados de la lista
-    # sorted() ordena alfabéticamente
-    # El resultado es una lista ordenada sin elementos repetidos
-    resultados_unicos = sorted(set(resultados))
-    
-    print(f"Resultados únicos y ordenados ({len(resultados_unicos)} items):")
-    print("-" * 50)
-    
-    # Iteramos sobre cada resultado único y lo imprimimos
-    for item in resultados_unicos:
-        print(item)
+        for url, resultados, error in scrapear_en_paralelo(urls, args.hilos, patron):
+            paginas += 1
+            if error is not None:
+                print(f"Error al acceder a {url}: {error}")
+                continue
+            for nombre, valor in resultados:
+                agregadores[nombre].agregar(valor)
+            total_coincidencias += len(resultados)
+            print(f"{url}: {len(resultados)} coincidencias")
+
+        print(f"\nSe procesaron {paginas} páginas")
+        print(f"Se encontraron {total_coincidencias} coincidencias (con duplicados)")
+
+        # PASO 3: PROCESAR Y MOSTRAR RESULTADOS
+        # --------------------------------------
+        for nombre, agregador in agregadores.items():
+            top = args.top or (0 if agregador.exacto else 10)
+            agregador.finalizar(top)
+            prefijo = f"[{nombre}] " if len(extractores) > 1 else ""
+            print()
+
+            if agregador.exacto:
+                # ordenados() entrega los valores sin duplicados y en orden alfabético
+                print(f"{prefijo}Resultados únicos y ordenados ({agregador.unicos()} items):")
+                print("-" * 50)
+                for item, _ in agregador.ordenados():
+                    print(item)
+            else:
+                print(f"{prefijo}Resultados únicos (estimados): ~{agregador.unicos()}")
+
+            if top:
+                print(f"\n{prefijo}Los {top} más frecuentes:")
+                print("-" * 50)
+                for item, cuenta in agregador.mas_frecuentes(top):
+                    print(f"{cuenta:>8}  {item}")
+    finally:
+        # Borramos los archivos temporales aunque haya un error o Ctrl+C
+        for agregador in agregadores.values():
+            agregador.cerrar()
 
 
 # PUNTO DE ENTRADA DEL PROGRAMA
@@ -121,5 +798,5 @@ if __name__ == "__main__":
 # URLs:         r"https?://[a-zA-Z0-9./-]+"
 # IPs:          r"\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b"
 # Teléfonos:    r"\d{3}-\d{3}-\d{4}"
-# 
+#
 # Para probar y aprender regex, visita: https://regex101.com/
@@ -0,0 +1,111 @@
+"""
+PRUEBAS DE crawler_spider.py
+============================
+Comprueban que descargar_y_extraer() respeta el tiempo máximo por página
+aunque el servidor mande el cuerpo gota a gota, y que un cuerpo cortado o
+un gzip corrupto se anotan como error de ESA URL en vez de romper el crawl.
+
+Usan un servidor HTTP mínimo en 127.0.0.1 (un hilo por conexión).
+
+EJEMPLOS DE USO:
+    python -m pytest examples/test_crawler_spider.py -q
+"""
+
+import gzip
+import socket
+import threading
+import time
+
+import pytest
+import urllib3
+
+import crawler_spider
+
+ENLACES = b"<html>" + b"".join(b'<a href="/p%d">x</a>' % i for i in range(50))
+
+
+def _goteo(conexion):
+    """Cabeceras y enlaces al momento, y después un espacio por segundo."""
+    conexion.sendall(b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n"
+                     b"Content-Length: 100000\r\n\r\n" + ENLACES)
+    while True:
+        conexion.sendall(b" ")
+        time.sleep(1)
+
+
+def _cortado(conexion):
+    """Promete 100000 bytes, manda 18 y cierra la conexión."""
+    conexion.sendall(b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n"
+                     b"Content-Length: 100000\r\n\r\n<html><a href=/x>")
+
+
+def _gzip_corrupto(conexion):
+    """Dice que el cuerpo va en gzip, pero los bytes no lo son."""
+    cuerpo = b"esto no es gzip" * 10
+    conexion.sendall(b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n"
+                     b"Content-Encoding: gzip\r\n"
+                     b"Content-Length: %d\r\n\r\n" % len(cuerpo) + cuerpo)
+
+
+def _normal(conexion):
+    """Una página correcta, comprimida con gzip."""
+    cuerpo = gzip.compress(ENLACES)
+    conexion.sendall(b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n"
+                     b"Content-Encoding: gzip\r\n"
+                     b"Content-Length: %d\r\n\r\n" % len(cuerpo) + cuerpo)
+
+
+RESPUESTAS = {"/goteo": _goteo, "/cortado": _cortado,
+              "/gzip-corrupto": _gzip_corrupto, "/normal": _normal}
+
+
+@pytest.fixture(scope="module")
+def servidor():
+    """Arranca el servidor de pruebas y devuelve su URL base."""
+    escucha = socket.socket()
+    escucha.bind(("127.0.0.1", 0))  # Puerto 0: el sistema elige uno libre
+    escucha.listen()
+
+    def atender(conexion):
+        with conexion:
+            ruta = conexion.recv(4096).split(b" ")[1].decode()
+            try:
+                RESPUESTAS[ruta](conexion)
+            except OSError:
+                pass  # El cliente cerró la conexión (ej: se acabó su plazo)
+
+    def aceptar():
+        while True:
+            conexion, _ = escucha.accept()
+            threading.Thread(target=atender, args=(conexion,), daemon=True).start()
+
+    threading.Thread(target=aceptar, daemon=True).start()
+    yield f"http://127.0.0.1:{escucha.getsockname()[1]}"
+    escucha.close()
+
+
+def test_plazo_real_con_servidor_que_gotea(servidor, monkeypatch):
+    monkeypatch.setattr(crawler_spider, "TIEMPO_MAXIMO", 2)
+    inicio = time.monotonic()
+    enlaces, error = crawler_spider.descargar_y_extraer(servidor + "/goteo")
+    assert time.monotonic() - inicio < 5
+    assert error is None
+    assert len(enlaces) == 50  # Lo recibido antes del plazo sí se analiza
+
+
+def test_cuerpo_cortado_es_error_de_la_url(servidor):
+    enlaces, error = crawler_spider.descargar_y_extraer(servidor + "/cortado")
+    assert enlaces == []
+    assert isinstance(error, urllib3.exceptions.ProtocolError)
+
+
+def test_gzip_corrupto_es_error_de_la_url(servidor):
+    enlaces, error = crawler_spider.descargar_y_extraer(servidor + "/gzip-corrupto")
+    assert enlaces == []
+    assert isinstance(error, urllib3.exceptions.DecodeError)
+
+
+def test_pagina_normal(servidor):
+    enlaces, error = crawler_spider.descargar_y_extraer(servidor + "/normal")
+    assert error is None
+    assert len(enlaces) == 50
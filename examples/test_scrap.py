@@ -0,0 +1,127 @@
+"""
+PRUEBAS DE scrap.py
+===================
+Comprueban que extraer_por_trozos() da EXACTAMENTE lo mismo que aplicar
+la regex al texto entero, caiga donde caiga el corte entre trozos.
+
+EJEMPLOS DE USO:
+    python -m pytest examples/test_scrap.py -q
+"""
+
+import scrap
+
+
+def trocear(datos, tam):
+    """Parte 'datos' en trozos de 'tam' bytes, como haría iter_content()."""
+    return [datos[i:i + tam] for i in range(0, len(datos), tam)]
+
+
+def extraer_entero(datos, patron):
+    """Resultado de referencia: la regex aplicada al archivo completo."""
+    return list(scrap.extraer_por_trozos([datos], patron, solape=0))
+
+
+def test_corte_en_mitad_de_una_ip_no_inventa_coincidencias():
+    patron = scrap.compilar_extractores(["ip", "email"])
+    # "1234.5.6.7" NO es una IP (\b falla dentro de "1234"), pero
+    # "34.5.6.7" sí lo sería si el corte cayera justo después del "12"
+    datos = b"x" * 50 + b" 1234.5.6.7 y admin@ejemplo.com, 10.0.0.1 " + b"y" * 50
+    esperado = extraer_entero(datos, patron)
+    assert ("ip", "10.0.0.1") in esperado
+    assert ("ip", "34.5.6.7") not in esperado
+
+    # Probamos TODOS los puntos de corte posibles con un solape pequeño
+    for tam in range(1, len(datos) + 1):
+        trozos = trocear(datos, tam)
+        obtenido = list(scrap.extraer_por_trozos(trozos, patron, solape=32))
+        assert obtenido == esperado, f"tam={tam}"
+
+
+def test_hash_partido_entre_trozos():
+    patron = scrap.compilar_extractores(["sha256", "sha1", "md5"])
+    md5 = b"d41d8cd98f00b204e9800998ecf8427e"
+    # Un hash de 33 caracteres no es un md5; uno de 32 sí
+    datos = b"hash: " + md5 + b"f " + md5 + b"\n"
+    esperado = extraer_entero(datos, patron)
+    assert esperado == [("md5", md5.decode())]
+
+    for tam in range(1, len(datos) + 1):
+        obtenido = list(scrap.extraer_por_trozos(trocear(datos, tam), patron, solape=40))
+        assert obtenido == esperado, f"tam={tam}"
+
+
+def test_extractores_solapados_se_encuentran_todos():
+    # La URL contiene una IP: "-e url -e ip" debe devolver las dos
+    patron = scrap.compilar_extractores(["url", "ip"])
+    datos = b'<a href="http://10.0.0.1/x">inicio</a> y 192.168.1.1\n'
+    esperado = [
+        ("url", "http://10.0.0.1/x"),
+        ("ip", "10.0.0.1"),
+        ("ip", "192.168.1.1"),
+    ]
+    assert extraer_entero(datos, patron) == esperado
+
+    for tam in range(1, len(datos) + 1):
+        obtenido = list(scrap.extraer_por_trozos(trocear(datos, tam), patron, solape=32))
+        assert obtenido == esperado, f"tam={tam}"
+
+
+def test_un_extractor_no_repite_trozos_de_su_propia_coincidencia():
+    # Con (?=...) el patrón de email coincide también en "dmin@..." y
+    # "min@..."; solo debe contarse la coincidencia completa
+    patron = scrap.compilar_extractores(["email"])
+    datos = b"escribe a admin@ejemplo.com o a soporte@ejemplo.com\n"
+    assert extraer_entero(datos, patron) == [
+        ("email", "admin@ejemplo.com"),
+        ("email", "soporte@ejemplo.com"),
+    ]
+
+
+def test_agregacion_externa_sin_top():
+    # main() pasa k=0 cuando no se usa --top
+    agregador = scrap.AgregadorExterno(limite_memoria=2)
+    for valor in ["b.com", "a.com", "b.com", "c.com", "b.com"]:
+        agregador.agregar(valor)
+    agregador.finalizar(0)
+    assert agregador.unicos() == 3
+    assert list(agregador.ordenados()) == [("a.com", 1), ("b.com", 3), ("c.com", 1)]
+    assert agregador.mas_frecuentes(0) == []
+    agregador.cerrar()
+
+
+def test_agregacion_externa_con_top():
+    agregador = scrap.AgregadorExterno(limite_memoria=2)
+    for valor in ["b.com", "a.com", "b.com", "c.com", "b.com", "c.com"]:
+        agregador.agregar(valor)
+    agregador.finalizar(2)
+    assert agregador.mas_frecuentes(2) == [("b.com", 3), ("c.com", 2)]
+    agregador.cerrar()
+
+
+def test_agregacion_externa_con_tabuladores_y_retornos():
+    # "a\tz" va antes que "a a" sin limpiar, pero "a z" va DESPUÉS: los
+    # tramos deben ordenarse por el valor que se escribe. Y "x\ry" no
+    # puede partirse en dos líneas al leer los tramos
+    agregador = scrap.AgregadorExterno(limite_memoria=2)
+    for valor in ["a\tz", "a a", "x\ry", "a a", "a z", "x\ry", "b"]:
+        agregador.agregar(valor)
+    agregador.finalizar(0)
+    assert list(agregador.ordenados()) == [("a a", 2), ("a z", 2), ("b", 1), ("x\ry", 2)]
+    assert agregador.unicos() == 4
+    agregador.cerrar()
+
+
+def test_patron_propio_que_empieza_igual_que_un_email():
+    # En "admin@ejemplo.com" gana "email" (va antes en el registro), pero
+    # el extractor propio "usuario" coincide en la misma posición
+    scrap.registrar_extractor("usuario", rb"(?P<valor>[a-z0-9._%+-]+)@")
+    try:
+        patron = scrap.compilar_extractores(["email", "usuario"])
+        datos = b"escribe a admin@ejemplo.com hoy\n"
+        esperado = [("email", "admin@ejemplo.com"), ("usuario", "admin")]
+        assert extraer_entero(datos, patron) == esperado
+        for tam in range(1, len(datos) + 1):
+            obtenido = list(scrap.extraer_por_trozos(trocear(datos, tam), patron, solape=32))
+            assert obtenido == esperado, f"tam={tam}"
+    finally:
+        del scrap.EXTRACTORES["usuario"]